@@ -1,7 +1,34 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
+import os
+import sys
+import json
+import pickle
+import functools
+import itertools
+import operator
+import asyncio
+import csv
+import hashlib
+import re
+import bisect
+from statistics import NormalDist
+import sqlite3
+import logging
+import time
+import tempfile
+import socket
+import uuid
+import gc
+import tracemalloc
+import weakref
+from types import MappingProxyType
+import xml.etree.ElementTree as ET
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -16,90 +43,1449 @@ except ImportError:
     PLOTLY_AVAILABLE = False
     print("⚠️ Plotly no está instalado. Las visualizaciones no estarán disponibles.")
 
+try:
+    from scipy.stats import qmc
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Códigos numéricos de estado para representaciones en arreglos
+TASK_STATE_CODES = {
+    "No iniciada": 0,
+    "En progreso": 1,
+    "En progreso (con retraso)": 2,
+    "En progreso (adelantada)": 3,
+    "Completada": 4,
+    "Completada anticipadamente": 5,
+    "Completada con retraso": 6
+}
+
+# Campos numéricos por tarea (fechas como días desde el inicio del proyecto, NaN = pendiente)
+TASK_ARRAY_FIELDS = (
+    "ID",
+    "Duración Planificada (días)",
+    "Inicio Planificado (día)",
+    "Fin Planificado (día)",
+    "Inicio Real (día)",
+    "Fin Real (día)",
+    "Estado (código)",
+    "% Avance Físico",
+    "Días de Retraso",
+    "Buffer sugerido (días)",
+    "Costo Planificado (USD)",
+    "Costo Real (USD)"
+)
+
+# Reglas de coherencia que verifica validate_task_arrays (nombre -> descripción)
+SCHEDULE_RULES = {
+    "estado_invalido": "Código de estado desconocido",
+    "fechas_planificadas": "Inicio planificado antes del día 0 o fin distinto de inicio + duración - 1",
+    "lag_planificado": "Inicio planificado que no respeta el tipo y lag de algún predecesor",
+    "predecesor_no_completado": "Tarea completada con un predecesor FS/SF sin completar",
+    "predecesor_no_iniciado": "Tarea iniciada o completada con un predecesor FS/SS/FF sin iniciar",
+    "fechas_reales": "Fechas reales que no corresponden al estado o fin real antes del inicio real",
+    "avance": "% de avance físico que no corresponde al estado",
+    "costo_real": "Costo real ausente o negativo en una tarea iniciada"
+}
+
+# Dimensiones de sample_point: perfil, % completado, % en progreso, estilo de red, estrategia de buffer
+SAMPLED_DIMENSIONS = 5
+# y por cada tarea: variación del estado, magnitud (adelanto / retraso / avance) y variación de costo
+TASK_SAMPLED_DIMENSIONS = 3
+
+# Códigos int8 de los tipos de dependencia
+DEPENDENCY_TYPES = ("FS", "SS", "FF", "SF")
+DEPENDENCY_TYPE_CODES = {dep_type: code for code, dep_type in enumerate(DEPENDENCY_TYPES)}
+
+# Colores por fase de los gráficos (las fases de una configuración de sitio sin color usan gris)
+PHASE_COLORS = {
+    "Preparación del Terreno": "#FF6B6B",
+    "Movimiento de Tierra": "#4ECDC4",
+    "Cimentaciones": "#45B7D1",
+    "Estructuras Principales": "#96CEB4",
+    "Instalaciones Mecánicas": "#FFEAA7",
+    "Instalaciones Eléctricas": "#DDA0DD",
+    "Acabados y Pruebas": "#98D8C8",
+    "Puesta en Marcha": "#F7DC6F"
+}
+FS, SS, FF, SF = range(4)
+
+
+class DependencyGraph:
+    """
+    Red de dependencias en formato CSR (compressed sparse row), construida una vez por simulación
+
+    Predecesores: pred_indptr / pred_indices (int32), pred_types (int8), pred_lags (int16).
+    Sucesores: la misma información ordenada por predecesor (succ_*), con succ_edges apuntando
+    a la arista original. Los índices son posiciones de tarea (0..n-1), no IDs.
+    """
+
+    def __init__(self, task_ids, pred_indptr, pred_indices, pred_types, pred_lags):
+        self.task_ids = np.asarray(task_ids, dtype=np.int32)
+        self.pred_indptr = np.asarray(pred_indptr, dtype=np.int32)
+        self.pred_indices = np.asarray(pred_indices, dtype=np.int32)
+        self.pred_types = np.asarray(pred_types, dtype=np.int8)
+        self.pred_lags = np.asarray(pred_lags, dtype=np.int16)
+
+        num_tasks = len(self.task_ids)
+        self.id_to_index = {int(task_id): i for i, task_id in enumerate(self.task_ids)}
+
+        # Destino de cada arista (la tarea dueña de la fila CSR)
+        self.edge_targets = np.repeat(np.arange(num_tasks, dtype=np.int32), np.diff(self.pred_indptr))
+
+        # CSR de sucesores
+        self.succ_edges = np.argsort(self.pred_indices, kind='stable').astype(np.int32)
+        self.succ_indices = self.edge_targets[self.succ_edges]
+        self.succ_types = self.pred_types[self.succ_edges]
+        self.succ_lags = self.pred_lags[self.succ_edges]
+        self.succ_indptr = np.zeros(num_tasks + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.pred_indices, minlength=num_tasks), out=self.succ_indptr[1:])
+
+        self._order = None
+        self._level_bounds = None
+        self._levels = None
+
+    @classmethod
+    def from_tasks(cls, tasks, id_key="id", predecessors_key="predecessors"):
+        """
+        Construye el grafo desde tareas con listas de tuplas (pred_id, tipo, lag)
+        Sirve tanto para las tareas internas ("id"/"predecessors") como para
+        self.tasks ("ID"/"Predecesores Detallados")
+        """
+        task_ids = [task[id_key] for task in tasks]
+        id_to_index = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        indptr = [0]
+        indices, types, lags = [], [], []
+        for task in tasks:
+            for pred_id, dep_type, lag in task[predecessors_key] or []:
+                if pred_id not in id_to_index:
+                    raise ValueError(f"La tarea {task[id_key]} depende de una tarea inexistente: {pred_id}")
+                indices.append(id_to_index[pred_id])
+                types.append(DEPENDENCY_TYPE_CODES[dep_type])
+                lags.append(lag)
+            indptr.append(len(indices))
+
+        return cls(task_ids, indptr, indices, types, lags)
+
+    @classmethod
+    def from_edges(cls, task_ids, pred_ids, succ_ids, types, lags):
+        """
+        Construye el grafo desde arreglos de aristas por ID (sin recorrer tareas en Python)
+        types: códigos de DEPENDENCY_TYPE_CODES o textos "FS"/"SS"/"FF"/"SF"
+        """
+        task_ids = np.asarray(task_ids, dtype=np.int64)
+        order = np.argsort(task_ids, kind='stable')
+        sorted_ids = task_ids[order]
+
+        def to_index(ids):
+            ids = np.asarray(ids, dtype=np.int64)
+            position = np.minimum(np.searchsorted(sorted_ids, ids), max(len(sorted_ids) - 1, 0))
+            if len(ids) and (not len(sorted_ids) or np.any(sorted_ids[position] != ids)):
+                missing = ids[~np.isin(ids, task_ids)]
+                raise ValueError(f"Dependencias hacia tareas inexistentes: {sorted(set(missing.tolist()))[:10]}")
+            return order[position]
+
+        types = np.asarray(types)
+        if types.dtype.kind in "UO":
+            types = np.array([DEPENDENCY_TYPE_CODES[dep_type] for dep_type in types.tolist()], dtype=np.int8)
+
+        src = to_index(pred_ids)
+        dst = to_index(succ_ids)
+        edges = np.argsort(dst, kind='stable')
+        indptr = np.zeros(len(task_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=len(task_ids)), out=indptr[1:])
+        return cls(task_ids, indptr, src[edges], types[edges], np.asarray(lags)[edges])
+
+    @property
+    def num_tasks(self):
+        return len(self.task_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.pred_indices)
+
+    def in_degree(self):
+        return np.diff(self.pred_indptr)
+
+    def out_degree(self):
+        return np.diff(self.succ_indptr)
+
+    def predecessors(self, index):
+        """(índices, tipos, lags) de los predecesores de una tarea"""
+        start, end = self.pred_indptr[index], self.pred_indptr[index + 1]
+        return self.pred_indices[start:end], self.pred_types[start:end], self.pred_lags[start:end]
+
+    def successors(self, index):
+        """(índices, tipos, lags) de los sucesores de una tarea"""
+        start, end = self.succ_indptr[index], self.succ_indptr[index + 1]
+        return self.succ_indices[start:end], self.succ_types[start:end], self.succ_lags[start:end]
+
+    def type_counts(self):
+        """Cantidad de aristas por tipo de dependencia"""
+        counts = np.bincount(self.pred_types, minlength=len(DEPENDENCY_TYPES))
+        return {dep_type: int(counts[code]) for code, dep_type in enumerate(DEPENDENCY_TYPES)}
+
+    # Frentes de Kahn con menos tareas que esto se recorren sobre listas: en redes profundas y angostas
+    # el costo fijo de las operaciones de numpy por nivel domina (una cadena de 50k tareas tiene 50k niveles)
+    KAHN_SCALAR_FRONTIER = 64
+
+    def _kahn(self):
+        """
+        Algoritmo de Kahn por frentes en una sola pasada O(V+E)
+        Los frentes anchos se procesan vectorizados y los angostos con listas; guarda el orden
+        topológico y los límites de cada nivel dentro de él
+        """
+        remaining = self.in_degree().astype(np.int64)
+        frontier = np.flatnonzero(remaining == 0).tolist()
+        order, bounds = [], [0]
+        indptr = indices = None
+
+        while frontier:
+            order.extend(frontier)
+            bounds.append(len(order))
+            if len(frontier) < self.KAHN_SCALAR_FRONTIER:
+                if indptr is None:
+                    indptr, indices = self.succ_indptr.tolist(), self.succ_indices.tolist()
+                following = []
+                for node in frontier:
+                    for succ in indices[indptr[node]:indptr[node + 1]]:
+                        remaining[succ] -= 1
+                        if not remaining[succ]:
+                            following.append(succ)
+                following.sort()
+                frontier = following
+            else:
+                # Aristas salientes de todo el frente a la vez
+                frontier = np.asarray(frontier, dtype=np.int64)
+                starts = self.succ_indptr[frontier]
+                counts = self.succ_indptr[frontier + 1] - starts
+                total = counts.sum()
+                if total == 0:
+                    break
+                offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+                # Solo las tareas tocadas por el frente (sin recorrer las n tareas en cada nivel)
+                touched, decrement = np.unique(self.succ_indices[offsets], return_counts=True)
+                remaining[touched] -= decrement
+                frontier = touched[remaining[touched] == 0].tolist()
+
+        self._order = np.array(order, dtype=np.int32)
+        self._level_bounds = np.array(bounds, dtype=np.int64)
+
+    def topological_order(self):
+        """Orden topológico (las tareas que quedan en ciclos no aparecen)"""
+        if self._order is None:
+            self._kahn()
+        return self._order
+
+    def depth(self):
+        """Cantidad de niveles topológicos, sin materializar cada nivel"""
+        self.topological_order()
+        return len(self._level_bounds) - 1
+
+    def levels(self):
+        """
+        Niveles topológicos como arreglos de índices; se arman solo cuando se piden (pasadas vectorizadas)
+        Las tareas que quedan en ciclos no aparecen en ningún nivel
+        """
+        if self._levels is None:
+            order, bounds = self.topological_order(), self._level_bounds.tolist()
+            self._levels = [order[start:end] for start, end in zip(bounds, bounds[1:])]
+        return self._levels
+
+    def cyclic_tasks(self):
+        """Índices de tareas que están en un ciclo o dependen de uno"""
+        ordered = np.zeros(self.num_tasks, dtype=bool)
+        ordered[self.topological_order()] = True
+        return np.flatnonzero(~ordered)
+
+    def back_edges(self):
+        """
+        Aristas de retroceso (posiciones en pred_indices) de un recorrido en profundidad hacia los
+        predecesores, iniciado en las tareas que el orden topológico no alcanza
+        Cada una cierra un ciclo (sus dos extremos están en la misma componente fuertemente conexa)
+        y sin ellas la red queda acíclica; las aristas que solo dependen de un ciclo no se incluyen.
+        """
+        indptr = self.pred_indptr.tolist()
+        indices = self.pred_indices.tolist()
+        # 0 = sin visitar, 1 = en la pila del recorrido, 2 = terminada (las tareas ordenadas no tienen ciclos)
+        state = [2] * self.num_tasks
+        pending = self.cyclic_tasks().tolist()
+        for index in pending:
+            state[index] = 0
+
+        back = []
+        for root in pending:
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [[root, indptr[root]]]
+            while stack:
+                top = stack[-1]
+                node, edge = top
+                if edge == indptr[node + 1]:
+                    state[node] = 2
+                    stack.pop()
+                    continue
+                top[1] = edge + 1
+                pred = indices[edge]
+                if state[pred] == 1:
+                    back.append(edge)
+                elif state[pred] == 0:
+                    state[pred] = 1
+                    stack.append([pred, indptr[pred]])
+
+        return np.array(sorted(back), dtype=np.int64)
+
+    def edge_levels(self, by_source=False):
+        """
+        Agrupa las aristas por nivel topológico de su tarea destino (o de su tarea origen)
+        Devuelve una lista de (tareas del nivel, índices de aristas de ese nivel)
+        """
+        depth = self.depth()
+        node_level = np.full(self.num_tasks, -1, dtype=np.int32)
+        node_level[self.topological_order()] = np.repeat(np.arange(depth, dtype=np.int32), np.diff(self._level_bounds))
+
+        edge_level = node_level[self.pred_indices if by_source else self.edge_targets]
+        order = np.argsort(edge_level, kind='stable')
+        bounds = np.searchsorted(edge_level[order], np.arange(depth + 1))
+
+        return [(nodes, order[bounds[level]:bounds[level + 1]])
+                for level, nodes in enumerate(self.levels())]
+
+    # Con menos aristas promedio por nivel que esto, un barrido escalar en orden topológico es más
+    # rápido que uno vectorizado por niveles (redes largas y angostas con un solo escenario)
+    SCALAR_PASS_EDGES_PER_LEVEL = 32
+
+    def _edge_offsets(self, durations, backward=False):
+        """
+        Desfase de cada arista según su tipo y lag, de modo que la restricción sea un solo término:
+        adelante, inicio[destino] >= inicio[origen] + desfase; atrás, fin tardío[origen] <= fin tardío[destino] + desfase
+        """
+        src, dst = self.pred_indices, self.edge_targets
+        lags = self.pred_lags.astype(np.int64)
+        types = self.pred_types
+        if durations.ndim == 2:
+            lags, types = lags[:, np.newaxis], types[:, np.newaxis]
+        src_durations, dst_durations = durations[src], durations[dst]
+
+        if backward:
+            choices = [
+                -dst_durations - lags,                  # FS: fin tardío del origen = inicio tardío del destino - lag - 1
+                src_durations - dst_durations - lags,   # SS: inicio tardío del destino - lag + duración del origen - 1
+                -lags,                                  # FF: fin tardío del destino - lag
+                src_durations - lags - 1                # SF: fin tardío del destino - lag + duración del origen - 1
+            ]
+        else:
+            choices = [
+                src_durations + lags,                   # FS: comienza tras el fin del predecesor + lag
+                lags,                                   # SS: comienza lag días tras el inicio del predecesor
+                src_durations + lags - dst_durations,   # FF: debe terminar lag días después del predecesor
+                lags + 1 - dst_durations                # SF: el inicio del predecesor determina el fin
+            ]
+        return np.select([types == FS, types == SS, types == FF, types == SF],
+                         [np.broadcast_to(choice, src_durations.shape) for choice in choices])
+
+    def _use_scalar_pass(self, durations):
+        # Decide con la profundidad del orden topológico, sin armar los niveles
+        depth = self.depth()
+        return durations.ndim == 1 and depth > 1 and \
+            self.num_edges < self.SCALAR_PASS_EDGES_PER_LEVEL * depth
+
+    def forward_pass(self, durations):
+        """
+        Pasada hacia adelante (CPM) con relaciones FS/SS/FF/SF y lags
+        durations: (tareas,) o (tareas, escenarios). Devuelve (inicio temprano, fin temprano) en días
+        desde el inicio del proyecto; ninguna tarea comienza antes del día 0.
+        """
+        durations = np.asarray(durations, dtype=np.int64)
+        offsets = self._edge_offsets(durations)
+        start = np.zeros_like(durations)
+
+        if self._use_scalar_pass(durations):
+            # Redes profundas de un escenario: un recorrido en orden topológico sobre listas
+            early = start.tolist()
+            indptr, indices, offset = self.pred_indptr.tolist(), self.pred_indices.tolist(), offsets.tolist()
+            for node in self.topological_order().tolist():
+                value = 0
+                for edge in range(indptr[node], indptr[node + 1]):
+                    candidate = early[indices[edge]] + offset[edge]
+                    if candidate > value:
+                        value = candidate
+                early[node] = value
+            start = np.array(early, dtype=np.int64)
+        else:
+            for _, edges in self.edge_levels():
+                if len(edges):
+                    np.maximum.at(start, self.edge_targets[edges], start[self.pred_indices[edges]] + offsets[edges])
+
+        # La fecha de fin es inicio + duración - 1 (porque el día de inicio cuenta)
+        return start, start + durations - 1
+
+    def backward_pass(self, durations, project_finish):
+        """
+        Pasada hacia atrás (CPM): fechas tardías que no retrasan `project_finish`
+        Devuelve (inicio tardío, fin tardío) con la misma forma que durations
+        """
+        durations = np.asarray(durations, dtype=np.int64)
+        offsets = self._edge_offsets(durations, backward=True)
+        late_finish = np.broadcast_to(np.asarray(project_finish, dtype=np.int64), durations.shape).copy()
+
+        if self._use_scalar_pass(durations):
+            late = late_finish.tolist()
+            indptr, indices, offset = self.succ_indptr.tolist(), self.succ_indices.tolist(), offsets[self.succ_edges].tolist()
+            for node in reversed(self.topological_order().tolist()):
+                value = late[node]
+                for edge in range(indptr[node], indptr[node + 1]):
+                    candidate = late[indices[edge]] + offset[edge]
+                    if candidate < value:
+                        value = candidate
+                late[node] = value
+            late_finish = np.array(late, dtype=np.int64)
+        else:
+            for _, edges in reversed(self.edge_levels(by_source=True)):
+                if len(edges):
+                    np.minimum.at(late_finish, self.pred_indices[edges], late_finish[self.edge_targets[edges]] + offsets[edges])
+
+        return late_finish - durations + 1, late_finish
+
+    def signature(self):
+        """Huella de la topología (sirve para agrupar escenarios que comparten la misma red)"""
+        digest = hashlib.sha1()
+        for array in (self.task_ids, self.pred_indptr, self.pred_indices, self.pred_types, self.pred_lags):
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def nbytes(self):
+        """Bytes de los arreglos CSR (predecesores, sucesores y destinos)"""
+        return int(sum(array.nbytes for array in (
+            self.task_ids, self.pred_indptr, self.pred_indices, self.pred_types, self.pred_lags,
+            self.edge_targets, self.succ_edges, self.succ_indices, self.succ_types, self.succ_lags, self.succ_indptr
+        )))
+
+    def without_edges(self, removed):
+        """Nuevo grafo sin las aristas marcadas en la máscara booleana `removed`"""
+        keep = ~np.asarray(removed, dtype=bool)
+        indptr = np.zeros(self.num_tasks + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.edge_targets[keep], minlength=self.num_tasks), out=indptr[1:])
+        return DependencyGraph(self.task_ids, indptr, self.pred_indices[keep],
+                               self.pred_types[keep], self.pred_lags[keep])
+
+    def redundant_fs_edges(self, durations, block_bits=4096):
+        """
+        Reducción transitiva de cadenas FS: máscara de aristas FS u→v ya implicadas por otro camino
+
+        u→v (lag L) es redundante si otro predecesor FS w de v desciende de u por aristas FS con lag >= 0
+        y duración(w) + lag(w→v) >= L, porque entonces el camino u ⇝ w → v impone al menos la misma
+        fecha de inicio a v; también lo son las aristas FS repetidas con lag menor. Eliminarlas no cambia
+        fechas ni estados. La alcanzabilidad se calcula con bitsets uint64 por bloques de `block_bits`
+        tareas de origen, en un barrido por niveles topológicos por bloque.
+        """
+        durations = np.asarray(durations, dtype=np.int64)
+        src, dst = self.pred_indices, self.edge_targets
+        lags = self.pred_lags.astype(np.int64)
+        fs = self.pred_types == FS
+        redundant = np.zeros(self.num_edges, dtype=bool)
+
+        # Aristas FS repetidas entre las mismas tareas: se conserva la de mayor lag
+        fs_edges = np.flatnonzero(fs)
+        order = fs_edges[np.lexsort((-lags[fs_edges], dst[fs_edges], src[fs_edges]))]
+        repeated = (src[order][1:] == src[order][:-1]) & (dst[order][1:] == dst[order][:-1])
+        redundant[order[1:][repeated]] = True
+
+        # Pares (e = u→v, f = w→v) de aristas FS hacia la misma tarea (fs_edges está ordenado por destino)
+        fs_edges = np.flatnonzero(fs & ~redundant)
+        counts = np.bincount(dst[fs_edges], minlength=self.num_tasks)
+        segment_start = np.cumsum(counts) - counts
+        per_edge = counts[dst[fs_edges]]
+        first = np.repeat(np.arange(len(fs_edges)), per_edge)
+        second = np.repeat(segment_start[dst[fs_edges]], per_edge) + \
+            np.arange(per_edge.sum()) - np.repeat(np.cumsum(per_edge) - per_edge, per_edge)
+        e, f = fs_edges[first], fs_edges[second]
+        candidate = (src[e] != src[f]) & (durations[src[f]] + lags[f] >= lags[e])
+        e, f = e[candidate], f[candidate]
+        if not len(e):
+            return redundant
+
+        # Aristas por las que se propaga la alcanzabilidad, agrupadas por nivel de destino
+        propagating = fs & (lags >= 0)
+        level_edges = []
+        for _, edges in self.edge_levels():
+            edges = edges[propagating[edges]]
+            if len(edges):
+                edges = edges[np.argsort(dst[edges], kind='stable')]
+                targets, starts = np.unique(dst[edges], return_index=True)
+                level_edges.append((edges, targets, starts))
+
+        words = block_bits // 64
+        for block_start in range(0, self.num_tasks, block_bits):
+            in_block = (src[e] >= block_start) & (src[e] < block_start + block_bits)
+            if not in_block.any():
+                continue
+
+            # reach[t] = bitset de los ancestros FS de t dentro del bloque
+            reach = np.zeros((self.num_tasks, words), dtype=np.uint64)
+            for edges, targets, starts in level_edges:
+                sources = src[edges]
+                contribution = reach[sources]
+                local = sources - block_start
+                own = (local >= 0) & (local < block_bits)
+                contribution[own, local[own] // 64] |= np.left_shift(np.uint64(1), (local[own] % 64).astype(np.uint64))
+                reach[targets] |= np.bitwise_or.reduceat(contribution, starts, axis=0)
+
+            block_e, block_f = e[in_block], f[in_block]
+            local = src[block_e] - block_start
+            bits = np.right_shift(reach[src[block_f], local // 64], (local % 64).astype(np.uint64)) & np.uint64(1)
+            redundant[block_e[bits.astype(bool)]] = True
+
+        return redundant
+
+    def transitive_reduction(self, durations):
+        """
+        Aplica redundant_fs_edges: devuelve (grafo reducido, máscara de aristas eliminadas)
+        """
+        removed = self.redundant_fs_edges(durations)
+        return self.without_edges(removed), removed
+
+
+class ReachabilityIndex:
+    """
+    Índice de alcanzabilidad (ancestros y descendientes) por etiquetado de intervalos
+
+    Las tareas se numeran en postorden sobre un bosque generador de la red, de modo que los
+    descendientes de cada tarea quedan en pocos intervalos contiguos [inicio, fin] (y lo mismo para
+    los ancestros sobre la red invertida). Consultar si una tarea alcanza a otra es una búsqueda
+    binaria; el conjunto de impacto es la unión de los intervalos. Agregar o quitar dependencias
+    actualiza solo las tareas afectadas.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.task_ids = graph.task_ids
+        self.id_to_index = graph.id_to_index
+        num_tasks = graph.num_tasks
+
+        self.successors = [set() for _ in range(num_tasks)]
+        self.predecessors = [set() for _ in range(num_tasks)]
+        for src, dst in zip(graph.pred_indices.tolist(), graph.edge_targets.tolist()):
+            self.successors[src].add(dst)
+            self.predecessors[dst].add(src)
+
+        order = graph.topological_order().tolist()
+        if len(order) != num_tasks:
+            raise ValueError("La red de dependencias tiene ciclos")
+
+        # Descendientes sobre la red; ancestros sobre la red invertida
+        self.post_desc, self.node_at_post_desc = self._postorder(self.successors, self.predecessors)
+        self.post_anc, self.node_at_post_anc = self._postorder(self.predecessors, self.successors)
+        self.desc = [None] * num_tasks
+        self.anc = [None] * num_tasks
+        self._relabel(reversed(order), self.desc, self.successors, self.post_desc)
+        self._relabel(order, self.anc, self.predecessors, self.post_anc)
+
+    @staticmethod
+    def _postorder(children_of, parents_of):
+        """Postorden de una búsqueda en profundidad sobre toda la red (su árbol DFS es el bosque generador)"""
+        num_tasks = len(children_of)
+        post = np.empty(num_tasks, dtype=np.int64)
+        node_at_post = np.empty(num_tasks, dtype=np.int64)
+        visited = np.zeros(num_tasks, dtype=bool)
+        counter = 0
+        for root in range(num_tasks):
+            if parents_of[root] or visited[root]:
+                continue
+            visited[root] = True
+            stack = [(root, iter(sorted(children_of[root])))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if not visited[child]:
+                        visited[child] = True
+                        stack.append((child, iter(sorted(children_of[child]))))
+                        break
+                else:
+                    stack.pop()
+                    post[node] = counter
+                    node_at_post[counter] = node
+                    counter += 1
+        return post, node_at_post
+
+    @staticmethod
+    def _merge(labels):
+        """Une etiquetas (inicios, fines) fusionando intervalos solapados o contiguos"""
+        if len(labels) == 1:
+            return labels[0]
+        starts = np.concatenate([starts for starts, _ in labels])
+        ends = np.concatenate([ends for _, ends in labels])
+        order = np.argsort(starts, kind='stable')
+        starts, ends = starts[order], np.maximum.accumulate(ends[order])
+        opens = np.flatnonzero(np.concatenate(([True], starts[1:] > ends[:-1] + 1)))
+        return starts[opens], ends[np.append(opens[1:] - 1, len(ends) - 1)]
+
+    def _relabel(self, nodes, labels, children_of, post):
+        # `nodes` debe llegar con los hijos antes que los padres
+        for node in nodes:
+            own = np.array([post[node]], dtype=np.int32)
+            labels[node] = self._merge([(own, own)] + [labels[child] for child in children_of[node]])
+
+    @staticmethod
+    def _contains(label, position):
+        starts, ends = label
+        i = starts.searchsorted(position, side='right') - 1
+        return i >= 0 and ends[i] >= position
+
+    @staticmethod
+    def _positions(label):
+        # Posiciones de postorden cubiertas por los intervalos de una etiqueta
+        starts, ends = label
+        lengths = ends - starts + 1
+        return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+    def _expand(self, label, node_at_post, exclude):
+        nodes = node_at_post[self._positions(label)]
+        return np.sort(self.task_ids[nodes[nodes != exclude]])
+
+    def reaches(self, from_id, to_id):
+        """True si `to_id` depende (directa o indirectamente) de `from_id`"""
+        source, target = self.id_to_index[from_id], self.id_to_index[to_id]
+        return source != target and self._contains(self.desc[source], int(self.post_desc[target]))
+
+    def descendants(self, task_id):
+        """IDs de las tareas impactadas si `task_id` se retrasa"""
+        index = self.id_to_index[task_id]
+        return self._expand(self.desc[index], self.node_at_post_desc, index)
+
+    def ancestors(self, task_id):
+        """IDs de las tareas de las que depende `task_id`"""
+        index = self.id_to_index[task_id]
+        return self._expand(self.anc[index], self.node_at_post_anc, index)
+
+    def num_intervals(self):
+        """Total de intervalos almacenados (tamaño del índice)"""
+        return sum(len(starts) for starts, _ in self.desc) + sum(len(starts) for starts, _ in self.anc)
+
+    def add_dependency(self, pred_id, task_id):
+        """Registra la dependencia pred_id → task_id y propaga los nuevos alcances"""
+        source, target = self.id_to_index[pred_id], self.id_to_index[task_id]
+        if source == target or self._contains(self.desc[target], int(self.post_desc[source])):
+            raise ValueError(f"La dependencia {pred_id} → {task_id} crearía un ciclo")
+
+        self.successors[source].add(target)
+        self.predecessors[target].add(source)
+
+        # Los ancestros de source ganan los descendientes de target y viceversa
+        gained_desc, gained_anc = self.desc[target], self.anc[source]
+        for node in self._members(self.anc[source], self.node_at_post_anc):
+            self.desc[node] = self._merge([self.desc[node], gained_desc])
+        for node in self._members(self.desc[target], self.node_at_post_desc):
+            self.anc[node] = self._merge([self.anc[node], gained_anc])
+
+    def remove_dependency(self, pred_id, task_id):
+        """Quita la dependencia pred_id → task_id y recalcula solo las etiquetas afectadas"""
+        source, target = self.id_to_index[pred_id], self.id_to_index[task_id]
+        affected_desc = self._members(self.anc[source], self.node_at_post_anc)
+        affected_anc = self._members(self.desc[target], self.node_at_post_desc)
+
+        self.successors[source].discard(target)
+        self.predecessors[target].discard(source)
+
+        self._relabel(self._ordered(affected_desc, self.successors), self.desc, self.successors, self.post_desc)
+        self._relabel(self._ordered(affected_anc, self.predecessors), self.anc, self.predecessors, self.post_anc)
+
+    def _members(self, label, node_at_post):
+        return node_at_post[self._positions(label)].tolist()
+
+    @staticmethod
+    def _ordered(nodes, children_of):
+        """Orden topológico del subconjunto `nodes` con los hijos primero (Kahn restringido)"""
+        members = set(nodes)
+        pending = {node: len(children_of[node] & members) for node in members}
+        ready = [node for node, count in pending.items() if count == 0]
+        parents_of = {node: [] for node in members}
+        for node in members:
+            for child in children_of[node] & members:
+                parents_of[child].append(node)
+
+        ordered = []
+        while ready:
+            node = ready.pop()
+            ordered.append(node)
+            for parent in parents_of[node]:
+                pending[parent] -= 1
+                if pending[parent] == 0:
+                    ready.append(parent)
+        return ordered
+
+
+def forecast_dates(graph, task_arrays, current_days, respect_planned_start=True):
+    """
+    Pronostica inicio y fin de las tareas no terminadas propagando fechas reales y estimadas
+    de los predecesores (semántica FS/SS/FF/SF) en un único barrido topológico por niveles
+
+    task_arrays: (escenarios, tareas, TASK_ARRAY_FIELDS) o (tareas, TASK_ARRAY_FIELDS); todos los
+    escenarios deben compartir `graph`. current_days: día de evaluación por escenario (desde el inicio).
+    Devuelve (inicio, fin) pronosticados en días, con la misma forma escenarios x tareas.
+    """
+    task_arrays = np.asarray(task_arrays, dtype=np.float64)
+    single = task_arrays.ndim == 2
+    if single:
+        task_arrays = task_arrays[np.newaxis]
+
+    num_tasks = graph.num_tasks
+    field = {name: i for i, name in enumerate(TASK_ARRAY_FIELDS)}
+    NO_CONSTRAINT = -(1 << 40)  # cota neutra que no desborda al restar duraciones
+
+    # Disposición tareas x escenarios: cada arista opera sobre una fila completa de escenarios
+    values = task_arrays[:, :num_tasks, :].transpose(1, 0, 2)
+    durations = values[:, :, field["Duración Planificada (días)"]].astype(np.int64)
+    state = values[:, :, field["Estado (código)"]]
+    progress = np.nan_to_num(values[:, :, field["% Avance Físico"]])
+    planned_start = values[:, :, field["Inicio Planificado (día)"]].astype(np.int64)
+    actual_start = values[:, :, field["Inicio Real (día)"]]
+    actual_finish = values[:, :, field["Fin Real (día)"]]
+    today = np.broadcast_to(np.asarray(current_days, dtype=np.int64), (values.shape[1],))[np.newaxis, :]
+
+    completed = state >= TASK_STATE_CODES["Completada"]
+    in_progress = (state >= TASK_STATE_CODES["En progreso"]) & ~completed
+    not_started = ~completed & ~in_progress
+
+    # Cotas iniciales: hoy (y el inicio planificado) para las no iniciadas; trabajo restante para las en curso
+    start = np.where(not_started, today, 0)
+    if respect_planned_start:
+        start = np.where(not_started, np.maximum(start, planned_start), start)
+    start = np.where(completed | in_progress, np.nan_to_num(actual_start).astype(np.int64), start)
+
+    remaining = np.ceil(durations * (1 - progress / 100)).astype(np.int64)
+    finish = np.where(in_progress, today + np.maximum(remaining, 1) - 1, start + durations - 1)
+    finish = np.where(completed, np.nan_to_num(actual_finish).astype(np.int64), finish)
+
+    for nodes, edges in graph.edge_levels():
+        if len(edges):
+            src = graph.pred_indices[edges]
+            dst = graph.edge_targets[edges]
+            lags = graph.pred_lags[edges].astype(np.int64)[:, np.newaxis]
+            types = graph.pred_types[edges][:, np.newaxis]
+
+            # Restricción sobre el inicio (FS/SS) o sobre el fin (FF/SF) de la sucesora
+            start_constraint = np.where(types == FS, finish[src] + lags + 1,
+                                        np.where(types == SS, start[src] + lags, NO_CONSTRAINT))
+            finish_constraint = np.where(types == FF, finish[src] + lags,
+                                         np.where(types == SF, start[src] + lags, NO_CONSTRAINT))
+
+            # Las no iniciadas se mueven por ambas restricciones; las en curso solo por su fin
+            dst_not_started = not_started[dst]
+            dst_in_progress = in_progress[dst]
+            shifted_start = np.maximum(start_constraint, finish_constraint - durations[dst] + 1)
+            np.maximum.at(start, dst, np.where(dst_not_started, shifted_start, NO_CONSTRAINT))
+            np.maximum.at(finish, dst, np.where(dst_in_progress, finish_constraint, NO_CONSTRAINT))
+
+        level_not_started = not_started[nodes]
+        finish[nodes] = np.where(level_not_started, start[nodes] + durations[nodes] - 1, finish[nodes])
+
+    start, finish = start.T, finish.T
+    if single:
+        return start[0], finish[0]
+    return start, finish
+
+
+def critical_chain_buffers(graph, durations, uncertainty):
+    """
+    Buffers de cadena crítica (CCPM) con dimensionamiento raíz de suma de cuadrados (RSS)
+
+    durations, uncertainty: (tareas,) o (tareas, escenarios); uncertainty es la holgura de seguridad
+    en días de cada tarea (duración x riesgo de la fase). Con una pasada hacia adelante y otra hacia
+    atrás se obtiene la holgura total; un barrido adicional acumula la incertidumbre al cuadrado de la
+    cadena que conduce a cada tarea sin mezclar tareas críticas con no críticas.
+
+    Devuelve un diccionario con early_start, early_finish, total_float, critical (bool),
+    project_buffer (por escenario) y feeding_buffers (días, en la tarea final de cada cadena de alimentación).
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    uncertainty = np.asarray(uncertainty, dtype=np.float64)
+    scenario_axis = durations.ndim == 2
+
+    early_start, early_finish = graph.forward_pass(durations)
+    project_finish = early_finish.max(axis=0)
+    late_start, _ = graph.backward_pass(durations, project_finish)
+    total_float = late_start - early_start
+    critical = total_float <= 0
+
+    # Incertidumbre acumulada (suma de cuadrados) de la cadena más riesgosa que llega a cada tarea
+    squared = uncertainty ** 2
+    accumulated = squared.copy()
+    for _, edges in graph.edge_levels():
+        if len(edges):
+            src = graph.pred_indices[edges]
+            dst = graph.edge_targets[edges]
+            same_chain = critical[src] == critical[dst]
+            np.maximum.at(accumulated, dst, np.where(same_chain, accumulated[src] + squared[dst], 0.0))
+
+    project_buffer = np.ceil(np.sqrt(np.where(critical, accumulated, 0.0).max(axis=0)))
+
+    # Buffers de alimentación donde una cadena no crítica se une a la cadena crítica
+    feeding_buffers = np.zeros_like(accumulated)
+    src = graph.pred_indices
+    merges = ~critical[src] & critical[graph.edge_targets]
+    if scenario_axis:
+        edge_idx, scenario_idx = np.nonzero(merges)
+        np.maximum.at(feeding_buffers, (src[edge_idx], scenario_idx),
+                      np.ceil(np.sqrt(accumulated[src[edge_idx], scenario_idx])))
+    else:
+        merge_src = src[merges]
+        np.maximum.at(feeding_buffers, merge_src, np.ceil(np.sqrt(accumulated[merge_src])))
+
+    return {
+        'early_start': early_start,
+        'early_finish': early_finish,
+        'total_float': total_float,
+        'critical': critical,
+        'project_buffer': project_buffer.astype(np.int64),
+        'feeding_buffers': feeding_buffers.astype(np.int64)
+    }
+
+
+def _spread_daily(rows, first_day, last_day, amount, horizon):
+    """
+    Reparte `amount` en partes iguales entre first_day y last_day (inclusive) de cada fila usando un
+    arreglo de diferencias (+tasa en el primer día, -tasa al día siguiente del último) y una suma prefija
+    Devuelve el gasto diario (filas x horizon); los días fuera de [0, horizon) se recortan
+    """
+    num_rows = int(rows.max()) + 1 if len(rows) else 0
+    rate = amount / (last_day - first_day + 1)
+    first = np.clip(first_day, 0, horizon)
+    after_last = np.clip(last_day + 1, 0, horizon)
+    stride = horizon + 1
+    diff = np.bincount(np.concatenate([rows * stride + first, rows * stride + after_last]),
+                       weights=np.concatenate([rate, -rate]), minlength=num_rows * stride)
+    return diff.reshape(num_rows, stride).cumsum(axis=1)[:, :horizon]
+
+
+def cost_s_curves(task_arrays, phase_codes=None, num_phases=None, current_days=None, horizon=None):
+    """
+    Curvas S de costo: gasto diario y acumulado, planificado y real, por escenario y fase
+
+    task_arrays: (tareas, TASK_ARRAY_FIELDS) o (escenarios, tareas, TASK_ARRAY_FIELDS), con días desde el
+    inicio del proyecto. El costo planificado se reparte uniformemente entre Inicio y Fin Planificado; el
+    costo real entre Inicio y Fin Real (o hasta current_days, el día de evaluación, si la tarea sigue en
+    curso). phase_codes: índice de fase por tarea (misma forma que task_arrays sin el último eje); sin él
+    todas las tareas forman una sola fase. horizon: número de días (por defecto hasta el último gasto).
+
+    Devuelve un diccionario con planned_daily, actual_daily, planned y actual (acumulados), cada uno de
+    forma (escenarios, fases, días) o (fases, días) para un solo escenario.
+    """
+    task_arrays = np.asarray(task_arrays, dtype=np.float64)
+    single = task_arrays.ndim == 2
+    if single:
+        task_arrays = task_arrays[np.newaxis]
+    num_scenarios, num_tasks = task_arrays.shape[:2]
+    field = {name: i for i, name in enumerate(TASK_ARRAY_FIELDS)}
+
+    if phase_codes is None:
+        phase_codes = np.zeros((num_scenarios, num_tasks), dtype=np.int64)
+    phase_codes = np.broadcast_to(np.asarray(phase_codes, dtype=np.int64), (num_scenarios, num_tasks))
+    if num_phases is None:
+        num_phases = int(phase_codes.max()) + 1 if phase_codes.size else 1
+
+    planned_start = task_arrays[:, :, field["Inicio Planificado (día)"]]
+    planned_finish = task_arrays[:, :, field["Fin Planificado (día)"]]
+    planned_cost = task_arrays[:, :, field["Costo Planificado (USD)"]]
+    actual_start = task_arrays[:, :, field["Inicio Real (día)"]]
+    actual_finish = task_arrays[:, :, field["Fin Real (día)"]]
+    actual_cost = task_arrays[:, :, field["Costo Real (USD)"]]
+    state = task_arrays[:, :, field["Estado (código)"]]
+
+    # Las tareas en curso acumulan su costo real hasta el día de evaluación
+    if current_days is None:
+        current_days = np.nanmax(np.where(np.isnan(actual_finish), actual_start, actual_finish), axis=1)
+    today = np.broadcast_to(np.asarray(current_days, dtype=np.float64).reshape(-1, 1), (num_scenarios, num_tasks))
+    in_progress = (state >= TASK_STATE_CODES["En progreso"]) & (state < TASK_STATE_CODES["Completada"])
+    actual_end = np.where(in_progress, np.maximum(today, actual_start), actual_finish)
+
+    planned_mask = ~np.isnan(planned_start) & ~np.isnan(planned_finish) & ~np.isnan(planned_cost)
+    actual_mask = ~np.isnan(actual_start) & ~np.isnan(actual_end) & ~np.isnan(actual_cost)
+    planned_mask &= planned_finish >= planned_start
+    actual_mask &= actual_end >= actual_start
+
+    if horizon is None:
+        last = max(planned_finish[planned_mask].max(initial=-1), actual_end[actual_mask].max(initial=-1))
+        horizon = int(last) + 1
+    horizon = max(int(horizon), 1)
+
+    rows = np.arange(num_scenarios)[:, np.newaxis] * num_phases + phase_codes
+    total_rows = num_scenarios * num_phases
+
+    def spread(mask, first_day, last_day, amount):
+        selected_rows = np.append(rows[mask], total_rows - 1)  # fija el número de filas
+        daily = _spread_daily(selected_rows, np.append(first_day[mask], 0).astype(np.int64),
+                              np.append(last_day[mask], 0).astype(np.int64),
+                              np.append(amount[mask], 0.0), horizon)
+        return daily.reshape(num_scenarios, num_phases, horizon)
+
+    planned_daily = spread(planned_mask, planned_start, planned_finish, planned_cost)
+    actual_daily = spread(actual_mask, actual_start, actual_end, actual_cost)
+
+    curves = {
+        'planned_daily': planned_daily,
+        'actual_daily': actual_daily,
+        'planned': planned_daily.cumsum(axis=-1),
+        'actual': actual_daily.cumsum(axis=-1)
+    }
+    if single:
+        curves = {name: curve[0] for name, curve in curves.items()}
+    return curves
+
+
+def s_curve_percentiles(curves, percentiles=(10, 50, 90), horizon=None):
+    """
+    Bandas de percentiles entre escenarios de curvas S acumuladas
+
+    curves: arreglo (escenarios, ..., días) o lista de arreglos con distinto número de días; las curvas
+    más cortas se extienden con su último valor (el acumulado ya no cambia). Devuelve un arreglo
+    (percentiles, ..., días).
+    """
+    if not isinstance(curves, np.ndarray):
+        curves = list(curves)
+        if horizon is None:
+            horizon = max(curve.shape[-1] for curve in curves)
+        curves = np.stack([_extend_curve(curve, horizon) for curve in curves])
+    elif horizon is not None:
+        curves = _extend_curve(curves, horizon)
+    return np.percentile(curves, percentiles, axis=0)
+
+
+def _extend_curve(curve, horizon):
+    """
+    Recorta o extiende una curva acumulada hasta `horizon` días repitiendo su último valor
+    """
+    if curve.shape[-1] >= horizon:
+        return curve[..., :horizon]
+    pad = [(0, 0)] * (curve.ndim - 1) + [(0, horizon - curve.shape[-1])]
+    return np.pad(curve, pad, mode='edge')
+
+
+# Configuración por defecto del simulador (un archivo JSON de sitio puede reemplazar cualquier clave)
+DEFAULT_SIMULATION_CONFIG = {
+    "phases": [
+        {"name": "Preparación del Terreno", "risk": 0.15},
+        {"name": "Movimiento de Tierra", "risk": 0.30},
+        {"name": "Cimentaciones", "risk": 0.25},
+        {"name": "Estructuras Principales", "risk": 0.20},
+        {"name": "Instalaciones Mecánicas", "risk": 0.35},
+        {"name": "Instalaciones Eléctricas", "risk": 0.25},
+        {"name": "Acabados y Pruebas", "risk": 0.30},
+        {"name": "Puesta en Marcha", "risk": 0.20}
+    ],
+    "default_phase_risk": 0.2,
+    "profiles": [
+        {"name": "Proyecto Adelantado", "completed": [0.60, 0.80], "in_progress": [0.05, 0.15], "delay_factor": 0.1},
+        {"name": "Proyecto Normal", "completed": [0.40, 0.60], "in_progress": [0.10, 0.20], "delay_factor": 0.2},
+        {"name": "Proyecto Retrasado", "completed": [0.20, 0.40], "in_progress": [0.15, 0.30], "delay_factor": 0.4},
+        {"name": "Proyecto Inicial", "completed": [0.05, 0.20], "in_progress": [0.05, 0.15], "delay_factor": 0.15},
+        {"name": "Proyecto Crítico", "completed": [0.30, 0.45], "in_progress": [0.25, 0.35], "delay_factor": 0.5}
+    ],
+    "network_styles": [
+        {"name": "Paralela", "parallel_factor": 0.7, "max_predecessors": 3},
+        {"name": "Secuencial", "parallel_factor": 0.3, "max_predecessors": 2},
+        {"name": "Mixta", "parallel_factor": 0.5, "max_predecessors": 4},
+        {"name": "Compleja", "parallel_factor": 0.6, "max_predecessors": 5}
+    ],
+    # chain_factor escala los buffers de cadena crítica (proporcional al multiplicador por tarea)
+    "buffer_strategies": [
+        {"name": "conservative", "multiplier": 0.3, "min_buffer": 3, "chain_factor": 1.5},
+        {"name": "moderate", "multiplier": 0.2, "min_buffer": 2, "chain_factor": 1.0},
+        {"name": "aggressive", "multiplier": 0.1, "min_buffer": 1, "chain_factor": 0.5}
+    ],
+    "delay_causes": [
+        "Condiciones climáticas adversas",
+        "Problemas de suministro de materiales",
+        "Fallas de equipos",
+        "Cambios en especificaciones técnicas",
+        "Problemas geotécnicos inesperados",
+        "Retrasos en permisos regulatorios",
+        "Conflictos laborales",
+        "Problemas de acceso logístico"
+    ],
+    "tasks": [
+        # Fase 1: Preparación del Terreno (6 tareas)
+        {"fase": "Preparación del Terreno", "tarea": "Topografía y replanteo", "duracion": 5, "costo_base": 15000},
+        {"fase": "Preparación del Terreno", "tarea": "Limpieza y desbroce", "duracion": 8, "costo_base": 25000},
+        {"fase": "Preparación del Terreno", "tarea": "Construcción de accesos temporales", "duracion": 12, "costo_base": 45000},
+        {"fase": "Preparación del Terreno", "tarea": "Instalación de servicios temporales", "duracion": 6, "costo_base": 20000},
+        {"fase": "Preparación del Terreno", "tarea": "Cercado perimetral", "duracion": 4, "costo_base": 12000},
+        {"fase": "Preparación del Terreno", "tarea": "Señalización y seguridad", "duracion": 3, "costo_base": 8000},
+
+        # Fase 2: Movimiento de Tierra (8 tareas)
+        {"fase": "Movimiento de Tierra", "tarea": "Excavación general", "duracion": 15, "costo_base": 120000},
+        {"fase": "Movimiento de Tierra", "tarea": "Excavación para cimentaciones", "duracion": 10, "costo_base": 75000},
+        {"fase": "Movimiento de Tierra", "tarea": "Nivelación y compactación", "duracion": 8, "costo_base": 40000},
+        {"fase": "Movimiento de Tierra", "tarea": "Sistema de drenaje temporal", "duracion": 6, "costo_base": 30000},
+        {"fase": "Movimiento de Tierra", "tarea": "Estabilización de taludes", "duracion": 12, "costo_base": 85000},
+        {"fase": "Movimiento de Tierra", "tarea": "Control de erosión", "duracion": 5, "costo_base": 18000},
+        {"fase": "Movimiento de Tierra", "tarea": "Vías de acceso internas", "duracion": 14, "costo_base": 95000},
+        {"fase": "Movimiento de Tierra", "tarea": "Plataformas de equipos", "duracion": 7, "costo_base": 35000},
+
+        # Fase 3: Cimentaciones (6 tareas)
+        {"fase": "Cimentaciones", "tarea": "Armado de cimentaciones principales", "duracion": 12, "costo_base": 180000},
+        {"fase": "Cimentaciones", "tarea": "Vaciado de concreto cimentaciones", "duracion": 8, "costo_base": 220000},
+        {"fase": "Cimentaciones", "tarea": "Curado y fraguado", "duracion": 14, "costo_base": 15000},
+        {"fase": "Cimentaciones", "tarea": "Cimentaciones para equipos", "duracion": 10, "costo_base": 95000},
+        {"fase": "Cimentaciones", "tarea": "Anclajes especiales", "duracion": 6, "costo_base": 45000},
+        {"fase": "Cimentaciones", "tarea": "Impermeabilización", "duracion": 4, "costo_base": 25000},
+
+        # Fase 4: Estructuras Principales (8 tareas)
+        {"fase": "Estructuras Principales", "tarea": "Montaje estructura metálica principal", "duracion": 18, "costo_base": 450000},
+        {"fase": "Estructuras Principales", "tarea": "Estructura de tolvas", "duracion": 12, "costo_base": 280000},
+        {"fase": "Estructuras Principales", "tarea": "Pasarelas y plataformas", "duracion": 10, "costo_base": 125000},
+        {"fase": "Estructuras Principales", "tarea": "Sistema de soportes", "duracion": 8, "costo_base": 85000},
+        {"fase": "Estructuras Principales", "tarea": "Techumbres y cubiertas", "duracion": 14, "costo_base": 165000},
+        {"fase": "Estructuras Principales", "tarea": "Cerramientos laterales", "duracion": 9, "costo_base": 95000},
+        {"fase": "Estructuras Principales", "tarea": "Estructuras auxiliares", "duracion": 7, "costo_base": 55000},
+        {"fase": "Estructuras Principales", "tarea": "Acabados estructurales", "duracion": 5, "costo_base": 35000},
+
+        # Fase 5: Instalaciones Mecánicas (8 tareas)
+        {"fase": "Instalaciones Mecánicas", "tarea": "Montaje de equipos principales", "duracion": 20, "costo_base": 850000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Sistema de transporte de material", "duracion": 15, "costo_base": 320000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Tuberías y ductos", "duracion": 12, "costo_base": 180000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Sistemas de ventilación", "duracion": 8, "costo_base": 95000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Sistema hidráulico", "duracion": 10, "costo_base": 145000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Equipos de seguridad mecánica", "duracion": 6, "costo_base": 75000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Alineación y calibración", "duracion": 8, "costo_base": 55000},
+        {"fase": "Instalaciones Mecánicas", "tarea": "Pruebas mecánicas iniciales", "duracion": 5, "costo_base": 25000},
+
+        # Fase 6: Instalaciones Eléctricas (6 tareas)
+        {"fase": "Instalaciones Eléctricas", "tarea": "Tableros eléctricos principales", "duracion": 8, "costo_base": 125000},
+        {"fase": "Instalaciones Eléctricas", "tarea": "Cableado y canalizaciones", "duracion": 12, "costo_base": 185000},
+        {"fase": "Instalaciones Eléctricas", "tarea": "Motores y controles", "duracion": 10, "costo_base": 245000},
+        {"fase": "Instalaciones Eléctricas", "tarea": "Sistema de iluminación", "duracion": 6, "costo_base": 45000},
+        {"fase": "Instalaciones Eléctricas", "tarea": "Sistema de respaldo", "duracion": 7, "costo_base": 95000},
+        {"fase": "Instalaciones Eléctricas", "tarea": "Pruebas eléctricas", "duracion": 4, "costo_base": 18000},
+
+        # Fase 7: Acabados y Pruebas (4 tareas)
+        {"fase": "Acabados y Pruebas", "tarea": "Sistemas de control y automatización", "duracion": 15, "costo_base": 385000},
+        {"fase": "Acabados y Pruebas", "tarea": "Integración de sistemas", "duracion": 10, "costo_base": 125000},
+        {"fase": "Acabados y Pruebas", "tarea": "Pruebas integrales", "duracion": 12, "costo_base": 85000},
+        {"fase": "Acabados y Pruebas", "tarea": "Corrección de observaciones", "duracion": 8, "costo_base": 45000},
+
+        # Fase 8: Puesta en Marcha (4 tareas)
+        {"fase": "Puesta en Marcha", "tarea": "Capacitación de operadores", "duracion": 10, "costo_base": 55000},
+        {"fase": "Puesta en Marcha", "tarea": "Puesta en marcha asistida", "duracion": 14, "costo_base": 95000},
+        {"fase": "Puesta en Marcha", "tarea": "Pruebas de rendimiento", "duracion": 7, "costo_base": 35000},
+        {"fase": "Puesta en Marcha", "tarea": "Entrega final", "duracion": 3, "costo_base": 15000}
+    ]
+}
+
+# Configuraciones compiladas por archivo (ruta, fecha de modificación, tamaño)
+_COMPILED_CONFIG_CACHE = {}
+
+
+class CompiledSimulationConfig:
+    """
+    Configuración validada y compilada una sola vez, compartida en modo lectura por todos los schedulers
+
+    Las listas se guardan como tuplas, los diccionarios como vistas de solo lectura y las probabilidades
+    como tablas acumuladas NumPy no modificables. Las entradas con "weight" se sortean con esas tablas;
+    sin pesos el sorteo es uniforme (igual que random.choice).
+    """
+
+    SAMPLED_TABLES = ("profiles", "network_styles", "buffer_strategies", "delay_causes")
+
+    def __init__(self, raw):
+        errors = []
+
+        def require(condition, message):
+            if not condition:
+                errors.append(message)
+
+        def named_entries(key):
+            entries = raw.get(key) or []
+            require(len(entries) > 0, f"'{key}' no puede estar vacío")
+            entries = [{"name": entry} if isinstance(entry, str) else dict(entry) for entry in entries]
+            names = [entry.get("name") for entry in entries]
+            require(all(isinstance(name, str) and name for name in names), f"'{key}': toda entrada requiere 'name'")
+            require(len(set(names)) == len(names), f"'{key}': nombres duplicados")
+            for entry in entries:
+                require(float(entry.get("weight", 1)) > 0, f"'{key}': el peso de '{entry.get('name')}' debe ser positivo")
+            return entries
+
+        phases = named_entries("phases")
+        profiles = named_entries("profiles")
+        network_styles = named_entries("network_styles")
+        buffer_strategies = named_entries("buffer_strategies")
+        delay_causes = named_entries("delay_causes")
+        tasks = list(raw.get("tasks") or [])
+        require(len(tasks) > 0, "'tasks' no puede estar vacío")
+
+        default_risk = float(raw.get("default_phase_risk", 0.2))
+        for phase in phases:
+            require(0 <= float(phase.get("risk", default_risk)) <= 1, f"Riesgo fuera de [0, 1] en la fase '{phase['name']}'")
+        for profile in profiles:
+            for key in ("completed", "in_progress"):
+                low, high = profile.get(key, (None, None))
+                require(low is not None and 0 <= low <= high <= 1,
+                        f"Perfil '{profile['name']}': '{key}' debe ser [mínimo, máximo] dentro de [0, 1]")
+            require(profile.get("delay_factor", -1) >= 0, f"Perfil '{profile['name']}': 'delay_factor' inválido")
+        for style in network_styles:
+            require(0 <= style.get("parallel_factor", -1) <= 1, f"Red '{style['name']}': 'parallel_factor' inválido")
+            require(int(style.get("max_predecessors", 0)) >= 1, f"Red '{style['name']}': 'max_predecessors' inválido")
+        for strategy in buffer_strategies:
+            require(all(strategy.get(key, -1) >= 0 for key in ("multiplier", "min_buffer", "chain_factor")),
+                    f"Estrategia '{strategy['name']}': 'multiplier', 'min_buffer' y 'chain_factor' son obligatorios")
+        phase_names = [phase["name"] for phase in phases]
+        for i, task in enumerate(tasks):
+            require(task.get("fase") in phase_names, f"Tarea {i + 1}: fase desconocida '{task.get('fase')}'")
+            require(bool(task.get("tarea")), f"Tarea {i + 1}: falta 'tarea'")
+            require(isinstance(task.get("duracion"), int) and task["duracion"] > 0, f"Tarea {i + 1}: 'duracion' inválida")
+            require(task.get("costo_base", -1) >= 0, f"Tarea {i + 1}: 'costo_base' inválido")
+
+        if errors:
+            raise ValueError("Configuración inválida:\n- " + "\n- ".join(errors))
+
+        self.raw = raw
+
+        def read_only(array):
+            array = np.asarray(array)
+            array.flags.writeable = False
+            return array
+
+        self.phases = tuple(phase_names)
+        self.default_phase_risk = default_risk
+        self.phase_risk_factors = MappingProxyType(
+            {phase["name"]: float(phase.get("risk", default_risk)) for phase in phases})
+        self.phase_index = MappingProxyType({name: i for i, name in enumerate(self.phases)})
+        self.phase_risk_vector = read_only([self.phase_risk_factors[name] for name in self.phases])
+
+        self.profiles = tuple(MappingProxyType(profile) for profile in profiles)
+        self.network_styles = tuple(MappingProxyType(style) for style in network_styles)
+        self.buffer_strategies = MappingProxyType(
+            {strategy["name"]: MappingProxyType(strategy) for strategy in buffer_strategies})
+        self.buffer_strategy_names = tuple(self.buffer_strategies)
+        self.delay_causes = tuple(cause["name"] for cause in delay_causes)
+        self.dependency_types = DEPENDENCY_TYPES
+
+        self.task_template = tuple(MappingProxyType(dict(task)) for task in tasks)
+        self.template_durations = read_only([task["duracion"] for task in tasks])
+        self.template_costs = read_only([task["costo_base"] for task in tasks])
+        self.template_phase_codes = read_only([self.phase_index[task["fase"]] for task in tasks])
+
+        # Tablas acumuladas; None cuando todas las entradas pesan igual (sorteo uniforme)
+        entries = {"profiles": profiles, "network_styles": network_styles,
+                   "buffer_strategies": buffer_strategies, "delay_causes": delay_causes}
+        self.cumulative_weights = MappingProxyType({
+            name: (None if all("weight" not in entry for entry in entries[name])
+                   else read_only(np.cumsum([float(entry.get("weight", 1)) for entry in entries[name]])))
+            for name in self.SAMPLED_TABLES
+        })
+
+    def __reduce__(self):
+        # Las vistas de solo lectura no se serializan; otro proceso recompila desde el diccionario original
+        return (CompiledSimulationConfig, (self.raw,))
+
+    def choose(self, table, rng=random, u=None):
+        """
+        Sortea el índice de una entrada de `table` ("profiles", "network_styles", "buffer_strategies", "delay_causes")
+        Con `u` en [0, 1) (muestreo estratificado) se usa ese valor en lugar de un sorteo de `rng`
+        """
+        cumulative = self.cumulative_weights[table]
+        size = self._table_size(table)
+        if cumulative is None:
+            return rng.randrange(size) if u is None else min(int(u * size), size - 1)
+        if u is None:
+            u = rng.random()
+        return min(int(np.searchsorted(cumulative, u * cumulative[-1], side="right")), size - 1)
+
+    def _table_size(self, table):
+        return len(self.buffer_strategy_names if table == "buffer_strategies" else getattr(self, table))
+
+    def risk_vector(self, phases):
+        """Factores de riesgo para una secuencia de nombres de fase (las desconocidas usan el riesgo por defecto)"""
+        return np.array([self.phase_risk_factors.get(phase, self.default_phase_risk) for phase in phases])
+
+
+def compile_simulation_config(raw=None):
+    """
+    Valida y compila una configuración (diccionario); las claves ausentes se toman de DEFAULT_SIMULATION_CONFIG
+    """
+    return CompiledSimulationConfig({**DEFAULT_SIMULATION_CONFIG, **(raw or {})})
+
+
+def load_simulation_config(path=None):
+    """
+    Carga la configuración de un sitio desde un archivo JSON, compilada una sola vez por archivo
+
+    Sin ruta se usa la variable de entorno SIMUL_CONFIG o, si no existe, DEFAULT_SIMULATION_CONFIG.
+    El resultado se guarda en caché y se recompila solo si el archivo cambia.
+    """
+    path = path or os.environ.get("SIMUL_CONFIG")
+    if path is None:
+        key = None
+    else:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    compiled = _COMPILED_CONFIG_CACHE.get(key)
+    if compiled is None:
+        raw = None
+        if path is not None:
+            with open(path, encoding="utf-8") as config_file:
+                raw = json.load(config_file)
+        compiled = compile_simulation_config(raw)
+        _COMPILED_CONFIG_CACHE[key] = compiled
+    return compiled
+
+
+class TaskRecord:
+    """
+    Base de los registros compactos de tareas: los valores viven en __slots__ (sin diccionario por
+    instancia) y FIELDS traduce cada clave al atributo, de modo que record["Estado"], record.get(...)
+    y dict(record) siguen funcionando como con los antiguos diccionarios
+    """
+
+    __slots__ = ()
+    FIELDS = {}
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.FIELDS[key])
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, self.FIELDS[key], value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS and hasattr(self, self.FIELDS[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    def keys(self):
+        return [key for key, attribute in self.FIELDS.items() if hasattr(self, attribute)]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class NetworkTask(TaskRecord):
+    """
+    Tarea en construcción de la red: datos de la plantilla, id, predecesores (task_id, tipo, lag)
+    y fechas calculadas; reemplaza las copias de diccionarios del generador
+    """
+
+    FIELDS = {name: name for name in ("id", "fase", "tarea", "duracion", "costo_base", "predecessors")}
+    __slots__ = tuple(FIELDS.values())
+
+    def __init__(self, task_id, fase, tarea, duracion, costo_base, predecessors=()):
+        self.id = task_id
+        self.fase = fase
+        self.tarea = tarea
+        self.duracion = duracion
+        self.costo_base = costo_base
+        self.predecessors = list(predecessors)
+
+
+class DayOffsetField:
+    """
+    Fecha de un registro guardada como días (int) desde record.origin y expuesta como datetime
+    Sin días (None) devuelve `pending`, un valor fijo o una función del registro
+    Al asignar acepta datetime, date, pd.Timestamp o texto ISO ("2024-03-01"); None, NaN/NaT y los
+    textos de PENDING_TEXTS dejan la fecha sin registrar
+    """
+
+    # Valores de `pending` que pueden volver al asignar (p. ej. al recargar un diccionario de tarea)
+    PENDING_TEXTS = ("", "Pendiente", "En ejecución")
+
+    def __init__(self, attribute, pending=None):
+        self.attribute = attribute
+        self.pending = pending
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        days = getattr(record, self.attribute)
+        if days is None:
+            return self.pending(record) if callable(self.pending) else self.pending
+        return record.origin + timedelta(days=days)
+
+    def __set__(self, record, value):
+        setattr(record, self.attribute, self.to_days(value, record.origin))
+
+    def to_days(self, value, origin):
+        if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+            return None
+        if isinstance(value, str):
+            if value.strip() in self.PENDING_TEXTS:
+                return None
+            value = datetime.fromisoformat(value.strip())
+        elif isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time())
+        elif not isinstance(value, datetime):
+            raise TypeError(f"{self.attribute}: se esperaba una fecha (datetime, date, Timestamp o texto ISO), "
+                            f"no {type(value).__name__}")
+        return (value - origin).days
+
+
+class ScheduledTask(TaskRecord):
+    """
+    Tarea del cronograma (self.tasks) con atributos en inglés; las etiquetas en español se usan solo
+    como claves y como columnas del DataFrame (create_dataframe), en el orden de FIELDS
+    Las fechas se guardan como días desde origin (project_start_date) en los atributos *_day;
+    planned_start, actual_end, etc. las convierten a datetime solo al leerlas
+    """
+
+    FIELDS = {
+        "ID": "id",
+        "Fase": "phase",
+        "Tarea": "name",
+        "Duración Planificada (días)": "planned_duration",
+        "Inicio Planificado": "planned_start",
+        "Fin Planificado": "planned_end",
+        "Predecesor": "predecessor_ids",
+        "Predecesores Detallados": "predecessors",
+        "Costo Planificado (USD)": "planned_cost",
+        "Riesgo de Retraso (%)": "delay_risk",
+        "Estado": "state",
+        "Inicio Real": "actual_start",
+        "Fin Real": "actual_end",
+        "Duración Real (días)": "actual_duration",
+        "% Avance Físico": "progress",
+        "Costo Real (USD)": "actual_cost",
+        "Retraso (días)": "delay",
+        "Sobrecosto (USD)": "overrun",
+        "Causa de Retraso": "delay_cause",
+        "Observaciones": "notes",
+        "Días de Retraso": "delay_days",
+        "Buffer sugerido (días)": "buffer_days"
+    }
+    __slots__ = ("origin", "id", "phase", "name", "planned_duration", "planned_start_day", "planned_end_day",
+                 "predecessor_ids", "predecessors", "planned_cost", "delay_risk", "state", "actual_start_day",
+                 "actual_end_day", "actual_duration", "progress", "actual_cost", "delay", "overrun",
+                 "delay_cause", "notes", "delay_days", "buffer_days")
+
+    planned_start = DayOffsetField("planned_start_day")
+    planned_end = DayOffsetField("planned_end_day")
+    actual_start = DayOffsetField("actual_start_day", pending="Pendiente")
+    actual_end = DayOffsetField(
+        "actual_end_day", pending=lambda task: "En ejecución" if task.actual_start_day is not None else "Pendiente")
+
+    def __init__(self, values=(), **attributes):
+        for attribute, value in attributes.items():
+            setattr(self, attribute, value)
+        if values:
+            self.update(values)
+
+
 class ImprovedMiningScheduler:
-    def __init__(self, project_start_date=None, current_date=None, simulation_id=None):
+    # Instancias vivas (referencias débiles) para detectar schedulers retenidos en campañas
+    _live_instances = weakref.WeakSet()
+
+    def __init__(self, project_start_date=None, current_date=None, simulation_id=None, buffer_mode="task",
+                 config=None, reduce_dependencies=False, seed=None, sample_point=None):
         """
         Inicializa el simulador mejorado con múltiples simulaciones coherentes
+        buffer_mode: "task" (buffer propio por tarea) o "critical_chain" (buffer de proyecto y de alimentación)
+        config: CompiledSimulationConfig o ruta a un JSON de sitio (por defecto load_simulation_config())
+        reduce_dependencies: elimina las dependencias FS redundantes antes de calcular el cronograma
+        seed: semilla propia (random.Random) para reproducir la simulación sin tocar el generador global
+        sample_point: uniformes [0, 1) de ScenarioSampler para los sorteos estratificados (ver SAMPLED_DIMENSIONS)
         """
-        self.simulation_id = simulation_id or f"SIM-{random.randint(1000, 9999)}"
-        # Proyecto comienza entre 180 y 365 días antes de la fecha actual para proyectos más realistas
-        self.project_start_date = project_start_date or datetime.now() - timedelta(days=random.randint(180, 365))
+        self._rng = random.Random(seed) if seed is not None else None
+        self.sample_point = sample_point
+        self.memory_stages = {}
+        self._memory_mark = None
+        ImprovedMiningScheduler._live_instances.add(self)
+        self.simulation_id = simulation_id or f"SIM-{self.rng.randint(1000, 9999)}"
         self.current_date = current_date or datetime.now()
+        # Proyecto comienza entre 180 y 365 días antes de la fecha actual para proyectos más realistas
+        self.project_start_date = project_start_date or self.current_date - timedelta(days=self.rng.randint(180, 365))
         self.tasks = []
-        self.phases = [
-            "Preparación del Terreno",
-            "Movimiento de Tierra",
-            "Cimentaciones",
-            "Estructuras Principales",
-            "Instalaciones Mecánicas",
-            "Instalaciones Eléctricas",
-            "Acabados y Pruebas",
-            "Puesta en Marcha"
-        ]
+        self.dependency_graph = None
+
+        # Fases, riesgos, causas de retraso y plantilla compartidos desde la configuración compilada
+        self.config = config if isinstance(config, CompiledSimulationConfig) else load_simulation_config(config)
+        self.phases = self.config.phases
 
         # Configuración aleatoria para esta simulación
         self.simulation_config = self._generate_simulation_config()
+        self.simulation_config['buffer_mode'] = buffer_mode
+        self.simulation_config['reduce_dependencies'] = reduce_dependencies
+        self.critical_chain = None
+        self.removed_dependencies = []
+        self.reachability_index = None
+
+    @property
+    def rng(self):
+        # Sin semilla propia se usa el generador global del módulo random
+        return self._rng or random
+
+    @property
+    def current_day(self):
+        # Fecha actual como días desde el inicio del proyecto (base de todas las fechas en enteros)
+        return (self.current_date - self.project_start_date).days
+
+    @property
+    def phase_risk_factors(self):
+        return self.config.phase_risk_factors
+
+    @property
+    def delay_causes(self):
+        return self.config.delay_causes
+
+    @property
+    def dependency_types(self):
+        return self.config.dependency_types
+
+    def _stratified(self, dimension):
+        """Uniforme de sample_point para `dimension`, o None si la simulación no está estratificada"""
+        if self.sample_point is None or dimension >= len(self.sample_point):
+            return None
+        return float(self.sample_point[dimension])
 
-        # Factores de riesgo por fase
-        self.phase_risk_factors = {
-            "Preparación del Terreno": 0.15,
-            "Movimiento de Tierra": 0.30,
-            "Cimentaciones": 0.25,
-            "Estructuras Principales": 0.20,
-            "Instalaciones Mecánicas": 0.35,
-            "Instalaciones Eléctricas": 0.25,
-            "Acabados y Pruebas": 0.30,
-            "Puesta en Marcha": 0.20
-        }
+    def _uniform(self, dimension, low, high):
+        u = self._stratified(dimension)
+        return self.rng.uniform(low, high) if u is None else low + (high - low) * u
 
-        # Causas de retrasos
-        self.delay_causes = [
-            "Condiciones climáticas adversas",
-            "Problemas de suministro de materiales",
-            "Fallas de equipos",
-            "Cambios en especificaciones técnicas",
-            "Problemas geotécnicos inesperados",
-            "Retrasos en permisos regulatorios",
-            "Conflictos laborales",
-            "Problemas de acceso logístico"
-        ]
+    def _randint(self, dimension, low, high):
+        u = self._stratified(dimension)
+        return self.rng.randint(low, high) if u is None else low + min(int(u * (high - low + 1)), high - low)
 
-        # Tipos de relaciones de precedencia
-        self.dependency_types = ["FS", "SS", "FF", "SF"]
+    def _choice(self, dimension, options):
+        u = self._stratified(dimension)
+        return self.rng.choice(options) if u is None else options[min(int(u * len(options)), len(options) - 1)]
 
     def _generate_simulation_config(self):
         """
         Genera una configuración única para esta simulación
         """
-        profiles = [
-            {"name": "Proyecto Adelantado", "completed": (0.60, 0.80), "in_progress": (0.05, 0.15), "delay_factor": 0.1},
-            {"name": "Proyecto Normal", "completed": (0.40, 0.60), "in_progress": (0.10, 0.20), "delay_factor": 0.2},
-            {"name": "Proyecto Retrasado", "completed": (0.20, 0.40), "in_progress": (0.15, 0.30), "delay_factor": 0.4},
-            {"name": "Proyecto Inicial", "completed": (0.05, 0.20), "in_progress": (0.05, 0.15), "delay_factor": 0.15},
-            {"name": "Proyecto Crítico", "completed": (0.30, 0.45), "in_progress": (0.25, 0.35), "delay_factor": 0.5}
-        ]
+        profile = self.config.profiles[self.config.choose("profiles", self.rng, self._stratified(0))]
 
-        profile = random.choice(profiles)
-
-        completed_pct = random.uniform(*profile["completed"])
-        in_progress_pct = random.uniform(*profile["in_progress"])
+        completed_pct = self._uniform(1, *profile["completed"])
+        in_progress_pct = self._uniform(2, *profile["in_progress"])
         not_started_pct = 1.0 - completed_pct - in_progress_pct
 
         if not_started_pct < 0:
             not_started_pct = 0.1
             total_active = 0.9
-            completed_pct = random.uniform(0.3, 0.7) * total_active
+            completed_pct = self.rng.uniform(0.3, 0.7) * total_active
             in_progress_pct = total_active - completed_pct
 
         # Configuración de red de dependencias
-        network_styles = [
-            {"name": "Paralela", "parallel_factor": 0.7, "max_predecessors": 3},
-            {"name": "Secuencial", "parallel_factor": 0.3, "max_predecessors": 2},
-            {"name": "Mixta", "parallel_factor": 0.5, "max_predecessors": 4},
-            {"name": "Compleja", "parallel_factor": 0.6, "max_predecessors": 5}
-        ]
-
-        network_style = random.choice(network_styles)
+        network_style = self.config.network_styles[self.config.choose("network_styles", self.rng, self._stratified(3))]
 
         config = {
             'profile_name': profile["name"],
@@ -107,7 +1493,8 @@ class ImprovedMiningScheduler:
             'in_progress_percentage': in_progress_pct,
             'not_started_percentage': not_started_pct,
             'delay_factor': profile["delay_factor"],
-            'buffer_strategy': random.choice(['conservative', 'moderate', 'aggressive']),
+            'buffer_strategy': self.config.buffer_strategy_names[
+                self.config.choose("buffer_strategies", self.rng, self._stratified(4))],
             'network_style': network_style["name"],
             'parallel_factor': network_style["parallel_factor"],
             'max_predecessors': network_style["max_predecessors"],
@@ -124,17 +1511,16 @@ class ImprovedMiningScheduler:
         enhanced_tasks = []
 
         for i, task in enumerate(tasks_data):
-            enhanced_task = task.copy()
-            enhanced_task["id"] = i + 1
-            enhanced_task["predecessors"] = []  # Lista de tuplas (task_id, type, lag)
-            enhanced_tasks.append(enhanced_task)
+            # Registro compacto; predecessors es una lista de tuplas (task_id, type, lag)
+            enhanced_tasks.append(
+                NetworkTask(i + 1, task["fase"], task["tarea"], task["duracion"], task["costo_base"]))
 
         # Agrupar tareas por fase
         phase_tasks = {}
         for task in enhanced_tasks:
-            if task["fase"] not in phase_tasks:
-                phase_tasks[task["fase"]] = []
-            phase_tasks[task["fase"]].append(task)
+            if task.fase not in phase_tasks:
+                phase_tasks[task.fase] = []
+            phase_tasks[task.fase].append(task)
 
         # Establecer dependencias realistas
         for phase_idx, phase in enumerate(self.phases):
@@ -154,34 +1540,34 @@ class ImprovedMiningScheduler:
                         # La segunda tarea SIEMPRE depende de la primera
                         pred = tasks_in_phase[task_idx - 1]
                         dep_type = "FS"  # Finish-to-Start para asegurar secuencialidad
-                        lag = random.randint(0, 1)
-                        predecessors.append((pred["id"], dep_type, lag))
+                        lag = self.rng.randint(0, 1)
+                        predecessors.append((pred.id, dep_type, lag))
                     else:
                         # Tareas posteriores pueden tener más paralelismo
-                        if random.random() < 0.7:  # 70% probabilidad de dependencia intra-fase
+                        if self.rng.random() < 0.7:  # 70% probabilidad de dependencia intra-fase
                             # Puede depender de una o múltiples tareas anteriores
-                            num_deps = min(task_idx, random.randint(1, min(2, task_idx)))
+                            num_deps = min(task_idx, self.rng.randint(1, min(2, task_idx)))
                             possible_preds = tasks_in_phase[:task_idx]
-                            selected_preds = random.sample(possible_preds, num_deps)
+                            selected_preds = self.rng.sample(possible_preds, num_deps)
 
                             for pred in selected_preds:
                                 # Determinar tipo de relación
-                                if random.random() < 0.7:
+                                if self.rng.random() < 0.7:
                                     dep_type = "FS"  # 70% Finish-to-Start
-                                elif random.random() < 0.5:
+                                elif self.rng.random() < 0.5:
                                     dep_type = "SS"  # 15% Start-to-Start
-                                elif random.random() < 0.7:
+                                elif self.rng.random() < 0.7:
                                     dep_type = "FF"  # 10% Finish-to-Finish
                                 else:
                                     dep_type = "SF"  # 5% Start-to-Finish
 
                                 # Lag time (puede ser positivo o negativo)
                                 if dep_type in ["SS", "FF"]:
-                                    lag = random.randint(-2, 3)  # Puede solaparse
+                                    lag = self.rng.randint(-2, 3)  # Puede solaparse
                                 else:
-                                    lag = random.randint(0, 2)  # Solo positivo para FS/SF
+                                    lag = self.rng.randint(0, 2)  # Solo positivo para FS/SF
 
-                                predecessors.append((pred["id"], dep_type, lag))
+                                predecessors.append((pred.id, dep_type, lag))
 
                 # Dependencias entre fases - CRÍTICO PARA SECUENCIALIDAD
                 if phase_idx > 0:
@@ -197,46 +1583,46 @@ class ImprovedMiningScheduler:
                                 if "Acabados y Pruebas" in phase_tasks:
                                     critical_tasks = phase_tasks["Acabados y Pruebas"][-2:]  # Últimas 2 tareas
                                     for pred in critical_tasks:
-                                        predecessors.append((pred["id"], "FS", random.randint(1, 3)))
+                                        predecessors.append((pred.id, "FS", self.rng.randint(1, 3)))
                             elif phase == "Acabados y Pruebas":
                                 # Depender de Instalaciones Eléctricas Y Mecánicas
                                 if "Instalaciones Eléctricas" in phase_tasks:
                                     critical_tasks = phase_tasks["Instalaciones Eléctricas"][-2:]
                                     for pred in critical_tasks:
-                                        predecessors.append((pred["id"], "FS", random.randint(1, 2)))
+                                        predecessors.append((pred.id, "FS", self.rng.randint(1, 2)))
                             else:
                                 # Para otras fases, seleccionar tareas críticas de la fase anterior
                                 critical_tasks = prev_tasks[-min(3, len(prev_tasks)):]
-                                num_deps = min(len(critical_tasks), random.randint(1, 2))
-                                selected_preds = random.sample(critical_tasks, num_deps)
+                                num_deps = min(len(critical_tasks), self.rng.randint(1, 2))
+                                selected_preds = self.rng.sample(critical_tasks, num_deps)
 
                                 for pred in selected_preds:
                                     dep_type = "FS"  # Siempre FS para dependencias entre fases
-                                    lag = random.randint(0, 2)
-                                    predecessors.append((pred["id"], dep_type, lag))
+                                    lag = self.rng.randint(0, 2)
+                                    predecessors.append((pred.id, dep_type, lag))
 
                         # Otras tareas pueden tener dependencias cruzadas con fase anterior
-                        elif random.random() < self.simulation_config['parallel_factor']:
+                        elif self.rng.random() < self.simulation_config['parallel_factor']:
                             # Posibilidad de trabajo en paralelo entre fases
-                            num_cross_deps = min(len(prev_tasks), random.randint(0, 1))
+                            num_cross_deps = min(len(prev_tasks), self.rng.randint(0, 1))
                             if num_cross_deps > 0:
-                                selected_preds = random.sample(prev_tasks, num_cross_deps)
+                                selected_preds = self.rng.sample(prev_tasks, num_cross_deps)
                                 for pred in selected_preds:
-                                    dep_type = random.choice(["SS", "FF"])  # Permitir paralelismo
-                                    lag = random.randint(1, 5)
-                                    predecessors.append((pred["id"], dep_type, lag))
+                                    dep_type = self.rng.choice(["SS", "FF"])  # Permitir paralelismo
+                                    lag = self.rng.randint(1, 5)
+                                    predecessors.append((pred.id, dep_type, lag))
 
                 # ESPECIAL: La última tarea "Entrega final" debe depender de TODAS las tareas críticas anteriores
-                if task["tarea"] == "Entrega final":
+                if task.tarea == "Entrega final":
                     # Limpiar predecesores anteriores
                     predecessors = []
                     # Depender de las pruebas de rendimiento (tarea anterior)
                     if task_idx > 0:
-                        predecessors.append((task["id"] - 1, "FS", 1))  # Pruebas de rendimiento
+                        predecessors.append((task.id - 1, "FS", 1))  # Pruebas de rendimiento
                     # También depender de las últimas tareas de Acabados y Pruebas
                     if "Acabados y Pruebas" in phase_tasks:
                         last_task = phase_tasks["Acabados y Pruebas"][-1]
-                        predecessors.append((last_task["id"], "FS", 0))
+                        predecessors.append((last_task.id, "FS", 0))
 
                 # Limitar número máximo de predecesores
                 if len(predecessors) > self.simulation_config['max_predecessors']:
@@ -247,119 +1633,106 @@ class ImprovedMiningScheduler:
                     if len(fs_deps) <= self.simulation_config['max_predecessors']:
                         predecessors = fs_deps + other_deps[:self.simulation_config['max_predecessors'] - len(fs_deps)]
                     else:
-                        predecessors = random.sample(predecessors, self.simulation_config['max_predecessors'])
+                        predecessors = self.rng.sample(predecessors, self.simulation_config['max_predecessors'])
 
-                task["predecessors"] = predecessors
+                task.predecessors = predecessors
 
-        # Verificar y eliminar ciclos
-        self._remove_cycles(enhanced_tasks)
+        # Verificar y eliminar ciclos; el grafo CSR resultante se comparte con el resto del cálculo
+        self.dependency_graph = self._reduce_dependencies(enhanced_tasks, self._remove_cycles(enhanced_tasks))
 
         return enhanced_tasks
 
     def _remove_cycles(self, tasks):
         """
-        Detecta y elimina ciclos en la red de dependencias usando DFS
+        Detecta y elimina ciclos en la red de dependencias usando el orden topológico del grafo CSR
+        Solo se eliminan dependencias que cierran un ciclo (DependencyGraph.back_edges); las de tareas
+        que solo dependen de un ciclo se conservan
         """
-        def has_cycle_util(task_id, visited, rec_stack, task_dict):
-            visited[task_id] = True
-            rec_stack[task_id] = True
+        graph = DependencyGraph.from_tasks(tasks)
+        back_edges = graph.back_edges()
+        if not len(back_edges):
+            return graph
 
-            task = task_dict[task_id]
-            for pred_id, _, _ in task["predecessors"]:
-                if not visited[pred_id]:
-                    if has_cycle_util(pred_id, visited, rec_stack, task_dict):
-                        return True
-                elif rec_stack[pred_id]:
-                    return True
+        # De la última a la primera, para que las posiciones dentro de cada tarea sigan siendo válidas
+        for edge in back_edges[::-1].tolist():
+            index = int(graph.edge_targets[edge])
+            tasks[index].predecessors.pop(edge - int(graph.pred_indptr[index]))
 
-            rec_stack[task_id] = False
-            return False
-
-        # Crear diccionario para búsqueda rápida
-        task_dict = {task["id"]: task for task in tasks}
+        return DependencyGraph.from_tasks(tasks)
 
-        # Verificar ciclos y eliminarlos
-        for task in tasks:
-            visited = {t["id"]: False for t in tasks}
-            rec_stack = {t["id"]: False for t in tasks}
+    def _reduce_dependencies(self, tasks, graph):
+        """
+        Si la simulación lo pide, elimina las dependencias FS redundantes (reducción transitiva)
+        de las tareas y del grafo, y las registra en self.removed_dependencies
+        """
+        if not self.simulation_config['reduce_dependencies']:
+            return graph
+
+        durations = np.array([task.duracion for task in tasks], dtype=np.int64)
+        reduced, removed = graph.transitive_reduction(durations)
+
+        for target in np.unique(graph.edge_targets[removed]):
+            start = graph.pred_indptr[target]
+            task = tasks[target]
+            kept = []
+            for position, predecessor in enumerate(task.predecessors):
+                if removed[start + position]:
+                    pred_id, dep_type, lag = predecessor
+                    self.removed_dependencies.append(
+                        {"Predecesor": pred_id, "Sucesor": task.id, "Tipo": dep_type, "Lag": lag})
+                else:
+                    kept.append(predecessor)
+            task.predecessors = kept
 
-            if has_cycle_util(task["id"], visited, rec_stack, task_dict):
-                # Si hay ciclo, eliminar la dependencia más reciente
-                if task["predecessors"]:
-                    task["predecessors"].pop()
+        return reduced
 
-    def _calculate_task_dates(self, task, enhanced_tasks):
+    def _calculate_task_dates(self, enhanced_tasks, graph):
         """
         Calcula las fechas de inicio y fin basándose en los predecesores y sus tipos de relación
+        Devuelve (inicio, fin) como arreglos int32 de días desde project_start_date
         """
-        if not task["predecessors"]:
-            # Si no tiene predecesores, comienza en la fecha de inicio del proyecto
-            # La fecha de fin es inicio + duración - 1 (porque el día de inicio cuenta)
-            return self.project_start_date, self.project_start_date + timedelta(days=task["duracion"] - 1)
-
-        latest_constraint = self.project_start_date
-
-        for pred_id, dep_type, lag in task["predecessors"]:
-            pred_task = next(t for t in enhanced_tasks if t["id"] == pred_id)
-
-            if "calculated_start" not in pred_task:
-                # Calcular recursivamente si no se ha calculado aún
-                pred_start, pred_end = self._calculate_task_dates(pred_task, enhanced_tasks)
-                pred_task["calculated_start"] = pred_start
-                pred_task["calculated_end"] = pred_end
-
-            pred_start = pred_task["calculated_start"]
-            pred_end = pred_task["calculated_end"]
-
-            # Calcular restricción según tipo de dependencia
-            if dep_type == "FS":  # Finish-to-Start
-                # La tarea comienza después de que termine el predecesor + lag
-                constraint_date = pred_end + timedelta(days=lag + 1)
-            elif dep_type == "SS":  # Start-to-Start
-                # La tarea comienza lag días después del inicio del predecesor
-                constraint_date = pred_start + timedelta(days=lag)
-            elif dep_type == "FF":  # Finish-to-Finish
-                # La tarea debe terminar lag días después que el predecesor
-                # Por lo tanto, debe comenzar para cumplir esta restricción
-                constraint_date = pred_end + timedelta(days=lag + 1) - timedelta(days=task["duracion"])
-            elif dep_type == "SF":  # Start-to-Finish
-                # El inicio del predecesor determina el fin de esta tarea
-                constraint_date = pred_start + timedelta(days=lag + 1) - timedelta(days=task["duracion"])
-
-            latest_constraint = max(latest_constraint, constraint_date)
-
-        task_start = latest_constraint
-        # La fecha de fin es inicio + duración - 1 (porque el día de inicio cuenta)
-        task_end = task_start + timedelta(days=task["duracion"] - 1)
+        durations = np.array([task.duracion for task in enhanced_tasks], dtype=np.int64)
+
+        # Sin predecesores se comienza en el día 0
+        start, end = graph.forward_pass(durations)
+        return start.astype(np.int32), end.astype(np.int32)
 
-        return task_start, task_end
+    def _as_scheduled_task(self, task):
+        """
+        Acepta tanto un ScheduledTask como un diccionario con las etiquetas en español de FIELDS
+        (el formato anterior de self.tasks); las claves desconocidas se ignoran
+        """
+        if isinstance(task, ScheduledTask):
+            return task
+        return ScheduledTask({key: value for key, value in task.items() if key in ScheduledTask.FIELDS},
+                             origin=self.project_start_date)
 
     def calculate_delay_days(self, task):
         """
-        Calcula los días de retraso acumulados para una tarea
+        Calcula los días de retraso acumulados para una tarea (ScheduledTask o diccionario)
         """
-        if task["Estado"] == "No iniciada":
-            if isinstance(task["Inicio Planificado"], datetime) and task["Inicio Planificado"] < self.current_date:
-                return (self.current_date - task["Inicio Planificado"]).days
-            else:
-                return 0
+        task = self._as_scheduled_task(task)
+        # Aritmética en días enteros desde el inicio del proyecto
+        current_day = self.current_day
 
-        elif "En progreso" in task["Estado"]:
-            if isinstance(task["Fin Planificado"], datetime) and task["Fin Planificado"] < self.current_date:
-                return (self.current_date - task["Fin Planificado"]).days
+        if task.state == "No iniciada":
+            return max(0, current_day - task.planned_start_day)
+
+        elif "En progreso" in task.state:
+            if task.planned_end_day < current_day:
+                return current_day - task.planned_end_day
             else:
-                if isinstance(task["Inicio Planificado"], datetime):
-                    days_since_start = (self.current_date - task["Inicio Planificado"]).days
-                    expected_progress = min(100, (days_since_start / task["Duración Planificada (días)"]) * 100)
-                    actual_progress = task["% Avance Físico"]
-                    if expected_progress > actual_progress:
-                        progress_delay = ((expected_progress - actual_progress) / 100) * task["Duración Planificada (días)"]
-                        return int(progress_delay)
+                days_since_start = current_day - task.planned_start_day
+                expected_progress = min(100, (days_since_start / task.planned_duration) * 100)
+                actual_progress = task.progress
+                if expected_progress > actual_progress:
+                    progress_delay = ((expected_progress - actual_progress) / 100) * task.planned_duration
+                    return int(progress_delay)
                 return 0
 
-        elif "Completada" in task["Estado"]:
-            if task.get("Retraso (días)", 0) > 0:
-                return task["Retraso (días)"]
+        elif "Completada" in task.state:
+            if task.delay > 0:
+                return task.delay
             else:
                 return 0
 
@@ -367,123 +1740,106 @@ class ImprovedMiningScheduler:
 
     def calculate_buffer_days(self, task):
         """
-        Calcula el buffer sugerido para una tarea basado en múltiples factores
+        Calcula el buffer sugerido para una tarea basado en múltiples factores (ScheduledTask o diccionario)
         """
-        base_duration = task["Duración Planificada (días)"]
-        risk_factor = self.phase_risk_factors.get(task["Fase"], 0.2)
+        task = self._as_scheduled_task(task)
+        base_duration = task.planned_duration
+        risk_factor = self.phase_risk_factors.get(task.phase, self.config.default_phase_risk)
 
-        if self.simulation_config['buffer_strategy'] == 'conservative':
-            buffer_multiplier = 0.3
-            min_buffer = 3
-        elif self.simulation_config['buffer_strategy'] == 'moderate':
-            buffer_multiplier = 0.2
-            min_buffer = 2
-        else:  # aggressive
-            buffer_multiplier = 0.1
-            min_buffer = 1
+        strategy = self.config.buffer_strategies[self.simulation_config['buffer_strategy']]
+        buffer_multiplier = strategy["multiplier"]
+        min_buffer = strategy["min_buffer"]
 
         base_buffer = max(min_buffer, int(base_duration * buffer_multiplier))
         risk_adjustment = int(base_buffer * risk_factor)
 
-        if task["Estado"] == "No iniciada":
+        if task.state == "No iniciada":
             state_adjustment = 0
-        elif "En progreso" in task["Estado"] and "retraso" in task["Estado"]:
+        elif "En progreso" in task.state and "retraso" in task.state:
             state_adjustment = int(base_buffer * 0.5)
-        elif "En progreso" in task["Estado"]:
+        elif "En progreso" in task.state:
             state_adjustment = int(base_buffer * 0.2)
         else:
             state_adjustment = 0
 
         # Ajuste adicional por número de predecesores (complejidad)
-        pred_count = len(task.get("Predecesores Detallados", []))
+        pred_count = len(task.predecessors)
         complexity_adjustment = min(pred_count, 3)  # Máximo 3 días extra por complejidad
 
         total_buffer = base_buffer + risk_adjustment + state_adjustment + complexity_adjustment
-        variability = random.randint(-1, 2)
+        variability = self.rng.randint(-1, 2)
 
         return max(min_buffer, total_buffer + variability)
 
+    def calculate_critical_chain_buffers(self):
+        """
+        Calcula la cadena crítica y sus buffers agregados a partir de la red:
+        un buffer de proyecto al final de la cadena crítica y buffers de alimentación donde
+        las cadenas no críticas se unen a ella (RSS sobre duración x riesgo de la fase)
+        """
+        graph = self.get_dependency_graph()
+        durations = np.array([task.planned_duration for task in self.tasks], dtype=np.int64)
+        risks = self.config.risk_vector(task.phase for task in self.tasks)
+        factor = self.config.buffer_strategies[self.simulation_config['buffer_strategy']]['chain_factor']
+
+        result = critical_chain_buffers(graph, durations, durations * risks * factor)
+
+        critical = np.flatnonzero(result['critical'])
+        critical = critical[np.lexsort((result['early_finish'][critical], result['early_start'][critical]))]
+        feeding = np.flatnonzero(result['feeding_buffers'])
+
+        return {
+            'critical_chain': graph.task_ids[critical].tolist(),
+            'project_buffer': int(result['project_buffer']),
+            'feeding_buffers': {int(graph.task_ids[i]): int(result['feeding_buffers'][i]) for i in feeding},
+            'total_float': dict(zip(graph.task_ids.tolist(), result['total_float'].tolist()))
+        }
+
     def generate_coherent_tasks(self):
         """
         Genera tareas con estados coherentes y lógicos
         """
-        tasks_data = [
-            # Fase 1: Preparación del Terreno (6 tareas)
-            {"fase": "Preparación del Terreno", "tarea": "Topografía y replanteo", "duracion": 5, "costo_base": 15000},
-            {"fase": "Preparación del Terreno", "tarea": "Limpieza y desbroce", "duracion": 8, "costo_base": 25000},
-            {"fase": "Preparación del Terreno", "tarea": "Construcción de accesos temporales", "duracion": 12, "costo_base": 45000},
-            {"fase": "Preparación del Terreno", "tarea": "Instalación de servicios temporales", "duracion": 6, "costo_base": 20000},
-            {"fase": "Preparación del Terreno", "tarea": "Cercado perimetral", "duracion": 4, "costo_base": 12000},
-            {"fase": "Preparación del Terreno", "tarea": "Señalización y seguridad", "duracion": 3, "costo_base": 8000},
-
-            # Fase 2: Movimiento de Tierra (8 tareas)
-            {"fase": "Movimiento de Tierra", "tarea": "Excavación general", "duracion": 15, "costo_base": 120000},
-            {"fase": "Movimiento de Tierra", "tarea": "Excavación para cimentaciones", "duracion": 10, "costo_base": 75000},
-            {"fase": "Movimiento de Tierra", "tarea": "Nivelación y compactación", "duracion": 8, "costo_base": 40000},
-            {"fase": "Movimiento de Tierra", "tarea": "Sistema de drenaje temporal", "duracion": 6, "costo_base": 30000},
-            {"fase": "Movimiento de Tierra", "tarea": "Estabilización de taludes", "duracion": 12, "costo_base": 85000},
-            {"fase": "Movimiento de Tierra", "tarea": "Control de erosión", "duracion": 5, "costo_base": 18000},
-            {"fase": "Movimiento de Tierra", "tarea": "Vías de acceso internas", "duracion": 14, "costo_base": 95000},
-            {"fase": "Movimiento de Tierra", "tarea": "Plataformas de equipos", "duracion": 7, "costo_base": 35000},
-
-            # Fase 3: Cimentaciones (6 tareas)
-            {"fase": "Cimentaciones", "tarea": "Armado de cimentaciones principales", "duracion": 12, "costo_base": 180000},
-            {"fase": "Cimentaciones", "tarea": "Vaciado de concreto cimentaciones", "duracion": 8, "costo_base": 220000},
-            {"fase": "Cimentaciones", "tarea": "Curado y fraguado", "duracion": 14, "costo_base": 15000},
-            {"fase": "Cimentaciones", "tarea": "Cimentaciones para equipos", "duracion": 10, "costo_base": 95000},
-            {"fase": "Cimentaciones", "tarea": "Anclajes especiales", "duracion": 6, "costo_base": 45000},
-            {"fase": "Cimentaciones", "tarea": "Impermeabilización", "duracion": 4, "costo_base": 25000},
-
-            # Fase 4: Estructuras Principales (8 tareas)
-            {"fase": "Estructuras Principales", "tarea": "Montaje estructura metálica principal", "duracion": 18, "costo_base": 450000},
-            {"fase": "Estructuras Principales", "tarea": "Estructura de tolvas", "duracion": 12, "costo_base": 280000},
-            {"fase": "Estructuras Principales", "tarea": "Pasarelas y plataformas", "duracion": 10, "costo_base": 125000},
-            {"fase": "Estructuras Principales", "tarea": "Sistema de soportes", "duracion": 8, "costo_base": 85000},
-            {"fase": "Estructuras Principales", "tarea": "Techumbres y cubiertas", "duracion": 14, "costo_base": 165000},
-            {"fase": "Estructuras Principales", "tarea": "Cerramientos laterales", "duracion": 9, "costo_base": 95000},
-            {"fase": "Estructuras Principales", "tarea": "Estructuras auxiliares", "duracion": 7, "costo_base": 55000},
-            {"fase": "Estructuras Principales", "tarea": "Acabados estructurales", "duracion": 5, "costo_base": 35000},
-
-            # Fase 5: Instalaciones Mecánicas (8 tareas)
-            {"fase": "Instalaciones Mecánicas", "tarea": "Montaje de equipos principales", "duracion": 20, "costo_base": 850000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Sistema de transporte de material", "duracion": 15, "costo_base": 320000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Tuberías y ductos", "duracion": 12, "costo_base": 180000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Sistemas de ventilación", "duracion": 8, "costo_base": 95000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Sistema hidráulico", "duracion": 10, "costo_base": 145000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Equipos de seguridad mecánica", "duracion": 6, "costo_base": 75000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Alineación y calibración", "duracion": 8, "costo_base": 55000},
-            {"fase": "Instalaciones Mecánicas", "tarea": "Pruebas mecánicas iniciales", "duracion": 5, "costo_base": 25000},
-
-            # Fase 6: Instalaciones Eléctricas (6 tareas)
-            {"fase": "Instalaciones Eléctricas", "tarea": "Tableros eléctricos principales", "duracion": 8, "costo_base": 125000},
-            {"fase": "Instalaciones Eléctricas", "tarea": "Cableado y canalizaciones", "duracion": 12, "costo_base": 185000},
-            {"fase": "Instalaciones Eléctricas", "tarea": "Motores y controles", "duracion": 10, "costo_base": 245000},
-            {"fase": "Instalaciones Eléctricas", "tarea": "Sistema de iluminación", "duracion": 6, "costo_base": 45000},
-            {"fase": "Instalaciones Eléctricas", "tarea": "Sistema de respaldo", "duracion": 7, "costo_base": 95000},
-            {"fase": "Instalaciones Eléctricas", "tarea": "Pruebas eléctricas", "duracion": 4, "costo_base": 18000},
-
-            # Fase 7: Acabados y Pruebas (4 tareas)
-            {"fase": "Acabados y Pruebas", "tarea": "Sistemas de control y automatización", "duracion": 15, "costo_base": 385000},
-            {"fase": "Acabados y Pruebas", "tarea": "Integración de sistemas", "duracion": 10, "costo_base": 125000},
-            {"fase": "Acabados y Pruebas", "tarea": "Pruebas integrales", "duracion": 12, "costo_base": 85000},
-            {"fase": "Acabados y Pruebas", "tarea": "Corrección de observaciones", "duracion": 8, "costo_base": 45000},
-
-            # Fase 8: Puesta en Marcha (4 tareas)
-            {"fase": "Puesta en Marcha", "tarea": "Capacitación de operadores", "duracion": 10, "costo_base": 55000},
-            {"fase": "Puesta en Marcha", "tarea": "Puesta en marcha asistida", "duracion": 14, "costo_base": 95000},
-            {"fase": "Puesta en Marcha", "tarea": "Pruebas de rendimiento", "duracion": 7, "costo_base": 35000},
-            {"fase": "Puesta en Marcha", "tarea": "Entrega final", "duracion": 3, "costo_base": 15000}
-        ]
+        # Plantilla de tareas de la configuración compilada (compartida, de solo lectura)
+        tasks_data = self.config.task_template
 
         # Generar predecesores realistas
+        self._memory_checkpoint()
         enhanced_tasks = self._generate_realistic_predecessors(tasks_data)
+        self._memory_checkpoint("red")
 
-        # Calcular fechas para todas las tareas
-        for task in enhanced_tasks:
-            if "calculated_start" not in task:
-                start, end = self._calculate_task_dates(task, enhanced_tasks)
-                task["calculated_start"] = start
-                task["calculated_end"] = end
+        self._build_schedule(enhanced_tasks)
+
+    def load_tasks(self, tasks_data):
+        """
+        Carga tareas reales (por ejemplo importadas desde MS Project o CSV) con sus predecesores ya definidos
+        y les aplica la misma lógica de fechas, estados, retrasos y buffers que a las tareas sintéticas
+
+        Cada tarea es un diccionario con "id", "fase", "tarea", "duracion", "costo_base"
+        y "predecessors" (lista de tuplas (pred_id, tipo, lag))
+        """
+        enhanced_tasks = []
+        for task in tasks_data:
+            enhanced_task = NetworkTask(task["id"], task["fase"], task["tarea"], task["duracion"],
+                                        task["costo_base"], task.get("predecessors") or ())
+            enhanced_tasks.append(enhanced_task)
+
+            # Las fases desconocidas se agregan al final y usan el riesgo por defecto
+            if enhanced_task.fase not in self.phases:
+                self.phases = (*self.phases, enhanced_task.fase)
+
+        self._memory_checkpoint()
+        self.dependency_graph = self._reduce_dependencies(enhanced_tasks, self._remove_cycles(enhanced_tasks))
+        self._memory_checkpoint("red")
+        self._build_schedule(enhanced_tasks)
+
+    def _build_schedule(self, enhanced_tasks):
+        """
+        Calcula fechas, asigna estados coherentes y construye self.tasks a partir de tareas con predecesores
+        """
+        # Calcular fechas para todas las tareas (días desde el inicio del proyecto)
+        start_days, end_days = self._calculate_task_dates(enhanced_tasks, self.dependency_graph)
+        start_days, end_days = start_days.tolist(), end_days.tolist()
+        self._memory_checkpoint("fechas")
 
         # Calcular cuántas tareas de cada tipo necesitamos
         total_tasks = len(enhanced_tasks)
@@ -492,91 +1848,97 @@ class ImprovedMiningScheduler:
         target_not_started = total_tasks - target_completed - target_in_progress
 
         # Asignar estados de manera coherente (respetando predecesores)
-        task_states = self._assign_coherent_states(enhanced_tasks, target_completed, target_in_progress)
+        task_states = self._assign_coherent_states(self.dependency_graph, target_completed, target_in_progress)
+        self._memory_checkpoint("estados")
 
         # Generar tareas con estados coherentes
         for i, task_data in enumerate(enhanced_tasks):
-            task_id = task_data["id"]
+            task_id = task_data.id
             assigned_state = task_states[i]
 
             # Formatear predecesores para mostrar (solo IDs, sin tipos ni lag)
             pred_display = []
             pred_details = []  # Mantenemos esta lista para uso interno
-            for pred_id, dep_type, lag in task_data["predecessors"]:
+            for pred_id, dep_type, lag in task_data.predecessors:
                 pred_display.append(f"{pred_id}")
                 lag_str = f"+{lag}" if lag > 0 else f"{lag}" if lag < 0 else ""
                 pred_details.append(f"{pred_id}{dep_type}{lag_str}")
 
             # Fechas planificadas
-            planned_start = task_data["calculated_start"]
-            planned_end = task_data["calculated_end"]
+            planned_start = start_days[i]
+            planned_end = end_days[i]
 
             # Crear estado según asignación coherente
             task_status = self._create_coherent_status(
                 assigned_state, planned_start, planned_end,
-                task_data["duracion"], task_data["costo_base"], task_data["fase"]
+                task_data.duracion, task_data.costo_base, task_data.fase, task_index=i
             )
 
-            task = {
-                "ID": task_id,
-                "Fase": task_data["fase"],
-                "Tarea": task_data["tarea"],
-                "Duración Planificada (días)": task_data["duracion"],
-                "Inicio Planificado": planned_start,
-                "Fin Planificado": planned_end,
-                "Predecesor": ", ".join(pred_display) if pred_display else "-",
+            task = ScheduledTask(
+                origin=self.project_start_date,
+                id=task_id,
+                phase=task_data.fase,
+                name=task_data.tarea,
+                planned_duration=task_data.duracion,
+                planned_start_day=planned_start,
+                planned_end_day=planned_end,
+                predecessor_ids=", ".join(pred_display) if pred_display else "-",
                 # Guardamos los detalles técnicos solo para uso interno (visualizaciones)
-                "Predecesores Detallados": task_data["predecessors"],
-                "Costo Planificado (USD)": task_data["costo_base"],
-                "Riesgo de Retraso (%)": int(self.phase_risk_factors[task_data["fase"]] * 100),
+                predecessors=task_data.predecessors,
+                planned_cost=task_data.costo_base,
+                delay_risk=int(self.phase_risk_factors.get(task_data.fase, self.config.default_phase_risk) * 100),
                 **task_status
-            }
+            )
 
             # Calcular las nuevas columnas
-            task["Días de Retraso"] = self.calculate_delay_days(task)
-            task["Buffer sugerido (días)"] = self.calculate_buffer_days(task)
+            task.delay_days = self.calculate_delay_days(task)
+            if self.simulation_config['buffer_mode'] == 'critical_chain':
+                task.buffer_days = 0  # Se asigna con la cadena crítica completa
+            else:
+                task.buffer_days = self.calculate_buffer_days(task)
 
             self.tasks.append(task)
 
-    def _assign_coherent_states(self, tasks_data, target_completed, target_in_progress):
+        if self.simulation_config['buffer_mode'] == 'critical_chain':
+            self.critical_chain = self.calculate_critical_chain_buffers()
+            for task in self.tasks:
+                task.buffer_days = self.critical_chain['feeding_buffers'].get(task.id, 0)
+            last_task = self.critical_chain['critical_chain'][-1]
+            self.tasks[self.dependency_graph.id_to_index[last_task]].buffer_days = self.critical_chain['project_buffer']
+
+        self._memory_checkpoint("tareas")
+
+    def _assign_coherent_states(self, graph, target_completed, target_in_progress):
         """
         Asigna estados de manera coherente respetando dependencias complejas
+        Las reglas se evalúan sobre todas las aristas del grafo CSR a la vez
         """
-        total_tasks = len(tasks_data)
-        states = ['not_started'] * total_tasks
-
-        # Crear mapa de índices
-        id_to_idx = {task["id"]: i for i, task in enumerate(tasks_data)}
-
-        # Función auxiliar para verificar si todos los predecesores necesarios están completados
-        def can_complete(task_idx):
-            task = tasks_data[task_idx]
-            for pred_id, dep_type, _ in task["predecessors"]:
-                pred_idx = id_to_idx[pred_id]
-                if dep_type in ["FS", "SF"]:  # Requiere que el predecesor esté completado
-                    if states[pred_idx] != 'completed':
-                        return False
-                elif dep_type in ["SS", "FF"]:  # Puede trabajar en paralelo
-                    if states[pred_idx] == 'not_started':
-                        return False
-            return True
-
-        def can_start(task_idx):
-            task = tasks_data[task_idx]
-            for pred_id, dep_type, _ in task["predecessors"]:
-                pred_idx = id_to_idx[pred_id]
-                if dep_type == "FS":  # Finish-to-Start: predecesor debe estar completado
-                    if states[pred_idx] == 'not_started':
-                        return False
-                elif dep_type == "SS":  # Start-to-Start: predecesor debe haber iniciado
-                    if states[pred_idx] == 'not_started':
-                        return False
-                elif dep_type == "FF":  # Finish-to-Finish: puede iniciar si predecesor inició
-                    if states[pred_idx] == 'not_started':
-                        return False
-                elif dep_type == "SF":  # Start-to-Finish: puede iniciar independientemente
-                    pass  # No hay restricción para iniciar
-            return True
+        total_tasks = graph.num_tasks
+        NOT_STARTED, IN_PROGRESS, COMPLETED = 0, 1, 2
+        codes = np.full(total_tasks, NOT_STARTED, dtype=np.int8)
+
+        def pred_states():
+            return codes[graph.pred_indices]
+
+        requires_completion = np.isin(graph.pred_types, [FS, SF])  # FS/SF: predecesor completado
+        requires_start = np.isin(graph.pred_types, [FS, SS, FF])     # SF puede iniciar independientemente
+
+        def candidates_where(blocking_edges):
+            # Tareas no iniciadas sin ninguna arista bloqueante
+            blocked = np.zeros(total_tasks, dtype=bool)
+            blocked[graph.edge_targets[blocking_edges]] = True
+            return np.flatnonzero((codes == NOT_STARTED) & ~blocked).tolist()
+
+        def completion_candidates():
+            states_of_preds = pred_states()
+            blocking = np.where(requires_completion,
+                                states_of_preds != COMPLETED,
+                                states_of_preds == NOT_STARTED)
+            return candidates_where(blocking)
+
+        def start_candidates():
+            blocking = requires_start & (pred_states() == NOT_STARTED)
+            return candidates_where(blocking)
 
         # Primero, marcar tareas completadas (respetando dependencias)
         completed_count = 0
@@ -585,23 +1947,19 @@ class ImprovedMiningScheduler:
 
         while completed_count < target_completed and attempts < max_attempts:
             attempts += 1
-            candidates = []
-
-            for i in range(total_tasks):
-                if states[i] == 'not_started' and can_complete(i):
-                    candidates.append(i)
+            candidates = completion_candidates()
 
             if candidates:
                 # Priorizar tareas más tempranas o con menos dependientes
-                task_to_complete = random.choice(candidates)
-                states[task_to_complete] = 'completed'
+                task_to_complete = self.rng.choice(candidates)
+                codes[task_to_complete] = COMPLETED
                 completed_count += 1
             else:
                 # Si no hay candidatos válidos, completar alguna tarea en progreso
-                in_progress_indices = [i for i, s in enumerate(states) if s == 'in_progress']
+                in_progress_indices = np.flatnonzero(codes == IN_PROGRESS).tolist()
                 if in_progress_indices:
-                    task_to_complete = random.choice(in_progress_indices)
-                    states[task_to_complete] = 'completed'
+                    task_to_complete = self.rng.choice(in_progress_indices)
+                    codes[task_to_complete] = COMPLETED
                     completed_count += 1
                 else:
                     break
@@ -612,95 +1970,99 @@ class ImprovedMiningScheduler:
 
         while in_progress_count < target_in_progress and attempts < max_attempts:
             attempts += 1
-            candidates = []
-
-            for i in range(total_tasks):
-                if states[i] == 'not_started' and can_start(i):
-                    candidates.append(i)
+            candidates = start_candidates()
 
             if candidates:
-                task_to_start = random.choice(candidates)
-                states[task_to_start] = 'in_progress'
+                task_to_start = self.rng.choice(candidates)
+                codes[task_to_start] = IN_PROGRESS
                 in_progress_count += 1
             else:
                 break
 
-        return states
+        state_names = np.array(['not_started', 'in_progress', 'completed'])
+        return state_names[codes].tolist()
 
-    def _create_coherent_status(self, state, start_date, planned_end, duration, cost, phase):
+    def _create_coherent_status(self, state, start_day, end_day, duration, cost, phase, task_index=None):
         """
         Crea un estado coherente para la tarea
+        Las fechas entran y salen como días desde project_start_date (None = sin fecha real)
+        Devuelve los atributos de estado de ScheduledTask
+        task_index ubica sus sorteos estratificados (variación, magnitud, costo) en sample_point
         """
+        # Sin índice de tarea las dimensiones quedan fuera de rango y se sortea con self.rng
+        base = SAMPLED_DIMENSIONS + TASK_SAMPLED_DIMENSIONS * task_index if task_index is not None else sys.maxsize
+        variation_dim, magnitude_dim, cost_dim = base, base + 1, base + 2
+
         if state == 'completed':
             # Variaciones para tareas completadas
-            variation = random.choice(['on_time', 'early', 'delayed'])
+            variation = self._choice(variation_dim, ['on_time', 'early', 'delayed'])
 
             if variation == 'early':
-                days_early = random.randint(1, max(1, duration // 5))
-                real_end = planned_end - timedelta(days=days_early)
+                days_early = self._randint(magnitude_dim, 1, max(1, duration // 5))
+                real_end = end_day - days_early
                 real_duration = duration - days_early
-                cost_variation = random.uniform(0.9, 1.0)
+                cost_variation = self._uniform(cost_dim, 0.9, 1.0)
 
                 return {
-                    "Estado": "Completada anticipadamente",
-                    "Inicio Real": start_date,
-                    "Fin Real": real_end,
-                    "Duración Real (días)": real_duration,
-                    "% Avance Físico": 100,
-                    "Costo Real (USD)": int(cost * cost_variation),
-                    "Retraso (días)": -days_early,
-                    "Sobrecosto (USD)": int(cost * (cost_variation - 1)),
-                    "Causa de Retraso": "N/A",
-                    "Observaciones": f"Completada {days_early} días antes"
+                    "state": "Completada anticipadamente",
+                    "actual_start_day": start_day,
+                    "actual_end_day": real_end,
+                    "actual_duration": real_duration,
+                    "progress": 100,
+                    "actual_cost": int(cost * cost_variation),
+                    "delay": -days_early,
+                    "overrun": int(cost * (cost_variation - 1)),
+                    "delay_cause": "N/A",
+                    "notes": f"Completada {days_early} días antes"
                 }
 
             elif variation == 'delayed':
-                delay_days = int(duration * self.simulation_config['delay_factor'] * random.uniform(0.5, 1.5))
-                real_end = planned_end + timedelta(days=delay_days)
+                delay_days = int(duration * self.simulation_config['delay_factor'] * self._uniform(magnitude_dim, 0.5, 1.5))
+                real_end = end_day + delay_days
                 real_duration = duration + delay_days
                 cost_overrun = delay_days * (cost / duration) * 0.3
 
                 return {
-                    "Estado": "Completada con retraso",
-                    "Inicio Real": start_date,
-                    "Fin Real": real_end,
-                    "Duración Real (días)": real_duration,
-                    "% Avance Físico": 100,
-                    "Costo Real (USD)": int(cost + cost_overrun),
-                    "Retraso (días)": delay_days,
-                    "Sobrecosto (USD)": int(cost_overrun),
-                    "Causa de Retraso": random.choice(self.delay_causes),
-                    "Observaciones": f"Retraso de {delay_days} días"
+                    "state": "Completada con retraso",
+                    "actual_start_day": start_day,
+                    "actual_end_day": real_end,
+                    "actual_duration": real_duration,
+                    "progress": 100,
+                    "actual_cost": int(cost + cost_overrun),
+                    "delay": delay_days,
+                    "overrun": int(cost_overrun),
+                    "delay_cause": self.delay_causes[self.config.choose("delay_causes", self.rng)],
+                    "notes": f"Retraso de {delay_days} días"
                 }
 
             else:  # on_time
-                cost_variation = random.uniform(0.95, 1.05)
+                cost_variation = self._uniform(cost_dim, 0.95, 1.05)
                 return {
-                    "Estado": "Completada",
-                    "Inicio Real": start_date,
-                    "Fin Real": planned_end,
-                    "Duración Real (días)": duration,
-                    "% Avance Físico": 100,
-                    "Costo Real (USD)": int(cost * cost_variation),
-                    "Retraso (días)": 0,
-                    "Sobrecosto (USD)": int(cost * (cost_variation - 1)),
-                    "Causa de Retraso": "N/A",
-                    "Observaciones": "Completada según plan"
+                    "state": "Completada",
+                    "actual_start_day": start_day,
+                    "actual_end_day": end_day,
+                    "actual_duration": duration,
+                    "progress": 100,
+                    "actual_cost": int(cost * cost_variation),
+                    "delay": 0,
+                    "overrun": int(cost * (cost_variation - 1)),
+                    "delay_cause": "N/A",
+                    "notes": "Completada según plan"
                 }
 
         elif state == 'in_progress':
             # Calcular progreso basado en tiempo transcurrido
-            days_since_start = max(0, (self.current_date - start_date).days)
+            days_since_start = max(0, self.current_day - start_day)
             expected_progress = min(100, (days_since_start / duration) * 100)
 
             # Añadir variación al progreso
-            progress_variation = random.uniform(-0.2, 0.1)
+            progress_variation = self._uniform(magnitude_dim, -0.2, 0.1)
             actual_progress = max(5, min(95, expected_progress + expected_progress * progress_variation))
 
             # Determinar si hay retraso
             if actual_progress < expected_progress - 10:
                 status = "En progreso (con retraso)"
-                delay_cause = random.choice(self.delay_causes)
+                delay_cause = self.delay_causes[self.config.choose("delay_causes", self.rng)]
                 obs = f"Progreso menor al esperado"
             elif actual_progress > expected_progress + 5:
                 status = "En progreso (adelantada)"
@@ -714,35 +2076,164 @@ class ImprovedMiningScheduler:
             cost_to_date = int(cost * (actual_progress / 100))
 
             return {
-                "Estado": status,
-                "Inicio Real": start_date,
-                "Fin Real": "En ejecución",
-                "Duración Real (días)": f"~{duration} (estimado)",
-                "% Avance Físico": int(actual_progress),
-                "Costo Real (USD)": cost_to_date,
-                "Retraso (días)": 0,  # Se calculará después
-                "Sobrecosto (USD)": 0,
-                "Causa de Retraso": delay_cause,
-                "Observaciones": obs
+                "state": status,
+                "actual_start_day": start_day,
+                "actual_end_day": None,
+                "actual_duration": f"~{duration} (estimado)",
+                "progress": int(actual_progress),
+                "actual_cost": cost_to_date,
+                "delay": 0,  # Se calculará después
+                "overrun": 0,
+                "delay_cause": delay_cause,
+                "notes": obs
             }
 
         else:  # not_started
             return {
-                "Estado": "No iniciada",
-                "Inicio Real": "Pendiente",
-                "Fin Real": "Pendiente",
-                "Duración Real (días)": "Pendiente",
-                "% Avance Físico": 0,
-                "Costo Real (USD)": "Pendiente",
-                "Retraso (días)": 0,  # Se calculará después
-                "Sobrecosto (USD)": "N/A",
-                "Causa de Retraso": "N/A",
-                "Observaciones": "Esperando inicio"
+                "state": "No iniciada",
+                "actual_start_day": None,
+                "actual_end_day": None,
+                "actual_duration": "Pendiente",
+                "progress": 0,
+                "actual_cost": "Pendiente",
+                "delay": 0,  # Se calculará después
+                "overrun": "N/A",
+                "delay_cause": "N/A",
+                "notes": "Esperando inicio"
             }
 
     def create_dataframe(self):
-        """Convierte la lista de tareas a DataFrame"""
-        return pd.DataFrame(self.tasks)
+        """Convierte la lista de tareas a DataFrame (las etiquetas en español se aplican solo aquí)"""
+        if not self.tasks:
+            return pd.DataFrame()
+        return pd.DataFrame({label: [getattr(task, attribute) for task in self.tasks]
+                             for label, attribute in ScheduledTask.FIELDS.items()})
+
+    def _memory_checkpoint(self, stage=None):
+        """
+        Registra en memory_stages el pico y lo retenido desde el checkpoint anterior
+        Solo actúa con tracemalloc activo; en otro caso no tiene costo
+        """
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if stage is not None and self._memory_mark is not None:
+            self.memory_stages[stage] = {
+                'peak_bytes': peak - self._memory_mark,
+                'retained_bytes': current - self._memory_mark
+            }
+        tracemalloc.reset_peak()
+        self._memory_mark = current
+
+    def memory_report(self, df=None):
+        """
+        Reporte de memoria de la simulación en formato apto para JSON: bytes profundos por columna del
+        DataFrame, tamaño de las tareas, de los predecesores detallados y del grafo CSR, y picos por etapa
+        (estos últimos solo si tracemalloc estaba activo durante la generación)
+        """
+        if df is None:
+            df = self.create_dataframe()
+        column_bytes = df.memory_usage(deep=True, index=False)
+        graph = self.dependency_graph
+
+        return {
+            'simulation_id': self.simulation_id,
+            'tasks': len(self.tasks),
+            'dataframe_bytes': int(column_bytes.sum()),
+            'column_bytes': {column: int(size) for column, size in column_bytes.items()},
+            'object_columns': [column for column, dtype in df.dtypes.items() if dtype == object],
+            'task_records_bytes': deep_getsizeof(self.tasks),
+            'predecessor_details_bytes': deep_getsizeof(
+                [task.get("Predecesores Detallados") for task in self.tasks]),
+            'dependency_graph_bytes': graph.nbytes() if graph is not None else 0,
+            'stages': dict(self.memory_stages)
+        }
+
+    def task_array(self, out=None):
+        """
+        Devuelve las tareas como matriz float64 (tareas x TASK_ARRAY_FIELDS)
+        Si se entrega `out` (por ejemplo una vista de memoria compartida) se escribe ahí sin copias intermedias
+        """
+        if out is None:
+            out = np.full((len(self.tasks), len(TASK_ARRAY_FIELDS)), np.nan)
+        elif len(self.tasks) > out.shape[0]:
+            raise ValueError(f"El buffer admite {out.shape[0]} tareas y la simulación tiene {len(self.tasks)}")
+
+        tasks = self.tasks
+
+        def values(key):
+            attribute = ScheduledTask.FIELDS[key]
+            return [getattr(task, attribute) for task in tasks]
+
+        # Las fechas ya son días desde el origen común de las tareas (project_start_date al generarlas)
+        shift = (tasks[0].origin - self.project_start_date).days if tasks else 0
+
+        def day_offsets(attribute):
+            return [np.nan if days is None else days + shift for days in map(operator.attrgetter(attribute), tasks)]
+
+        # Columna por columna: una asignación vectorizada por campo en lugar de una por tarea
+        columns = (
+            values("ID"),
+            values("Duración Planificada (días)"),
+            day_offsets("planned_start_day"),
+            day_offsets("planned_end_day"),
+            day_offsets("actual_start_day"),
+            day_offsets("actual_end_day"),
+            [TASK_STATE_CODES.get(state, -1) for state in values("Estado")],
+            values("% Avance Físico"),
+            values("Días de Retraso"),
+            values("Buffer sugerido (días)"),
+            values("Costo Planificado (USD)"),
+            [cost if isinstance(cost, (int, float)) else np.nan for cost in values("Costo Real (USD)")]
+        )
+        for j, column in enumerate(columns):
+            out[:len(tasks), j] = column
+
+        return out
+
+    def validate_coherence(self):
+        """
+        Verifica las reglas de SCHEDULE_RULES sobre todas las tareas
+        Devuelve {regla: número de tareas que la incumplen}
+        """
+        report = validate_schedules([self])
+        return {rule: int(report.at[0, rule]) for rule in SCHEDULE_RULES}
+
+    def get_dependency_graph(self):
+        """
+        Devuelve el grafo CSR de dependencias de la simulación (lo construye desde self.tasks si no existe)
+        """
+        if self.dependency_graph is None:
+            self.dependency_graph = DependencyGraph.from_tasks(
+                self.tasks, id_key="ID", predecessors_key="Predecesores Detallados"
+            )
+        return self.dependency_graph
+
+    def get_reachability_index(self):
+        """
+        Índice de ancestros/descendientes de la red, construido una vez por grafo de dependencias
+        """
+        graph = self.get_dependency_graph()
+        if self.reachability_index is None or self.reachability_index.graph is not graph:
+            self.reachability_index = ReachabilityIndex(graph)
+        return self.reachability_index
+
+    def impact_analysis(self, task_id):
+        """
+        Tareas y fases impactadas si `task_id` se retrasa, y tareas de las que depende
+        """
+        index = self.get_reachability_index()
+        graph = self.get_dependency_graph()
+        impacted = index.descendants(task_id)
+        required = index.ancestors(task_id)
+        phases = [self.tasks[graph.id_to_index[int(i)]]["Fase"] for i in impacted]
+
+        return {
+            "🎯 Tarea": task_id,
+            "📉 Tareas Impactadas": impacted.tolist(),
+            "🧩 Fases Impactadas": list(dict.fromkeys(phases)),
+            "🔙 Depende de": required.tolist()
+        }
 
     def create_network_diagram(self):
         """
@@ -751,20 +2242,21 @@ class ImprovedMiningScheduler:
         try:
             import networkx as nx
         except ImportError:
-            print("⚠️ NetworkX no está instalado. Instala con: pip install networkx")
+            EVENTS.emit("dependency_missing", "⚠️ NetworkX no está instalado. Instala con: pip install networkx",
+                        level=logging.WARNING, package="networkx", feature="network_diagram")
             return None
 
-        df = self.create_dataframe()
+        graph = self.get_dependency_graph()
 
         # Crear grafo dirigido
         G = nx.DiGraph()
 
         # Añadir nodos
-        for _, row in df.iterrows():
-            G.add_node(row['ID'],
-                      label=f"{row['ID']}: {row['Tarea'][:20]}...",
-                      phase=row['Fase'],
-                      status=row['Estado'])
+        for task in self.tasks:
+            G.add_node(task['ID'],
+                      label=f"{task['ID']}: {task['Tarea'][:20]}...",
+                      phase=task['Fase'],
+                      status=task['Estado'])
 
         # Añadir aristas basadas en predecesores
         edge_colors = {
@@ -774,13 +2266,14 @@ class ImprovedMiningScheduler:
             'SF': 'red'      # Start-to-Finish
         }
 
-        for _, row in df.iterrows():
-            if row['Predecesores Detallados']:
-                for pred_id, dep_type, lag in row['Predecesores Detallados']:
-                    G.add_edge(pred_id, row['ID'],
-                              type=dep_type,
-                              lag=lag,
-                              color=edge_colors.get(dep_type, 'gray'))
+        sources = graph.task_ids[graph.pred_indices].tolist()
+        targets = graph.task_ids[graph.edge_targets].tolist()
+        for pred_id, task_id, type_code, lag in zip(sources, targets, graph.pred_types.tolist(), graph.pred_lags.tolist()):
+            dep_type = DEPENDENCY_TYPES[type_code]
+            G.add_edge(pred_id, task_id,
+                      type=dep_type,
+                      lag=lag,
+                      color=edge_colors.get(dep_type, 'gray'))
 
         # Calcular posiciones usando layout jerárquico
         pos = nx.spring_layout(G, k=2, iterations=50)
@@ -810,16 +2303,7 @@ class ImprovedMiningScheduler:
         node_text = []
         node_colors = []
 
-        phase_colors = {
-            "Preparación del Terreno": "#FF6B6B",
-            "Movimiento de Tierra": "#4ECDC4",
-            "Cimentaciones": "#45B7D1",
-            "Estructuras Principales": "#96CEB4",
-            "Instalaciones Mecánicas": "#FFEAA7",
-            "Instalaciones Eléctricas": "#DDA0DD",
-            "Acabados y Pruebas": "#98D8C8",
-            "Puesta en Marcha": "#F7DC6F"
-        }
+        phase_colors = PHASE_COLORS
 
         for node in G.nodes(data=True):
             x, y = pos[node[0]]
@@ -876,26 +2360,138 @@ class ImprovedMiningScheduler:
 
         return fig
 
-    def create_enhanced_gantt(self):
+    def phase_rollup(self):
+        """
+        Resumen por fase calculado con operaciones agrupadas sobre task_array: tramo planificado y real,
+        buffer, retraso, estados, % de avance (ponderado por duración) y costos
+        """
+        arrays = self.task_array()
+        field = {name: i for i, name in enumerate(TASK_ARRAY_FIELDS)}
+        phase_index = {phase: i for i, phase in enumerate(self.phases)}
+        codes = np.array([phase_index[task.phase] for task in self.tasks], dtype=np.int64)
+        num_phases = len(self.phases)
+        current_day = self.current_day
+
+        def column(name):
+            return arrays[:, field[name]]
+
+        def grouped(ufunc, values, initial):
+            result = np.full(num_phases, initial, dtype=np.float64)
+            ufunc.at(result, codes, values)
+            return result
+
+        def total(values):
+            return np.bincount(codes, weights=np.nan_to_num(values), minlength=num_phases)
+
+        state = column("Estado (código)")
+        in_progress = (state >= TASK_STATE_CODES["En progreso"]) & (state < TASK_STATE_CODES["Completada"])
+        actual_end = np.where(in_progress, current_day, column("Fin Real (día)"))
+        planned_finish = column("Fin Planificado (día)")
+        durations = column("Duración Planificada (días)")
+        ids = column("ID")
+
+        planned_end = grouped(np.fmax, planned_finish, np.nan)
+        tasks = np.bincount(codes, minlength=num_phases)
+        rollup = pd.DataFrame({
+            'Fase': list(self.phases),
+            'Tareas': tasks,
+            'ID Mínimo': grouped(np.fmin, ids, np.nan),
+            'ID Máximo': grouped(np.fmax, ids, np.nan),
+            'Inicio Planificado (día)': grouped(np.fmin, column("Inicio Planificado (día)"), np.nan),
+            'Fin Planificado (día)': planned_end,
+            'Inicio Real (día)': grouped(np.fmin, column("Inicio Real (día)"), np.nan),
+            'Fin Real (día)': grouped(np.fmax, actual_end, np.nan),
+            'Buffer (días)': grouped(np.fmax, planned_finish + column("Buffer sugerido (días)"), np.nan) - planned_end,
+            'Retraso Máximo (días)': grouped(np.fmax, column("Días de Retraso"), np.nan),
+            'Días de Retraso': total(column("Días de Retraso")),
+            'Completadas': np.bincount(codes, weights=state >= TASK_STATE_CODES["Completada"], minlength=num_phases),
+            'En progreso': np.bincount(codes, weights=in_progress, minlength=num_phases),
+            'No iniciadas': np.bincount(codes, weights=state == TASK_STATE_CODES["No iniciada"], minlength=num_phases),
+            '% Avance': total(durations * column("% Avance Físico")) / np.maximum(total(durations), 1),
+            'Costo Planificado (USD)': total(column("Costo Planificado (USD)")),
+            'Costo Real (USD)': total(column("Costo Real (USD)"))
+        })
+        rollup = rollup[rollup['Tareas'] > 0].reset_index(drop=True)
+
+        integer_columns = ['ID Mínimo', 'ID Máximo', 'Completadas', 'En progreso', 'No iniciadas']
+        rollup[integer_columns] = rollup[integer_columns].astype(np.int64)
+        for name in ('Inicio Planificado', 'Fin Planificado', 'Inicio Real', 'Fin Real'):
+            rollup[name] = pd.to_datetime(self.project_start_date) + pd.to_timedelta(rollup[f"{name} (día)"], unit='D')
+        return rollup
+
+    def create_phase_rollup_gantt(self, rollup=None):
+        """
+        Gantt agregado: una barra por fase para el tramo planificado, el real, el buffer y el retraso
+        El tamaño de la figura depende del número de fases, no del de tareas. customdata lleva la fase y
+        su rango de IDs para abrir el detalle con create_enhanced_gantt(phase=...) o (id_range=...)
+        """
+        if rollup is None:
+            rollup = self.phase_rollup()
+        phase_colors = [PHASE_COLORS.get(phase, "#95A5A6") for phase in rollup['Fase']]
+        day_ms = 24 * 60 * 60 * 1000
+        customdata = np.column_stack([rollup['Fase'], rollup['ID Mínimo'], rollup['ID Máximo'], rollup['Tareas'],
+                                      rollup['% Avance'].round(1), rollup['Retraso Máximo (días)'],
+                                      rollup['Días de Retraso'], rollup['Buffer (días)']])
+        hover = ("<b>%{customdata[0]}</b> (IDs %{customdata[1]}-%{customdata[2]}, %{customdata[3]} tareas)<br>" +
+                 "Avance: %{customdata[4]}%<br>" +
+                 "Retraso máximo: %{customdata[5]} días (total %{customdata[6]})<br>" +
+                 "Buffer: %{customdata[7]} días<extra>%{fullData.name}</extra>")
+
+        def bar(name, start, days, **style):
+            return go.Bar(name=name, y=rollup['Fase'], base=start, x=days * day_ms, orientation='h',
+                          customdata=customdata, hovertemplate=hover, **style)
+
+        planned_days = rollup['Fin Planificado (día)'] - rollup['Inicio Planificado (día)'] + 1
+        actual_days = rollup['Fin Real (día)'] - rollup['Inicio Real (día)'] + 1
+        buffer_start = rollup['Fin Planificado'] + pd.Timedelta(days=1)
+
+        fig = go.Figure([
+            bar('Planificado', rollup['Inicio Planificado'], planned_days, marker_color=phase_colors, opacity=0.35),
+            bar('Real', rollup['Inicio Real'], actual_days, marker_color=phase_colors, width=0.4),
+            bar('Buffer', buffer_start, rollup['Buffer (días)'], marker_color='lightgray', width=0.25,
+                marker_pattern_shape='.'),
+            bar('Retraso', buffer_start, rollup['Retraso Máximo (días)'], marker_color='#E74C3C', width=0.1)
+        ])
+
+        fig.add_vline(x=self.current_date, line=dict(color="red", width=2, dash="dash"))
+        fig.update_layout(
+            title={
+                'text': f'Gantt por Fase - {self.simulation_config["profile_name"]} (ID: {self.simulation_id})<br>' +
+                       f'<sub>{len(self.tasks)} tareas en {len(rollup)} fases</sub>',
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 18}
+            },
+            barmode='overlay',
+            xaxis_title="Fecha",
+            yaxis_title="Fase",
+            height=max(400, len(rollup) * 60),
+            hovermode='closest',
+            xaxis=dict(type='date', tickformat='%d/%m/%Y'),
+            yaxis=dict(autorange='reversed')
+        )
+        return fig
+
+    def create_enhanced_gantt(self, rollup=False, phase=None, id_range=None):
         """
         Crea un gráfico de Gantt mejorado con información de retrasos y buffers
+        rollup=True entrega el Gantt agregado por fase (create_phase_rollup_gantt); phase o
+        id_range=(desde, hasta) limitan el detalle por tarea a esa fase o rango de IDs
         """
+        if rollup:
+            return self.create_phase_rollup_gantt()
+
         df = self.create_dataframe()
+        if phase is not None:
+            df = df[df["Fase"] == phase]
+        if id_range is not None:
+            df = df[df["ID"].between(*id_range)]
 
         fig = go.Figure()
 
-        colors = {
-            "Preparación del Terreno": "#FF6B6B",
-            "Movimiento de Tierra": "#4ECDC4",
-            "Cimentaciones": "#45B7D1",
-            "Estructuras Principales": "#96CEB4",
-            "Instalaciones Mecánicas": "#FFEAA7",
-            "Instalaciones Eléctricas": "#DDA0DD",
-            "Acabados y Pruebas": "#98D8C8",
-            "Puesta en Marcha": "#F7DC6F"
-        }
+        colors = PHASE_COLORS
 
-        for i, row in df.iterrows():
+        for i, (_, row) in enumerate(df.iterrows()):
             # Barra planificada
             fig.add_trace(go.Scatter(
                 x=[row["Inicio Planificado"], row["Fin Planificado"]],
@@ -952,17 +2548,18 @@ class ImprovedMiningScheduler:
                                  f"Observaciones: {row['Observaciones']}<br>"
                 ))
 
-        # Línea de fecha actual
+        # Línea de fecha actual (sobre el rango de IDs mostrado)
+        first_id, last_id = (int(df["ID"].min()), int(df["ID"].max())) if len(df) else (0, 0)
         fig.add_shape(
             type="line",
             x0=self.current_date, x1=self.current_date,
-            y0=0, y1=len(df)+1,
+            y0=0, y1=last_id + 1,
             line=dict(color="red", width=2, dash="dash"),
         )
 
         fig.add_annotation(
             x=self.current_date,
-            y=len(df) * 0.95,
+            y=first_id + (last_id - first_id) * 0.95,
             text=f"📅 Hoy ({self.current_date.strftime('%d/%m/%Y')})",
             showarrow=True,
             arrowhead=2,
@@ -995,27 +2592,33 @@ class ImprovedMiningScheduler:
         """
         Imprime un resumen del cronograma para verificar la distribución de fechas
         """
+        if not EVENTS.enabled():
+            return
+
         df = self.create_dataframe()
+        fields = {'simulation_id': self.simulation_id,
+                  'project_start_date': self.project_start_date.date().isoformat(),
+                  'current_date': self.current_date.date().isoformat()}
 
-        print("\n" + "="*80)
-        print(f"RESUMEN DEL CRONOGRAMA - {self.simulation_id}")
-        print("="*80)
-        print(f"Fecha de inicio del proyecto: {self.project_start_date.strftime('%d/%m/%Y')}")
-        print(f"Fecha actual de evaluación: {self.current_date.strftime('%d/%m/%Y')}")
+        lines = ["\n" + "="*80,
+                 f"RESUMEN DEL CRONOGRAMA - {self.simulation_id}",
+                 "="*80,
+                 f"Fecha de inicio del proyecto: {self.project_start_date.strftime('%d/%m/%Y')}",
+                 f"Fecha actual de evaluación: {self.current_date.strftime('%d/%m/%Y')}"]
 
         # Obtener fechas min y max planificadas
         valid_dates = df[df['Inicio Planificado'].notna()]['Inicio Planificado']
         if not valid_dates.empty:
             min_date = valid_dates.min()
             max_date = df[df['Fin Planificado'].notna()]['Fin Planificado'].max()
-            print(f"Primera tarea planificada: {min_date.strftime('%d/%m/%Y')}")
-            print(f"Última tarea planificada: {max_date.strftime('%d/%m/%Y')}")
-            print(f"Duración total del proyecto: {(max_date - min_date).days} días")
+            lines.append(f"Primera tarea planificada: {min_date.strftime('%d/%m/%Y')}")
+            lines.append(f"Última tarea planificada: {max_date.strftime('%d/%m/%Y')}")
+            lines.append(f"Duración total del proyecto: {(max_date - min_date).days} días")
+            fields['duration_days'] = (max_date - min_date).days
 
-        print("\n" + "-"*40)
-        print("DISTRIBUCIÓN POR FASES:")
-        print("-"*40)
+        lines += ["\n" + "-"*40, "DISTRIBUCIÓN POR FASES:", "-"*40]
 
+        phases = {}
         for fase in self.phases:
             fase_df = df[df['Fase'] == fase]
             if not fase_df.empty:
@@ -1023,52 +2626,43 @@ class ImprovedMiningScheduler:
                 valid_ends = fase_df[fase_df['Fin Planificado'].notna()]['Fin Planificado']
 
                 if not valid_starts.empty and not valid_ends.empty:
-                    print(f"\n{fase}:")
-                    print(f"  Tareas: {len(fase_df)}")
-                    print(f"  Inicio: {valid_starts.min().strftime('%d/%m/%Y')}")
-                    print(f"  Fin: {valid_ends.max().strftime('%d/%m/%Y')}")
-                    print(f"  Estados: Completadas={len(fase_df[fase_df['Estado'].str.contains('Completada', na=False)])}, "
-                          f"En progreso={len(fase_df[fase_df['Estado'].str.contains('En progreso', na=False)])}, "
-                          f"No iniciadas={len(fase_df[fase_df['Estado'] == 'No iniciada'])}")
-
-        print("\n" + "="*80)
+                    completed = len(fase_df[fase_df['Estado'].str.contains('Completada', na=False)])
+                    in_progress = len(fase_df[fase_df['Estado'].str.contains('En progreso', na=False)])
+                    not_started = len(fase_df[fase_df['Estado'] == 'No iniciada'])
+                    lines.append(f"\n{fase}:")
+                    lines.append(f"  Tareas: {len(fase_df)}")
+                    lines.append(f"  Inicio: {valid_starts.min().strftime('%d/%m/%Y')}")
+                    lines.append(f"  Fin: {valid_ends.max().strftime('%d/%m/%Y')}")
+                    lines.append(f"  Estados: Completadas={completed}, "
+                                 f"En progreso={in_progress}, "
+                                 f"No iniciadas={not_started}")
+                    phases[fase] = {'tasks': len(fase_df), 'completed': completed,
+                                    'in_progress': in_progress, 'not_started': not_started}
+
+        lines.append("\n" + "="*80)
+        EVENTS.emit("schedule_summary", "\n".join(lines), phases=phases, **fields)
 
     def generate_dependency_report(self):
         """
         Genera un reporte detallado de las dependencias del proyecto
         """
-        df = self.create_dataframe()
+        graph = self.get_dependency_graph()
 
-        # Análisis de dependencias
-        dependency_stats = {
-            'FS': 0, 'SS': 0, 'FF': 0, 'SF': 0
-        }
-
-        total_dependencies = 0
-        max_dependencies = 0
-        tasks_with_multiple_deps = 0
-        parallel_tasks = 0
-
-        for _, row in df.iterrows():
-            deps = row['Predecesores Detallados']
-            if deps:
-                num_deps = len(deps)
-                total_dependencies += num_deps
-                max_dependencies = max(max_dependencies, num_deps)
-
-                if num_deps > 1:
-                    tasks_with_multiple_deps += 1
+        # Análisis de dependencias sobre el grafo CSR
+        dependency_stats = graph.type_counts()
+        in_degree = graph.in_degree()
 
-                for _, dep_type, _ in deps:
-                    dependency_stats[dep_type] += 1
-                    if dep_type in ['SS', 'FF']:
-                        parallel_tasks += 1
+        total_dependencies = graph.num_edges
+        max_dependencies = int(in_degree.max()) if graph.num_tasks else 0
+        tasks_with_multiple_deps = int((in_degree > 1).sum())
+        parallel_tasks = dependency_stats['SS'] + dependency_stats['FF']
 
         # Calcular camino crítico simplificado (tareas sin holgura)
-        critical_tasks = []
-        for _, row in df.iterrows():
-            if row['Buffer sugerido (días)'] <= 2:  # Tareas con poco buffer son críticas
-                critical_tasks.append(row['ID'])
+        if self.critical_chain is not None:
+            critical_tasks = self.critical_chain['critical_chain']
+        else:
+            buffers = np.array([task.buffer_days for task in self.tasks])
+            critical_tasks = graph.task_ids[buffers <= 2]  # Tareas con poco buffer son críticas
 
         report = {
             "📊 Tipo de Red": self.simulation_config["network_style"],
@@ -1085,13 +2679,18 @@ class ImprovedMiningScheduler:
             "🎲 Complejidad de Red": "Alta" if max_dependencies > 3 else "Media" if max_dependencies > 1 else "Baja"
         }
 
+        if self.simulation_config['reduce_dependencies']:
+            report["✂️ Dependencias Redundantes Eliminadas"] = len(self.removed_dependencies)
+
         return report
 
-    def generate_summary_metrics(self):
+    def generate_summary_metrics(self, df=None):
         """
         Genera métricas de resumen para la simulación
+        Acepta un DataFrame ya construido para evitar reconstruirlo
         """
-        df = self.create_dataframe()
+        if df is None:
+            df = self.create_dataframe()
 
         # Contadores de estado
         completed = len(df[df["Estado"].str.contains("Completada", na=False)])
@@ -1308,15 +2907,19 @@ class ImprovedMiningScheduler:
 
             # Guardar archivo
             wb.save(filename)
-            print(f"✅ Archivo Excel exportado con formato avanzado: {filename}")
-            print(f"   📊 Hojas incluidas: 'Cronograma' (datos principales) y 'Resumen' (métricas)")
-            print(f"   📋 Columnas exportadas: {len(df_export.columns)}")
-            print(f"   ❌ Columnas técnicas excluidas: Predecesores Detallados")
+            EVENTS.emit("excel_exported",
+                        f"✅ Archivo Excel exportado con formato avanzado: {filename}\n"
+                        f"   📊 Hojas incluidas: 'Cronograma' (datos principales) y 'Resumen' (métricas)\n"
+                        f"   📋 Columnas exportadas: {len(df_export.columns)}\n"
+                        f"   ❌ Columnas técnicas excluidas: Predecesores Detallados",
+                        filename=filename, simulation_id=self.simulation_id, format="openpyxl",
+                        columns=len(df_export.columns))
             return filename
 
         except ImportError:
             # Si openpyxl no está disponible, usar pandas to_excel básico
-            print("⚠️ openpyxl no está instalado. Exportando con formato básico...")
+            EVENTS.emit("excel_fallback", "⚠️ openpyxl no está instalado. Exportando con formato básico...",
+                        level=logging.WARNING, filename=filename, simulation_id=self.simulation_id)
 
             # Crear archivo con múltiples hojas usando pandas
             with pd.ExcelWriter(filename, engine='xlsxwriter' if 'xlsxwriter' in globals() else None) as writer:
@@ -1330,59 +2933,3000 @@ class ImprovedMiningScheduler:
                 ])
                 summary_df.to_excel(writer, sheet_name='Resumen', index=False)
 
-            print(f"✅ Archivo Excel exportado con pandas: {filename}")
-            print(f"   📋 Columnas exportadas: {len(df_export.columns)}")
-            print(f"   ❌ Columnas técnicas excluidas: Predecesores Detallados")
+            EVENTS.emit("excel_exported",
+                        f"✅ Archivo Excel exportado con pandas: {filename}\n"
+                        f"   📋 Columnas exportadas: {len(df_export.columns)}\n"
+                        f"   ❌ Columnas técnicas excluidas: Predecesores Detallados",
+                        filename=filename, simulation_id=self.simulation_id, format="pandas",
+                        columns=len(df_export.columns))
 
             return filename
 
         except Exception as e:
-            print(f"⚠️ Error al exportar con formato avanzado: {str(e)}")
-            print("   Intentando exportación básica...")
+            EVENTS.emit("excel_fallback",
+                        f"⚠️ Error al exportar con formato avanzado: {str(e)}\n   Intentando exportación básica...",
+                        level=logging.WARNING, filename=filename, simulation_id=self.simulation_id, error=str(e))
 
             # Fallback a exportación básica
             df_export.to_excel(filename, index=False)
-            print(f"✅ Archivo Excel exportado (formato básico): {filename}")
+            EVENTS.emit("excel_exported", f"✅ Archivo Excel exportado (formato básico): {filename}",
+                        filename=filename, simulation_id=self.simulation_id, format="basic",
+                        columns=len(df_export.columns))
             return filename
 
-
+    def simulate_evolution(self, seed=None, max_days=None):
+        """
+        Reproduce día a día la evolución del proyecto desde project_start_date hasta su término
+        Devuelve la serie diaria de estado (ver ProjectEvolutionEngine)
+        """
+        engine = ProjectEvolutionEngine(self, seed=seed)
+        return engine.run(max_days=max_days)
+
+    def calculate_forecast(self, respect_planned_start=True):
+        """
+        Recalcula inicio y fin pronosticados de las tareas no terminadas a partir de los términos reales
+        y estimados de sus predecesores (los retrasos se propagan a los sucesores)
+        """
+        array = self.task_array()
+        current_day = self.current_day
+        start, finish = forecast_dates(self.get_dependency_graph(), array, current_day, respect_planned_start)
+
+        planned_end = array[:, TASK_ARRAY_FIELDS.index("Fin Planificado (día)")].astype(np.int64)
+
+        def to_date(days):
+            return [self.project_start_date + timedelta(days=int(d)) for d in days]
+
+        return pd.DataFrame({
+            "ID": [task.id for task in self.tasks],
+            "Fase": [task.phase for task in self.tasks],
+            "Tarea": [task.name for task in self.tasks],
+            "Estado": [task.state for task in self.tasks],
+            "Fin Planificado": [task.planned_end for task in self.tasks],
+            "Inicio Pronosticado": to_date(start),
+            "Fin Pronosticado": to_date(finish),
+            "Desvío Pronosticado (días)": finish - planned_end
+        })
+
+    def compare_with(self, baseline):
+        """
+        Compara este cronograma con una línea base (otro scheduler, DataFrame o Excel exportado)
+        Ver diff_schedules
+        """
+        return diff_schedules(baseline, self)
+
+    def generate_forecast_report(self, forecast=None):
+        """
+        Resume el pronóstico: fin pronosticado del proyecto y desvío total y por fase
+        """
+        if forecast is None:
+            forecast = self.calculate_forecast()
+
+        planned_finish = forecast["Fin Planificado"].max()
+        forecast_finish = forecast["Fin Pronosticado"].max()
+
+        phase_finish = forecast.groupby("Fase", sort=False).agg(
+            planned=("Fin Planificado", "max"), forecast=("Fin Pronosticado", "max")
+        )
+        phase_slip = {phase: int((row.forecast - row.planned).days) for phase, row in phase_finish.iterrows()}
+
+        return {
+            "📅 Fin planificado": planned_finish.strftime("%d/%m/%Y"),
+            "🔮 Fin pronosticado": forecast_finish.strftime("%d/%m/%Y"),
+            "⏱️ Desvío del proyecto (días)": int((forecast_finish - planned_finish).days),
+            "⚠️ Tareas con desvío": int((forecast["Desvío Pronosticado (días)"] > 0).sum()),
+            "🧩 Desvío por fase (días)": phase_slip
+        }
+
+    def cost_s_curve(self, by_phase=False):
+        """
+        Curva S de costo diaria: gasto planificado y real por día y acumulado (total o por fase)
+        El costo real se muestra hasta la fecha de evaluación
+        """
+        phase_index = {phase: i for i, phase in enumerate(self.phases)}
+        phase_codes = np.array([phase_index[task.phase] for task in self.tasks], dtype=np.int64)
+        current_day = self.current_day
+        curves = cost_s_curves(self.task_array(), phase_codes, len(self.phases), current_day)
+
+        if not by_phase:
+            curves = {name: curve.sum(axis=0, keepdims=True) for name, curve in curves.items()}
+        phases = list(self.phases) if by_phase else [None]
+        horizon = curves['planned'].shape[-1]
+        days = np.arange(horizon)
+
+        frames = []
+        for i, phase in enumerate(phases):
+            frame = pd.DataFrame({
+                'Día': days,
+                'Fecha': pd.to_datetime(self.project_start_date) + pd.to_timedelta(days, unit='D'),
+                'Costo Planificado Diario (USD)': curves['planned_daily'][i],
+                'Costo Real Diario (USD)': curves['actual_daily'][i],
+                'Costo Planificado Acumulado (USD)': curves['planned'][i],
+                'Costo Real Acumulado (USD)': curves['actual'][i]
+            })
+            if by_phase:
+                frame.insert(2, 'Fase', phase)
+            frames.append(frame)
+
+        df = pd.concat(frames, ignore_index=True)
+        future = df['Día'] > current_day
+        df.loc[future, ['Costo Real Diario (USD)', 'Costo Real Acumulado (USD)']] = np.nan
+        return df
+
+
+class ProjectEvolutionEngine:
+    """
+    Motor de evolución por pasos diarios: avanza progreso, inicios, términos, retrasos y costos
+    desde el inicio del proyecto hasta completar todas las tareas
+
+    - Una tarea queda lista cuando se cumplen sus restricciones de inicio (FS/SS) y su inicio planificado
+    - Las restricciones FF/SF limitan el día de término
+    - Cada día de trabajo una tarea activa puede sufrir un día de retraso con probabilidad
+      riesgo de la fase x delay_factor del perfil; ese día no avanza y genera un 30% de sobrecosto diario
+    - En cada paso solo se actualizan las tareas activas y los sucesores de las que cambian de estado
+    """
+
+    NOT_STARTED, ACTIVE, DONE = 0, 1, 2
+
+    def __init__(self, scheduler, seed=None):
+        self.scheduler = scheduler
+        self.graph = scheduler.get_dependency_graph()
+        self.rng = np.random.default_rng(seed)
+
+        array = scheduler.task_array()
+        field = {name: i for i, name in enumerate(TASK_ARRAY_FIELDS)}
+        self.durations = array[:, field["Duración Planificada (días)"]].astype(np.int32)
+        self.planned_start = array[:, field["Inicio Planificado (día)"]].astype(np.int32)
+        self.planned_end = array[:, field["Fin Planificado (día)"]].astype(np.int32)
+        self.planned_cost = array[:, field["Costo Planificado (USD)"]]
+        self.daily_cost = self.planned_cost / np.maximum(self.durations, 1)
+
+        risks = np.array([task.delay_risk for task in scheduler.tasks], dtype=np.float64) / 100
+        self.delay_probability = risks * scheduler.simulation_config['delay_factor']
+
+        n = self.graph.num_tasks
+        self.state = np.full(n, self.NOT_STARTED, dtype=np.int8)
+        self.progress = np.zeros(n, dtype=np.float64)
+        self.actual_start = np.full(n, -1, dtype=np.int32)
+        self.actual_finish = np.full(n, -1, dtype=np.int32)
+        self.actual_cost = np.zeros(n, dtype=np.float64)
+        self.delay_days = np.zeros(n, dtype=np.int32)
+
+        # Restricciones pendientes por tarea y fecha más temprana acumulada
+        # Las aristas con lag negativo no bloquean: el plan ya respeta su adelanto
+        types = self.graph.pred_types
+        targets = self.graph.edge_targets
+        blocking = self.graph.pred_lags >= 0
+        self.unmet_start = np.bincount(targets[np.isin(types, [FS, SS]) & blocking], minlength=n)
+        self.unmet_finish = np.bincount(targets[np.isin(types, [FF, SF]) & blocking], minlength=n)
+        self.earliest_start = self.planned_start.copy()
+        self.earliest_finish = np.zeros(n, dtype=np.int32)
+
+        self.ready = np.flatnonzero(self.unmet_start == 0).astype(np.int32)
+        self.active = np.empty(0, dtype=np.int32)
+
+        # Totales incrementales: la serie diaria no recorre todas las tareas en cada paso
+        self.finished_today = 0
+        self.total_progress = 0
+        self.total_delay_days = 0
+        self.total_cost = 0.0
+
+    def _successor_edges(self, tasks, edge_types):
+        """Aristas salientes (índices en CSR de sucesores) de un conjunto de tareas, filtradas por tipo"""
+        starts = self.graph.succ_indptr[tasks]
+        counts = self.graph.succ_indptr[tasks + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        return offsets[np.isin(self.graph.succ_types[offsets], edge_types)]
+
+    def _release(self, tasks, day, event):
+        """
+        Propaga el inicio o término de `tasks` a sus sucesores
+        Devuelve las tareas que quedan listas para iniciar
+        """
+        graph = self.graph
+        if event == "start":
+            start_types, finish_types, base = [SS], [SF], day
+        else:
+            start_types, finish_types, base = [FS], [FF], day
+
+        # Restricciones de inicio (SS: inicio + lag, FS: término + lag + 1)
+        edges = self._successor_edges(tasks, start_types)
+        newly_ready = np.empty(0, dtype=np.int32)
+        if len(edges):
+            successors = graph.succ_indices[edges]
+            offset = 0 if event == "start" else 1
+            lags = graph.succ_lags[edges].astype(np.int32)
+            np.maximum.at(self.earliest_start, successors, base + lags + offset)
+            blocking = successors[lags >= 0]
+            np.subtract.at(self.unmet_start, blocking, 1)
+            candidates = np.unique(blocking)
+            newly_ready = candidates[(self.unmet_start[candidates] == 0) &
+                                     (self.state[candidates] == self.NOT_STARTED)].astype(np.int32)
+
+        # Restricciones de término (SF: inicio + lag, FF: término + lag)
+        edges = self._successor_edges(tasks, finish_types)
+        if len(edges):
+            successors = graph.succ_indices[edges]
+            lags = graph.succ_lags[edges].astype(np.int32)
+            np.maximum.at(self.earliest_finish, successors, base + lags)
+            np.subtract.at(self.unmet_finish, successors[lags >= 0], 1)
+
+        return newly_ready
+
+    def step(self, day):
+        """Avanza un día: inicia tareas listas, avanza las activas y cierra las terminadas"""
+        # 1. Inicios (los sucesores SS con lag 0 pueden iniciar el mismo día)
+        while len(self.ready):
+            can_start = self.earliest_start[self.ready] <= day
+            if not can_start.any():
+                break
+            starting = self.ready[can_start]
+            self.ready = self.ready[~can_start]
+            self.state[starting] = self.ACTIVE
+            self.actual_start[starting] = day
+            self.active = np.concatenate([self.active, starting])
+            self.ready = np.concatenate([self.ready, self._release(starting, day, "start")])
+
+        # 2. Avance de las tareas activas (solo las que aún tienen trabajo pendiente)
+        active = self.active
+        self.finished_today = 0
+        if len(active):
+            pending = self.progress[active] < self.durations[active]
+            delayed = pending & (self.rng.random(len(active)) < self.delay_probability[active])
+            worked = pending & ~delayed
+            day_cost = self.daily_cost[active] * (worked + 0.3 * delayed)
+
+            self.progress[active] += worked
+            self.delay_days[active] += delayed
+            self.actual_cost[active] += day_cost
+            self.total_progress += int(worked.sum())
+            self.total_delay_days += int(delayed.sum())
+            self.total_cost += float(day_cost.sum())
+
+        # 3. Términos: trabajo completo y restricciones FF/SF satisfechas
+        #    (un término puede liberar el término FF de un sucesor el mismo día)
+        while len(self.active):
+            active = self.active
+            finishing_mask = ((self.progress[active] >= self.durations[active]) &
+                              (self.unmet_finish[active] == 0) &
+                              (self.earliest_finish[active] <= day))
+            if not finishing_mask.any():
+                break
+            finishing = active[finishing_mask]
+            self.active = active[~finishing_mask]
+            self.state[finishing] = self.DONE
+            self.actual_finish[finishing] = day
+            self.finished_today += len(finishing)
+            self.ready = np.concatenate([self.ready, self._release(finishing, day, "finish")])
+
+    def run(self, max_days=None):
+        """
+        Ejecuta la evolución completa y devuelve un DataFrame con una fila por día
+        (conteos por estado, % de avance ponderado por duración, costo acumulado y retrasos)
+        """
+        n = self.graph.num_tasks
+        if max_days is None:
+            # Margen amplio sobre el plan para absorber retrasos
+            max_days = int(self.planned_end.max() + 1) * 4 if n else 0
+        total_work = float(self.durations.sum()) or 1.0
+
+        columns = {name: np.zeros(max_days, dtype=np.float64 if "Costo" in name or "%" in name else np.int32)
+                   for name in ("Completadas", "En progreso", "No iniciadas", "% Avance Físico",
+                                "Costo Real Acumulado (USD)", "Días de Retraso Acumulados", "Tareas Atrasadas")}
+
+        done_count = 0
+        days = 0
+        for day in range(max_days):
+            self.step(day)
+            done_count += self.finished_today
+            late = np.count_nonzero(day > self.planned_end[self.active])
+
+            columns["Completadas"][day] = done_count
+            columns["En progreso"][day] = len(self.active)
+            columns["No iniciadas"][day] = n - done_count - len(self.active)
+            columns["% Avance Físico"][day] = self.total_progress / total_work * 100
+            columns["Costo Real Acumulado (USD)"][day] = self.total_cost
+            columns["Días de Retraso Acumulados"][day] = self.total_delay_days
+            columns["Tareas Atrasadas"][day] = late
+            days = day + 1
+
+            if done_count == n:
+                break
+
+        series = pd.DataFrame({name: values[:days] for name, values in columns.items()})
+        series.insert(0, "Día", np.arange(days, dtype=np.int32))
+        series.insert(1, "Fecha", pd.to_datetime(self.scheduler.project_start_date) + pd.to_timedelta(series["Día"], unit="D"))
+        return series
+
+    def task_history(self):
+        """Fechas reales de inicio y término, retrasos y costo por tarea tras la evolución"""
+        start = self.scheduler.project_start_date
+
+        def to_date(day):
+            return start + timedelta(days=int(day)) if day >= 0 else None
+
+        return pd.DataFrame({
+            "ID": self.graph.task_ids,
+            "Inicio Real": [to_date(d) for d in self.actual_start],
+            "Fin Real": [to_date(d) for d in self.actual_finish],
+            "Días de Retraso": self.delay_days,
+            "Desvío de Término (días)": np.where(self.actual_finish >= 0, self.actual_finish - self.planned_end, 0),
+            "Costo Real (USD)": self.actual_cost.round().astype(np.int64)
+        })
+
+
 # FUNCIONES AUXILIARES GLOBALES
 
-def generate_multiple_simulations(num_simulations=3):
+logger = logging.getLogger("simul")
+
+
+class SimulationEvents:
+    """
+    Flujo de eventos estructurados y por niveles del simulador
+
+    Cada evento es un diccionario {'event', 'level', 'time', ...campos, 'message'}. Se entrega a la
+    consola (solo el texto 'message', igual que los antiguos print), al logger "simul" y a los oyentes
+    registrados. Si ningún destino acepta el nivel, enabled() es False y no se construye nada.
+    """
+
+    def __init__(self, level=logging.INFO, console=True, use_logging=False):
+        self.level = level
+        self.console = console
+        self.use_logging = use_logging
+        self.listeners = []
+
+    def enabled(self, level=logging.INFO):
+        if level < self.level:
+            return False
+        return bool(self.console or self.listeners or (self.use_logging and logger.isEnabledFor(level)))
+
+    def emit(self, event, message=None, level=logging.INFO, **fields):
+        if not self.enabled(level):
+            return
+        record = {'event': event, 'level': logging.getLevelName(level), 'time': time.time(), **fields}
+        if message is not None:
+            record['message'] = message
+            if self.console:
+                print(message)
+        if self.use_logging:
+            logger.log(level, message if message is not None else event, extra={'simul_event': record})
+        for listener in self.listeners:
+            listener(record)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+
+# Flujo de eventos del módulo (configurable con configure_events)
+EVENTS = SimulationEvents()
+
+
+def configure_events(quiet=None, level=None, use_logging=None, listeners=None):
+    """
+    Configura EVENTS: quiet=True silencia la consola, level filtra por nivel (logging.WARNING o "warning"),
+    use_logging=True reenvía los eventos al logger "simul" y listeners reemplaza los oyentes
+    """
+    if quiet is not None:
+        EVENTS.console = not quiet
+    if level is not None:
+        if not isinstance(level, int):
+            # getLevelName devuelve el número para un nombre registrado y "Level X" si no lo conoce
+            resolved = logging.getLevelName(str(level).upper())
+            if not isinstance(resolved, int):
+                raise ValueError(f"Nivel de eventos desconocido: {level}")
+            level = resolved
+        EVENTS.level = level
+    if use_logging is not None:
+        EVENTS.use_logging = use_logging
+    if listeners is not None:
+        EVENTS.listeners = list(listeners)
+    return EVENTS
+
+
+class JsonLinesEventWriter:
+    """
+    Oyente que escribe cada evento como una línea JSON (para procesar la salida de campañas)
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'a', encoding='utf-8')
+
+    def __call__(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ProgressReporter:
+    """
+    Progreso con límite de frecuencia: emite un evento "progress" como máximo cada `min_interval`
+    segundos (y siempre al llegar al total)
+    """
+
+    def __init__(self, total=None, label="Progreso", min_interval=1.0, events=None):
+        self.total = total
+        self.label = label
+        self.min_interval = min_interval
+        self.events = events or EVENTS
+        self.count = 0
+        self._started = time.monotonic()
+        self._last = self._started
+
+    def update(self, n=1, **fields):
+        self.count += n
+        now = time.monotonic()
+        if now - self._last < self.min_interval and self.count != self.total:
+            return
+        self._last = now
+        if not self.events.enabled():
+            return
+
+        elapsed = now - self._started
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        total = f"/{self.total}" if self.total is not None else ""
+        self.events.emit("progress", f"⏳ {self.label}: {self.count}{total} ({rate:.1f}/s)",
+                         label=self.label, count=self.count, total=self.total,
+                         elapsed_s=round(elapsed, 3), rate_per_s=round(rate, 3), **fields)
+
+
+def deep_getsizeof(obj):
+    """
+    Tamaño profundo aproximado (bytes) de contenedores de Python: cuenta cada objeto una sola vez
+    Para los arreglos NumPy sys.getsizeof ya incluye los datos propios; una vista no los incluye,
+    así que se recorre su arreglo base (contado una sola vez aunque lo compartan varias vistas)
+    """
+    seen = set()
+    total = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                pending.append(item.base)
+        elif isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        elif isinstance(item, TaskRecord):
+            pending.extend(getattr(item, attribute) for attribute in item.__slots__ if hasattr(item, attribute))
+    return total
+
+
+def memory_snapshot(count_objects=False):
+    """
+    Estado de memoria del proceso: schedulers vivos, memoria trazada por tracemalloc (si está activo)
+    y, opcionalmente, conteo de DataFrames y grafos retenidos (recorre el heap, usar con muestreo)
+    """
+    snapshot = {'live_schedulers': len(ImprovedMiningScheduler._live_instances)}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot['traced_current_bytes'] = current
+        snapshot['traced_peak_bytes'] = peak
+    if count_objects:
+        counts = {'DataFrame': 0, 'DependencyGraph': 0, 'ImprovedMiningScheduler': 0}
+        for item in gc.get_objects():
+            name = type(item).__name__
+            if name in counts:
+                counts[name] += 1
+        snapshot['retained_objects'] = counts
+    return snapshot
+
+
+def build_simulation_record(scheduler, df=None):
+    """
+    Resume una simulación en un registro plano con valores numéricos
+    (apto para agregadores, archivos CSV o bases de datos)
+    """
+    if df is None:
+        df = scheduler.create_dataframe()
+
+    config = scheduler.simulation_config
+    delays = df["Días de Retraso"]
+    real_costs = pd.to_numeric(df["Costo Real (USD)"], errors='coerce')
+
+    # Fin planificado y pronosticado del proyecto (días desde el inicio)
+    task_array = scheduler.task_array()
+    current_day = (scheduler.current_date - scheduler.project_start_date).days
+    _, forecast_finish = forecast_dates(scheduler.get_dependency_graph(), task_array, [current_day])
+    planned_finish = task_array[:, TASK_ARRAY_FIELDS.index("Fin Planificado (día)")]
+
+    return {
+        'simulation_id': scheduler.simulation_id,
+        'profile_name': config['profile_name'],
+        'network_style': config['network_style'],
+        'buffer_strategy': config['buffer_strategy'],
+        'total_tasks': len(df),
+        'completed': int(df["Estado"].str.contains("Completada", na=False).sum()),
+        'in_progress': int(df["Estado"].str.contains("En progreso", na=False).sum()),
+        'not_started': int((df["Estado"] == "No iniciada").sum()),
+        'avg_progress': float(df["% Avance Físico"].mean()),
+        'delayed_tasks': int((delays > 0).sum()),
+        'total_delay_days': int(delays[delays > 0].sum()),
+        'max_delay_days': int(delays.max()) if len(df) > 0 and delays.max() > 0 else 0,
+        'total_buffer_days': int(df["Buffer sugerido (días)"].sum()),
+        'planned_cost': float(df["Costo Planificado (USD)"].sum()),
+        'actual_cost': float(real_costs.sum()),
+        'planned_finish_day': int(planned_finish.max()) if len(df) > 0 else 0,
+        'forecast_finish_day': int(forecast_finish.max()) if len(df) > 0 else 0,
+    }
+
+
+class P2Quantile:
+    """
+    Estimador de cuantiles en streaming con memoria constante (algoritmo P² de Jain y Chlamtac)
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self._initial = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        self.count += 1
+
+        # Las primeras 5 observaciones inicializan los marcadores
+        if self._heights is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._initial.sort()
+                self._heights = list(self._initial)
+                self._positions = [0, 1, 2, 3, 4]
+                self._desired = [0.0, 2 * self.p, 4 * self.p, 2 + 2 * self.p, 4.0]
+            return
+
+        q, n = self._heights, self._positions
+
+        # Ubicar la celda de la nueva observación
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Ajustar marcadores intermedios
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    # Interpolación lineal si la parabólica se sale del rango
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def value(self):
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        return float(np.quantile(self._initial, self.p))
+
+
+class RunningStats:
+    """
+    Media, varianza, mínimo, máximo y cuantiles acumulados sin guardar las observaciones
+    """
+
+    def __init__(self, quantiles=(0.5, 0.8, 0.95)):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, x):
+        # Algoritmo de Welford para media y varianza
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        summary = {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.variance ** 0.5,
+            'min': self.min,
+            'max': self.max,
+        }
+        for q, estimator in self.quantiles.items():
+            summary[f"p{int(round(q * 100))}"] = estimator.value()
+        return summary
+
+
+class SimulationSink:
+    """
+    Destino enchufable para simulaciones producidas por iterate_simulations
+    """
+
+    def consume(self, simulation):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def checkpoint_state(self):
+        """Estado serializable que guarda CampaignCheckpoint (por defecto, los atributos del sink)"""
+        return dict(vars(self))
+
+    def restore_state(self, state):
+        """Restituye el estado guardado por checkpoint_state al reanudar una campaña"""
+        vars(self).update(state)
+
+
+class RunningAggregateSink(SimulationSink):
+    """
+    Agrega métricas de la campaña en memoria constante: medias, cuantiles y conteos por perfil
+    """
+
+    DEFAULT_METRICS = ('total_delay_days', 'max_delay_days', 'avg_progress',
+                       'actual_cost', 'total_buffer_days', 'delayed_tasks')
+
+    def __init__(self, metrics=DEFAULT_METRICS, quantiles=(0.5, 0.8, 0.95)):
+        self.metrics = tuple(metrics)
+        self.quantiles = tuple(quantiles)
+        self.count = 0
+        self.profile_counts = {}
+        self.stats = {metric: RunningStats(self.quantiles) for metric in self.metrics}
+        self.profile_stats = {}
+
+    def consume(self, simulation):
+        record = simulation['record']
+        profile = record['profile_name']
+
+        self.count += 1
+        self.profile_counts[profile] = self.profile_counts.get(profile, 0) + 1
+
+        if profile not in self.profile_stats:
+            self.profile_stats[profile] = {metric: RunningStats(()) for metric in self.metrics}
+
+        for metric in self.metrics:
+            value = record[metric]
+            self.stats[metric].add(value)
+            self.profile_stats[profile][metric].add(value)
+
+    def summary(self):
+        return {
+            'simulations': self.count,
+            'profile_counts': dict(self.profile_counts),
+            'metrics': {metric: stats.to_dict() for metric, stats in self.stats.items()},
+            'profile_means': {
+                profile: {metric: stats.mean for metric, stats in metrics.items()}
+                for profile, metrics in self.profile_stats.items()
+            },
+        }
+
+
+class ConvergenceMonitor(SimulationSink):
+    """
+    Sigue las estimaciones de la campaña con intervalos de confianza y decide cuándo detenerla
+
+    Cada objetivo es (métrica del registro, cuantil) o (métrica, None) para la media. Las medias usan
+    el intervalo normal z·s/√n; los cuantiles, el intervalo de rangos binomial sobre los valores
+    observados (8 bytes por simulación). La campaña converge cuando la semiamplitud de todos los
+    intervalos es menor que `tolerance` veces la estimación (o que `absolute_tolerance[objetivo]`).
+    """
+
+    DEFAULT_TARGETS = {
+        "P50 fin (día)": ('forecast_finish_day', 0.5),
+        "P80 fin (día)": ('forecast_finish_day', 0.8),
+        "Retraso total medio (días)": ('total_delay_days', None),
+        "Costo real medio (USD)": ('actual_cost', None)
+    }
+
+    def __init__(self, targets=None, tolerance=0.02, confidence=0.95, min_simulations=30,
+                 check_every=10, absolute_tolerance=None):
+        self.targets = dict(targets or self.DEFAULT_TARGETS)
+        self.tolerance = tolerance
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.min_simulations = min_simulations
+        self.check_every = check_every
+        self.absolute_tolerance = dict(absolute_tolerance or {})
+        self.count = 0
+        self.stats = {}
+        self.values = {}
+        for metric, quantile in self.targets.values():
+            if quantile is None:
+                self.stats.setdefault(metric, RunningStats(()))
+            else:
+                self.values.setdefault(metric, [])
+        self._diagnostics = None
+
+    def consume(self, simulation):
+        record = simulation['record']
+        self.count += 1
+        for metric, stats in self.stats.items():
+            stats.add(record[metric])
+        for metric, values in self.values.items():
+            values.append(record[metric])
+        self._diagnostics = None
+
+    def _interval(self, metric, quantile):
+        if quantile is None:
+            stats = self.stats[metric]
+            half_width = self.z * (stats.variance / stats.count) ** 0.5 if stats.count > 1 else float('inf')
+            return stats.mean, stats.mean - half_width, stats.mean + half_width
+
+        values = np.sort(np.asarray(self.values[metric], dtype=np.float64))
+        n = len(values)
+        spread = self.z * (n * quantile * (1 - quantile)) ** 0.5
+        low = int(np.floor(n * quantile - spread))
+        high = int(np.ceil(n * quantile + spread))
+        if low < 0 or high >= n:
+            return float(np.quantile(values, quantile)), float('-inf'), float('inf')
+        return float(np.quantile(values, quantile)), float(values[low]), float(values[high])
+
+    def diagnostics(self):
+        """
+        Estimación, intervalo, semiamplitud y convergencia por objetivo, más una proyección
+        de las simulaciones necesarias para alcanzar la tolerancia
+        """
+        if self._diagnostics is not None:
+            return self._diagnostics
+
+        targets = {}
+        needed = self.count
+        for name, (metric, quantile) in self.targets.items():
+            if self.count == 0:
+                estimate, low, high = float('nan'), float('-inf'), float('inf')
+            else:
+                estimate, low, high = self._interval(metric, quantile)
+            half_width = (high - low) / 2
+            limit = self.absolute_tolerance.get(name, self.tolerance * abs(estimate))
+            converged = self.count >= self.min_simulations and half_width <= limit
+            if np.isfinite(half_width) and limit > 0:
+                # La semiamplitud decrece como 1/√n
+                needed = max(needed, int(np.ceil(self.count * (half_width / limit) ** 2)))
+            else:
+                needed = max(needed, self.min_simulations)
+            targets[name] = {
+                'estimate': estimate,
+                'ci_low': low,
+                'ci_high': high,
+                'half_width': half_width,
+                'tolerance': limit,
+                'converged': converged
+            }
+
+        self._diagnostics = {
+            'simulations': self.count,
+            'confidence': self.confidence,
+            'converged': self.count >= self.min_simulations and all(t['converged'] for t in targets.values()),
+            'estimated_simulations_needed': max(needed, self.min_simulations),
+            'targets': targets
+        }
+        return self._diagnostics
+
+    def converged(self):
+        """True cuando todos los intervalos están dentro de la tolerancia (se evalúa cada check_every)"""
+        if self.count < self.min_simulations or self.count % self.check_every:
+            return False
+        return self.diagnostics()['converged']
+
+
+class MemoryReportSink(SimulationSink):
+    """
+    Escribe el reporte de memoria de una de cada `sample_every` simulaciones como líneas JSON
+    Con trace=True activa tracemalloc durante la campaña para medir picos por etapa (más lento)
+    """
+
+    def __init__(self, filename, sample_every=100, trace=False, count_objects=False):
+        self.filename = filename
+        self.sample_every = sample_every
+        self.count_objects = count_objects
+        self.count = 0
+        self.max_dataframe_bytes = 0
+        self.max_column_bytes = {}
+        self._file = None
+        self._started_tracing = trace and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def consume(self, simulation):
+        self.count += 1
+        if (self.count - 1) % self.sample_every:
+            return
+
+        report = simulation['scheduler'].memory_report(simulation.get('df'))
+        report['simulation_index'] = self.count
+        report['process'] = memory_snapshot(self.count_objects)
+        if self._file is None:
+            self._file = open(self.filename, 'w', encoding='utf-8')
+        self._file.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+        self.max_dataframe_bytes = max(self.max_dataframe_bytes, report['dataframe_bytes'])
+        for column, size in report['column_bytes'].items():
+            self.max_column_bytes[column] = max(self.max_column_bytes.get(column, 0), size)
+
+    def summary(self):
+        """Máximos observados en las simulaciones muestreadas, columnas de mayor a menor"""
+        return {
+            'simulations': self.count,
+            'max_dataframe_bytes': self.max_dataframe_bytes,
+            'max_column_bytes': dict(sorted(self.max_column_bytes.items(), key=lambda item: -item[1])),
+            'process': memory_snapshot()
+        }
+
+    def checkpoint_state(self):
+        return _file_sink_state(self)
+
+    def restore_state(self, state):
+        _restore_file_sink(self, state)
+        if self._started_tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def close(self):
+        if self._file is None:
+            self._file = open(self.filename, 'w', encoding='utf-8')
+        if not self._file.closed:
+            self._file.close()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class CostSCurveSink(SimulationSink):
+    """
+    Acumula las curvas S de costo de una campaña y entrega bandas de percentiles por día (y fase)
+    Las tareas se procesan por lotes de `batch_size` simulaciones en una sola llamada a cost_s_curves.
+    Se conserva una muestra de reservorio de a lo más `reservoir_size` simulaciones (algoritmo R), así la
+    memoria no crece con la campaña; hasta ese tamaño las bandas son exactas.
+    """
+
+    def __init__(self, percentiles=(10, 50, 90), by_phase=False, batch_size=256, reservoir_size=1000, seed=None):
+        self.percentiles = tuple(percentiles)
+        self.by_phase = by_phase
+        self.batch_size = batch_size
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.phases = {}
+        self.planned = []
+        self.actual = []
+        self._pending = []
+        self._rng = np.random.default_rng(seed)
+
+    def consume(self, simulation):
+        self.add(simulation['scheduler'])
+
+    def add(self, scheduler):
+        codes = [self.phases.setdefault(task.phase, len(self.phases)) for task in scheduler.tasks]
+        current_day = (scheduler.current_date - scheduler.project_start_date).days
+        self._pending.append((scheduler.task_array(), np.array(codes, dtype=np.int64), current_day))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        num_tasks = max(len(codes) for _, codes, _ in self._pending)
+        arrays = np.full((len(self._pending), num_tasks, len(TASK_ARRAY_FIELDS)), np.nan)
+        phase_codes = np.zeros((len(self._pending), num_tasks), dtype=np.int64)
+        for i, (array, codes, _) in enumerate(self._pending):
+            arrays[i, :len(codes)] = array
+            phase_codes[i, :len(codes)] = codes
+        current_days = [day for _, _, day in self._pending]
+
+        curves = cost_s_curves(arrays, phase_codes, max(len(self.phases), 1), current_days)
+        planned, actual = curves['planned'], curves['actual']
+        if not self.by_phase:
+            planned, actual = planned.sum(axis=1, keepdims=True), actual.sum(axis=1, keepdims=True)
+
+        for planned_curve, actual_curve in zip(planned, actual):
+            # Copias: una vista retendría el arreglo completo del lote
+            self.count += 1
+            if len(self.planned) < self.reservoir_size:
+                self.planned.append(planned_curve.copy())
+                self.actual.append(actual_curve.copy())
+            else:
+                slot = self._rng.integers(self.count)
+                if slot < self.reservoir_size:
+                    self.planned[slot] = planned_curve.copy()
+                    self.actual[slot] = actual_curve.copy()
+        self._pending = []
+
+    def bands(self):
+        """
+        Devuelve {'planned', 'actual'}: arreglos (percentiles, fases, días) con las bandas de la campaña
+        """
+        self._flush()
+        if not self.planned:
+            return None
+        horizon = max(curve.shape[-1] for curve in self.planned + self.actual)
+        num_phases = max(curve.shape[0] for curve in self.planned)
+
+        def stacked(curves):
+            # Las fases vistas después de un lote se completan con ceros en los lotes anteriores
+            return [np.pad(curve, [(0, num_phases - curve.shape[0]), (0, 0)]) for curve in curves]
+
+        return {
+            'planned': s_curve_percentiles(stacked(self.planned), self.percentiles, horizon),
+            'actual': s_curve_percentiles(stacked(self.actual), self.percentiles, horizon)
+        }
+
+    def summary(self):
+        """
+        DataFrame con una fila por día (y fase) y las columnas Planificado/Real P<percentil> (USD)
+        """
+        bands = self.bands()
+        if bands is None:
+            return pd.DataFrame()
+
+        phases = list(self.phases) if self.by_phase else [None]
+        horizon = bands['planned'].shape[-1]
+        frames = []
+        for i, phase in enumerate(phases):
+            frame = pd.DataFrame({'Día': np.arange(horizon)})
+            if self.by_phase:
+                frame['Fase'] = phase
+            for label, key in (("Planificado", 'planned'), ("Real", 'actual')):
+                for j, percentile in enumerate(self.percentiles):
+                    frame[f"{label} P{percentile:g} (USD)"] = bands[key][j, i]
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+
+class CSVRecordSink(SimulationSink):
+    """
+    Escribe un registro por simulación en un archivo CSV a medida que se generan
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.fieldnames = None
+        self._file = None
+        self._writer = None
+
+    def consume(self, simulation):
+        record = simulation['record']
+        if self._file is None:
+            self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+        if self._writer is None:
+            self.fieldnames = list(record.keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+        self._writer.writerow(record)
+
+    def checkpoint_state(self):
+        return _file_sink_state(self)
+
+    def restore_state(self, state):
+        _restore_file_sink(self, state)
+        if self.fieldnames is not None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+
+    def close(self):
+        if self._file is None:
+            self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+        if not self._file.closed:
+            self._file.close()
+
+
+class ExcelExportSink(SimulationSink):
+    """
+    Exporta cada simulación a su propio archivo Excel en un directorio
+    """
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        self.filenames = []
+        os.makedirs(directory, exist_ok=True)
+
+    def consume(self, simulation):
+        scheduler = simulation['scheduler']
+        filename = os.path.join(self.directory, f"cronograma_{scheduler.simulation_id}.xlsx")
+        self.filenames.append(scheduler.export_to_excel(filename))
+
+
+class ScenarioSampler:
+    """
+    Muestreo con reducción de varianza para campañas Monte Carlo, reproducible desde una semilla
+
+    Cada simulación k recibe un punto de [0, 1)^d (sample_point) que fija el perfil, los porcentajes
+    de avance, la red, la estrategia de buffer y, por tarea, la variación de estado, la magnitud del
+    adelanto/retraso y la variación de costo. El resto de los sorteos usa la semilla propia de la simulación.
+
+    Estrategias:
+    - "random": sin estratificar (solo semillas reproducibles)
+    - "lhs": hipercubo latino por bloques; con `num_simulations` el bloque cubre la campaña planificada
+      (repartida en bloques iguales de hasta LHS_MAX_BLOCK), sin él se usan bloques de 256
+    - "lattice": red de rango 1 extensible en base 2 con desplazamiento aleatorio; cada prefijo de la
+      campaña queda estratificado en cada dimensión (apta para campañas que se detienen por convergencia)
+    - "sobol": Sobol aleatorizado (requiere scipy; sin scipy se usa "lattice")
+    - "antithetic": pares (u, 1 - u) que comparten semilla
+    """
+
+    STRATEGIES = ("random", "lhs", "lattice", "sobol", "antithetic")
+    LHS_MAX_BLOCK = 4096
+
+    def __init__(self, strategy="lhs", num_tasks=50, seed=None, block_size=None, num_simulations=None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia de muestreo desconocida: {strategy}")
+        self.strategy = strategy
+        self.dimensions = SAMPLED_DIMENSIONS + TASK_SAMPLED_DIMENSIONS * num_tasks
+        # Sobol se consume en bloques de potencia de 2; el bloque LHS sigue a la campaña planificada
+        planned = num_simulations if strategy == "lhs" else None
+        self.block_size = block_size or self.lhs_block_size(planned)
+        # Sin tamaño explícito, iterate_simulations ajusta el bloque LHS a la campaña (ver plan)
+        self._auto_block = strategy == "lhs" and block_size is None and num_simulations is None
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
+        self._block_index = None
+        self._block = None
+        self._sobol = None
+
+        if strategy == "sobol" and not SCIPY_AVAILABLE:
+            EVENTS.emit("sampler_fallback", "⚠️ scipy no está instalado. Se usará muestreo 'lattice' en lugar de 'sobol'.",
+                        level=logging.WARNING, requested="sobol", strategy="lattice")
+            self.strategy = "lattice"
+        elif strategy == "sobol":
+            self._sobol = qmc.Sobol(self.dimensions, scramble=True, seed=self.rng)
+
+        if self.strategy == "lattice":
+            # Vector generador impar (32 bits) y desplazamiento aleatorio por dimensión
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(0, 2)))
+            self._lattice_vector = rng.integers(0, 2 ** 31, self.dimensions, dtype=np.uint64) * 2 + 1
+            self._lattice_shift = rng.random(self.dimensions)
+
+    @classmethod
+    def lhs_block_size(cls, num_simulations=None):
+        """Tamaño de bloque LHS: la campaña planificada en bloques iguales de hasta LHS_MAX_BLOCK"""
+        if not num_simulations:
+            return 256
+        blocks = -(-num_simulations // cls.LHS_MAX_BLOCK)
+        return -(-num_simulations // blocks)
+
+    def plan(self, num_simulations):
+        """Ajusta el bloque LHS al número de simulaciones planificadas (si no se fijó al crear el muestreador)"""
+        if self._auto_block and num_simulations:
+            self.block_size = self.lhs_block_size(num_simulations)
+            self._block_index = None
+            self._block = None
+        self._auto_block = False
+
+    def seed_for(self, k):
+        """Semilla de la simulación k (los pares antitéticos comparten semilla)"""
+        if self.strategy == "antithetic":
+            k //= 2
+        return int(np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(k,)).generate_state(1)[0])
+
+    def point(self, k):
+        """Punto de [0, 1)^d de la simulación k (None con la estrategia "random")"""
+        if self.strategy == "random":
+            return None
+        if self.strategy == "antithetic":
+            u = np.random.default_rng(self.seed_for(k) + 1).random(self.dimensions)
+            return u if k % 2 == 0 else 1.0 - u
+        if self.strategy == "lattice":
+            # Índice con bits invertidos (van der Corput): los primeros 2^m puntos forman una red completa
+            reversed_k = np.uint64(int(f"{k:032b}"[::-1], 2))
+            u = ((reversed_k * self._lattice_vector) & np.uint64(0xFFFFFFFF)) / 2.0 ** 32
+            return (u + self._lattice_shift) % 1.0
+
+        block_index = k // self.block_size
+        if block_index != self._block_index:
+            self._block = self._next_block(block_index)
+            self._block_index = block_index
+        return self._block[k % self.block_size]
+
+    def _next_block(self, block_index):
+        if self.strategy == "sobol":
+            # La secuencia de Sobol se consume en orden; un bloque fuera de secuencia (por ejemplo
+            # el primero de un shard) reposiciona el generador
+            position = block_index * self.block_size
+            if self._sobol.num_generated != position:
+                self._sobol.reset()
+                self._sobol.fast_forward(position)
+            return self._sobol.random(self.block_size)
+        # Hipercubo latino: una muestra por estrato y dimensión, con estratos permutados
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(block_index, 1)))
+        strata = rng.permuted(np.tile(np.arange(self.block_size), (self.dimensions, 1)), axis=1).T
+        return (strata + rng.random((self.block_size, self.dimensions))) / self.block_size
+
+    def scheduler_kwargs(self, k):
+        """Argumentos de ImprovedMiningScheduler para la simulación k"""
+        return {'seed': self.seed_for(k), 'sample_point': self.point(k)}
+
+
+def _file_sink_state(sink):
+    """
+    Estado de un sink que escribe a un archivo: sus atributos más el tamaño ya escrito (sin el manejador)
+    """
+    state = {name: value for name, value in vars(sink).items() if name not in ('_file', '_writer')}
+    state['_offset'] = None
+    if sink._file is not None and not sink._file.closed:
+        sink._file.flush()
+        state['_offset'] = os.fstat(sink._file.fileno()).st_size
+    return state
+
+
+def _restore_file_sink(sink, state):
+    """
+    Reabre el archivo del sink y descarta lo escrito después del checkpoint
+    """
+    state = dict(state)
+    offset = state.pop('_offset')
+    if sink._file is not None and not sink._file.closed:
+        sink._file.close()
+    vars(sink).update(state)
+    sink._file = None
+    if offset is not None:
+        sink._file = open(sink.filename, 'r+', newline='', encoding='utf-8')
+        sink._file.truncate(offset)
+        sink._file.seek(offset)
+
+
+class CampaignCheckpoint:
+    """
+    Checkpoint periódico de una campaña de iterate_simulations para reanudarla tras una caída
+
+    Cada `every` simulaciones se escribe en `directory`:
+        batch-NNNNN.pkl   registros (o simulaciones completas con keep_simulations) del último tramo
+        state.pkl         simulaciones generadas, estado de random y numpy.random, estado de los sinks
+                          (agregados, monitor de convergencia, posición en sus archivos) y la fecha de referencia
+    state.pkl se reemplaza de forma atómica después de escribir el lote, así que siempre describe
+    lotes completos. La fecha de evaluación de todas las simulaciones queda fijada en `reference_date`
+    para que una campaña reanudada dé exactamente los mismos resultados que una sin interrupciones
+    (por defecto, el momento en que se inicia la campaña).
+    """
+
+    def __init__(self, directory, every=100, keep_simulations=False, reference_date=None):
+        self.directory = directory
+        self.every = every
+        self.keep_simulations = keep_simulations
+        self.generated = 0
+        self.batches = 0
+        self.reference_date = reference_date
+        self._pending = []
+
+    @property
+    def state_path(self):
+        return os.path.join(self.directory, "state.pkl")
+
+    def _batch_path(self, batch):
+        return os.path.join(self.directory, f"batch-{batch:05d}.pkl")
+
+    def exists(self):
+        return os.path.exists(self.state_path)
+
+    def start(self, sinks, sampler=None):
+        """Inicia una campaña nueva (descarta un checkpoint anterior en el mismo directorio)"""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name == "state.pkl" or (name.startswith("batch-") and name.endswith(".pkl")):
+                os.remove(os.path.join(self.directory, name))
+        self.generated = 0
+        self.batches = 0
+        self.reference_date = self.reference_date or datetime.now()
+        self._pending = []
+        self._sampler_key = self._sampler_signature(sampler)
+        self.save(0, sinks)
+
+    def restore(self, sinks, sampler=None):
+        """
+        Restituye el estado guardado: generadores aleatorios y sinks (en el mismo orden)
+        Devuelve el número de simulaciones ya generadas
+        """
+        state = self.load_state()
+        if state['sampler'] != self._sampler_signature(sampler):
+            raise ValueError("El muestreador no coincide con el de la campaña guardada en el checkpoint")
+        if len(state['sinks']) != len(sinks):
+            raise ValueError(f"El checkpoint tiene {len(state['sinks'])} sinks y se entregaron {len(sinks)}")
+
+        random.setstate(state['random_state'])
+        np.random.set_state(state['numpy_state'])
+        for sink, sink_state in zip(sinks, state['sinks']):
+            sink.restore_state(sink_state)
+
+        # Lotes escritos después del último state.pkl (la caída ocurrió antes de reemplazarlo)
+        batch = self.batches
+        while os.path.exists(self._batch_path(batch)):
+            os.remove(self._batch_path(batch))
+            batch += 1
+        return self.generated
+
+    def load_state(self):
+        """Lee state.pkl (sin tocar generadores ni sinks) y actualiza el avance guardado"""
+        with open(self.state_path, "rb") as file:
+            state = pickle.load(file)
+        self.generated = state['generated']
+        self.batches = state['batches']
+        self.reference_date = state['reference_date']
+        self._sampler_key = state['sampler']
+        self._pending = []
+        return state
+
+    @staticmethod
+    def _sampler_signature(sampler):
+        if sampler is None:
+            return None
+        return (sampler.strategy, sampler.seed_sequence.entropy, sampler.block_size, sampler.dimensions)
+
+    def record(self, simulation):
+        """Registra una simulación completada (consumida por los sinks)"""
+        self._pending.append(simulation if self.keep_simulations else simulation['record'])
+
+    def due(self, generated):
+        return generated - self.generated >= self.every
+
+    def save(self, generated, sinks):
+        """Escribe el lote pendiente y luego, de forma atómica, el estado de la campaña"""
+        if self._pending:
+            with open(self._batch_path(self.batches), "wb") as file:
+                pickle.dump(self._pending, file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.batches += 1
+            self._pending = []
+
+        state = {
+            'version': 1,
+            'generated': generated,
+            'batches': self.batches,
+            'reference_date': self.reference_date,
+            'sampler': self._sampler_key,
+            'random_state': random.getstate(),
+            'numpy_state': np.random.get_state(),
+            'sinks': [sink.checkpoint_state() for sink in sinks]
+        }
+        temporary = f"{self.state_path}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.state_path)
+        self.generated = generated
+        EVENTS.emit("checkpoint_saved", level=logging.DEBUG, directory=self.directory,
+                    generated=generated, batches=self.batches)
+
+    def _saved_items(self):
+        for batch in range(self.batches):
+            with open(self._batch_path(batch), "rb") as file:
+                yield from pickle.load(file)
+
+    def records(self):
+        """DataFrame con los registros de todas las simulaciones guardadas"""
+        return pd.DataFrame([item['record'] if self.keep_simulations else item for item in self._saved_items()])
+
+    def simulations(self):
+        """Simulaciones completas guardadas (requiere keep_simulations=True)"""
+        if not self.keep_simulations:
+            raise ValueError("El checkpoint guarda solo registros; use keep_simulations=True")
+        return list(self._saved_items())
+
+
+def iterate_simulations(num_simulations=None, batch_size=None, sinks=None,
+                        scheduler_factory=None, quarantine=None, convergence=None, sampler=None, start=0,
+                        checkpoint=None, resume=False):
+    """
+    Genera simulaciones de forma perezosa (una a una o por lotes) con memoria acotada
+
+    Cada simulación se entrega como {'scheduler', 'metrics', 'df', 'record'} y se pasa
+    antes a los sinks configurados. Si num_simulations es None el generador no termina.
+    Mientras el consumidor no retenga los resultados, la memoria permanece constante.
+    Si se entrega una lista `quarantine`, cada simulación se valida con validate_schedules y las
+    incoherentes se agregan a esa lista (con sus 'violations') en lugar de entregarse a los sinks.
+    Con un ConvergenceMonitor en `convergence` la campaña se detiene en cuanto sus intervalos
+    convergen; num_simulations pasa a ser el máximo.
+    Con un ScenarioSampler cada simulación recibe su semilla y su punto de muestreo estratificado;
+    `start` es el índice de muestreo de la primera simulación (para ejecutar un tramo de la campaña).
+    Con un CampaignCheckpoint se guarda el avance cada `checkpoint.every` simulaciones; con resume=True
+    (y un checkpoint existente) la campaña continúa desde allí con los mismos sinks, ya restituidos,
+    y entrega solo las simulaciones restantes.
+    """
+    sinks = list(sinks or [])
+    if convergence is not None:
+        sinks.append(convergence)
+    if sampler is not None:
+        sampler.plan(num_simulations)
+    batch = []
+    generated = 0
+
+    if checkpoint is not None:
+        if resume and checkpoint.exists():
+            generated = checkpoint.restore(sinks, sampler)
+            EVENTS.emit("campaign_resumed", f"♻️ Reanudando la campaña desde la simulación {generated + 1}",
+                        directory=checkpoint.directory, generated=generated)
+        else:
+            checkpoint.start(sinks, sampler)
+        if scheduler_factory is None:
+            scheduler_factory = functools.partial(ImprovedMiningScheduler, current_date=checkpoint.reference_date)
+    scheduler_factory = scheduler_factory or ImprovedMiningScheduler
+
+    try:
+        while num_simulations is None or generated < num_simulations:
+            started = time.perf_counter()
+            scheduler = scheduler_factory(**(sampler.scheduler_kwargs(start + generated) if sampler else {}))
+            scheduler.generate_coherent_tasks()
+
+            if quarantine is not None:
+                violations = scheduler.validate_coherence()
+                if any(violations.values()):
+                    quarantine.append({'scheduler': scheduler, 'violations': violations})
+                    generated += 1
+                    continue
+
+            df = scheduler.create_dataframe()
+            scheduler._memory_checkpoint("dataframe")
+            simulation = {
+                'scheduler': scheduler,
+                'metrics': scheduler.generate_summary_metrics(df),
+                'df': df,
+                'record': build_simulation_record(scheduler, df)
+            }
+            scheduler._memory_checkpoint("metricas")
+            generated += 1
+
+            if EVENTS.enabled(logging.DEBUG):
+                record = simulation['record']
+                EVENTS.emit("simulation_generated", level=logging.DEBUG,
+                            index=generated, simulation_id=record['simulation_id'],
+                            profile=record['profile_name'], network_style=record['network_style'],
+                            buffer_strategy=record['buffer_strategy'],
+                            duration_s=round(time.perf_counter() - started, 6),
+                            tasks=record['total_tasks'], completed=record['completed'],
+                            in_progress=record['in_progress'], not_started=record['not_started'],
+                            total_delay_days=record['total_delay_days'])
+
+            for sink in sinks:
+                sink.consume(simulation)
+
+            if checkpoint is not None:
+                checkpoint.record(simulation)
+                if checkpoint.due(generated):
+                    checkpoint.save(generated, sinks)
+
+            if batch_size is None:
+                yield simulation
+            else:
+                batch.append(simulation)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if convergence is not None and convergence.converged():
+                break
+
+        if checkpoint is not None:
+            checkpoint.save(generated, sinks)
+
+        if batch:
+            yield batch
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
+def generate_multiple_simulations(num_simulations=3, memory_report_path=None, checkpoint_path=None,
+                                  checkpoint_every=100, resume=False):
     """
     Genera múltiples simulaciones con configuraciones diferentes
+    Con memory_report_path se escribe el reporte de memoria de cada simulación (líneas JSON)
+    Con checkpoint_path las simulaciones se guardan cada `checkpoint_every`; resume=True continúa una
+    campaña interrumpida y devuelve la lista completa (las guardadas más las nuevas)
     """
     simulations = []
+    sinks = [MemoryReportSink(memory_report_path, sample_every=1)] if memory_report_path else None
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = CampaignCheckpoint(checkpoint_path, every=checkpoint_every, keep_simulations=True)
+
+    EVENTS.emit("campaign_started", "🎲 GENERANDO MÚLTIPLES SIMULACIONES\n" + "="*60,
+                num_simulations=num_simulations)
+
+    if resume and checkpoint is not None and checkpoint.exists():
+        checkpoint.load_state()
+        simulations = checkpoint.simulations()
+
+    iterator = iterate_simulations(num_simulations, sinks=sinks, checkpoint=checkpoint, resume=resume)
+    for i, simulation in enumerate(iterator, len(simulations)):
+        if EVENTS.enabled():
+            scheduler = simulation['scheduler']
+            metrics = simulation['metrics']
+
+            # Resumen de la simulación
+            EVENTS.emit(
+                "simulation_summary",
+                f"\n📊 Simulación {i+1}/{num_simulations}\n" + "-"*40 + "\n"
+                f"ID: {scheduler.simulation_id}\n"
+                f"Perfil: {scheduler.simulation_config['profile_name']}\n"
+                f"Red: {scheduler.simulation_config['network_style']}\n"
+                f"Completadas: {metrics['✅ Completadas']}\n"
+                f"En progreso: {metrics['🔄 En progreso']}\n"
+                f"No iniciadas: {metrics['⏳ No iniciadas']}",
+                index=i + 1, simulation_id=scheduler.simulation_id,
+                profile=scheduler.simulation_config['profile_name'],
+                network_style=scheduler.simulation_config['network_style'],
+                completed=metrics['✅ Completadas'], in_progress=metrics['🔄 En progreso'],
+                not_started=metrics['⏳ No iniciadas']
+            )
 
-    print("🎲 GENERANDO MÚLTIPLES SIMULACIONES")
-    print("="*60)
+        simulations.append(simulation)
 
-    for i in range(num_simulations):
-        print(f"\n📊 Simulación {i+1}/{num_simulations}")
-        print("-"*40)
+    return simulations
+
+
+def run_until_converged(max_simulations=10000, tolerance=0.02, confidence=0.95, min_simulations=30,
+                        sinks=None, targets=None, sampler=None):
+    """
+    Ejecuta una campaña Monte Carlo hasta que P50/P80 de fin, retraso total y costo real convergen
+    (o hasta max_simulations) y devuelve el diagnóstico de convergencia
+    Con un ScenarioSampler "lattice" (estratificado en cada prefijo) la convergencia suele llegar con menos simulaciones
+    """
+    monitor = ConvergenceMonitor(targets=targets, tolerance=tolerance, confidence=confidence,
+                                 min_simulations=min_simulations)
+
+    EVENTS.emit("convergence_campaign_started", "🎯 CAMPAÑA CON PARADA POR CONVERGENCIA\n" + "="*60,
+                max_simulations=max_simulations, tolerance=tolerance, confidence=confidence)
+
+    progress = ProgressReporter(max_simulations, label="Simulaciones")
+    for _ in iterate_simulations(max_simulations, sinks=sinks, convergence=monitor, sampler=sampler):
+        progress.update()
+
+    diagnostics = monitor.diagnostics()
+    for name, target in diagnostics['targets'].items():
+        status = "✅" if target['converged'] else "⏳"
+        EVENTS.emit("convergence_target",
+                    f"{status} {name}: {target['estimate']:,.1f} "
+                    f"[{target['ci_low']:,.1f} - {target['ci_high']:,.1f}] ± {target['half_width']:,.1f}",
+                    target=name, **target)
+
+    if diagnostics['converged']:
+        EVENTS.emit("convergence_result", f"\n✅ Convergencia alcanzada con {diagnostics['simulations']} simulaciones",
+                    converged=True, simulations=diagnostics['simulations'])
+    else:
+        EVENTS.emit("convergence_result",
+                    f"\n⚠️ Sin convergencia tras {diagnostics['simulations']} simulaciones; "
+                    f"se estiman {diagnostics['estimated_simulations_needed']} necesarias",
+                    level=logging.WARNING, converged=False, simulations=diagnostics['simulations'],
+                    estimated_simulations_needed=diagnostics['estimated_simulations_needed'])
+
+    return diagnostics
+
+
+def format_predecessor_details(predecessors):
+    """
+    Convierte la lista de tuplas (id, tipo, lag) al formato compacto "3FS+2, 5SS-1"
+    """
+    details = []
+    for pred_id, dep_type, lag in predecessors or []:
+        lag_str = f"+{lag}" if lag > 0 else f"{lag}" if lag < 0 else ""
+        details.append(f"{pred_id}{dep_type}{lag_str}")
+    return ", ".join(details)
 
-        # Crear simulación con configuración única
-        scheduler = ImprovedMiningScheduler()
-        scheduler.generate_coherent_tasks()
 
-        # Obtener métricas
-        metrics = scheduler.generate_summary_metrics()
-
-        # Imprimir resumen
-        print(f"ID: {scheduler.simulation_id}")
-        print(f"Perfil: {scheduler.simulation_config['profile_name']}")
-        print(f"Red: {scheduler.simulation_config['network_style']}")
-        print(f"Completadas: {metrics['✅ Completadas']}")
-        print(f"En progreso: {metrics['🔄 En progreso']}")
-        print(f"No iniciadas: {metrics['⏳ No iniciadas']}")
-
-        simulations.append({
-            'scheduler': scheduler,
-            'metrics': metrics,
-            'df': scheduler.create_dataframe()
+PREDECESSOR_TOKEN = re.compile(r"^\s*(\d+)\s*(FS|SS|FF|SF)?\s*(?:([+-])\s*(\d+)\s*(?:d|días?)?)?\s*$", re.IGNORECASE)
+
+
+def parse_predecessor_details(text):
+    """
+    Interpreta el formato compacto "3FS+2, 5SS-1; 7" como lista de tuplas (id, tipo, lag)
+    Un ID sin tipo se interpreta como FS sin lag
+    """
+    if text is None or str(text).strip() in ("", "-", "Ninguno"):
+        return []
+
+    predecessors = []
+    for token in re.split(r"[,;]", str(text)):
+        if not token.strip():
+            continue
+        match = PREDECESSOR_TOKEN.match(token)
+        if not match:
+            raise ValueError(f"Predecesor con formato inválido: '{token.strip()}'")
+        pred_id, dep_type, sign, lag = match.groups()
+        lag = int(lag or 0) * (-1 if sign == "-" else 1)
+        predecessors.append((int(pred_id), (dep_type or "FS").upper(), lag))
+    return predecessors
+
+
+def _drop_missing_predecessors(tasks, source):
+    """
+    Elimina referencias a tareas que no existen en el archivo importado (p. ej. tareas resumen)
+    """
+    known_ids = {task["id"] for task in tasks}
+    dropped = 0
+    for task in tasks:
+        valid = [p for p in task["predecessors"] if p[0] in known_ids and p[0] != task["id"]]
+        dropped += len(task["predecessors"]) - len(valid)
+        task["predecessors"] = valid
+    if dropped:
+        EVENTS.emit("import_dependencies_dropped",
+                    f"⚠️ {source}: se omitieron {dropped} dependencias hacia tareas inexistentes o resumen",
+                    level=logging.WARNING, source=str(source), dropped=dropped)
+    return tasks
+
+
+def import_tasks_from_csv(filename, delimiter=",", encoding="utf-8"):
+    """
+    Importa un cronograma real desde CSV leyendo fila por fila
+
+    Formato (encabezados obligatorios en la primera fila):
+        ID             entero único de la tarea
+        Fase           nombre de la fase (las fases desconocidas usan riesgo 20%)
+        Tarea          nombre de la tarea
+        Duracion       duración en días (entero >= 1)
+        Costo          costo planificado en USD (opcional, por defecto 0)
+        Predecesores   formato compacto "3FS+2, 5SS-1, 7" (opcional; ID sin tipo = FS sin lag)
+
+    Devuelve la lista de tareas lista para ImprovedMiningScheduler.load_tasks
+    """
+    tasks = []
+    with open(filename, newline="", encoding=encoding) as file:
+        reader = csv.DictReader(file, delimiter=delimiter)
+        missing = {"ID", "Fase", "Tarea", "Duracion"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Faltan columnas en {filename}: {', '.join(sorted(missing))}")
+
+        for line_number, row in enumerate(reader, 2):
+            try:
+                tasks.append({
+                    "id": int(row["ID"]),
+                    "fase": row["Fase"].strip(),
+                    "tarea": row["Tarea"].strip(),
+                    "duracion": max(1, int(round(float(row["Duracion"])))),
+                    "costo_base": int(round(float(row.get("Costo") or 0))),
+                    "predecessors": parse_predecessor_details(row.get("Predecesores"))
+                })
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{filename}, línea {line_number}: {e}") from e
+
+    return _drop_missing_predecessors(tasks, filename)
+
+
+# Tipos de vínculo de MS Project (PredecessorLink/Type)
+MSPROJECT_LINK_TYPES = {0: "FF", 1: "FS", 2: "SF", 3: "SS"}
+# Formatos de lag expresados en porcentaje de la duración del predecesor
+MSPROJECT_PERCENT_LAG_FORMATS = {19, 20, 51, 52}
+# Formatos de lag transcurrido (em, eh, ed, ew, emo y sus variantes estimadas): días corridos de 24 h
+MSPROJECT_ELAPSED_LAG_FORMATS = {4, 6, 8, 10, 12, 36, 38, 40, 42, 44}
+MSPROJECT_MINUTES_PER_DAY = 8 * 60
+MSPROJECT_MINUTES_PER_ELAPSED_DAY = 24 * 60
+
+
+def _msproject_duration_days(text):
+    """Convierte una duración ISO 8601 de MS Project (PT40H0M0S) a días laborales de 8 horas"""
+    match = re.match(r"^-?P(?:(\d+)D)?T?(?:([\d.]+)H)?(?:([\d.]+)M)?(?:([\d.]+)S)?$", text or "")
+    if not match:
+        return 0.0
+    days, hours, minutes, seconds = (float(v or 0) for v in match.groups())
+    return days + (hours + minutes / 60 + seconds / 3600) / 8
+
+
+def import_tasks_from_msproject_xml(filename):
+    """
+    Importa un cronograma real desde MS Project XML (MSPDI) con lectura en streaming (iterparse)
+
+    - Las tareas resumen de nivel 1 definen la fase de las tareas que contienen
+    - Las tareas resumen no se importan; los vínculos hacia ellas se omiten
+    - Tipos de vínculo: 0=FF, 1=FS, 2=SF, 3=SS; el lag (décimas de minuto) se convierte a días de 8 h,
+      o de 24 h si su LagFormat es transcurrido (ed, eh, ...)
+    - Costo en centavos (formato MSPDI) convertido a USD
+    """
+    tasks = []
+    percent_lags = []
+    current_phase = "Sin fase"
+    ns = None
+    # Elementos abiertos: la raíz y los padres del elemento actual
+    open_elements = []
+
+    def release(element):
+        # Libera un elemento ya procesado y lo quita de su padre para que no se acumulen nodos vacíos
+        element.clear()
+        if open_elements:
+            open_elements[-1].remove(element)
+
+    for event, element in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            if ns is None:
+                # Prefijo de namespace (MSPDI usa http://schemas.microsoft.com/project)
+                ns = element.tag[:element.tag.index("}") + 1] if element.tag.startswith("{") else ""
+                task_tag, link_tag = f"{ns}Task", f"{ns}PredecessorLink"
+                skipped_tags = {f"{ns}Resource", f"{ns}Assignment", f"{ns}Calendar"}
+            open_elements.append(element)
+            continue
+
+        open_elements.pop()
+        tag = element.tag
+        if tag in skipped_tags or len(open_elements) == 1:
+            # Recursos, asignaciones, calendarios y los hijos directos de la raíz ya procesados
+            # (Tasks, Assignments, Calendars, ...)
+            release(element)
+            continue
+        if tag != task_tag:
+            continue
+
+        uid = int(element.findtext(f"{ns}UID") or 0)
+        name = (element.findtext(f"{ns}Name") or "").strip()
+        is_summary = element.findtext(f"{ns}Summary") == "1"
+        outline_level = int(element.findtext(f"{ns}OutlineLevel") or 1)
+
+        if is_summary or uid == 0:
+            if is_summary and outline_level == 1 and uid != 0:
+                current_phase = name
+            release(element)
+            continue
+
+        predecessors = []
+        for link in element.iterfind(link_tag):
+            pred_uid = int(link.findtext(f"{ns}PredecessorUID"))
+            dep_type = MSPROJECT_LINK_TYPES.get(int(link.findtext(f"{ns}Type") or 1), "FS")
+            link_lag = float(link.findtext(f"{ns}LinkLag") or 0)
+            lag_format = int(link.findtext(f"{ns}LagFormat") or 7)
+
+            if lag_format in MSPROJECT_PERCENT_LAG_FORMATS:
+                # Se resuelve al final, cuando se conoce la duración del predecesor
+                percent_lags.append((len(tasks), len(predecessors), link_lag / 10))
+                lag = 0
+            elif lag_format in MSPROJECT_ELAPSED_LAG_FORMATS:
+                lag = int(round(link_lag / 10 / MSPROJECT_MINUTES_PER_ELAPSED_DAY))
+            else:
+                lag = int(round(link_lag / 10 / MSPROJECT_MINUTES_PER_DAY))
+            predecessors.append((pred_uid, dep_type, lag))
+
+        tasks.append({
+            "id": uid,
+            "fase": current_phase if outline_level > 1 else "Sin fase",
+            "tarea": name,
+            "duracion": max(1, int(round(_msproject_duration_days(element.findtext(f"{ns}Duration"))))),
+            "costo_base": int(round(float(element.findtext(f"{ns}Cost") or 0) / 100)),
+            "predecessors": predecessors
         })
+        release(element)
 
-    return simulations
+    durations = {task["id"]: task["duracion"] for task in tasks}
+    for task_index, link_index, percent in percent_lags:
+        pred_id, dep_type, _ = tasks[task_index]["predecessors"][link_index]
+        lag = int(round(durations.get(pred_id, 0) * percent / 100))
+        tasks[task_index]["predecessors"][link_index] = (pred_id, dep_type, lag)
+
+    return _drop_missing_predecessors(tasks, filename)
+
+
+class SimulationResultsStore:
+    """
+    Almacén local de resultados basado en SQLite (un archivo, sin servidor)
+    Guarda las tareas, las métricas de resumen y el reporte de dependencias de cada simulación
+
+    Cada inserción es una corrida con su propia clave run_id (UUID, o la entregada en la simulación):
+    simulation_id puede repetirse entre corridas sin mezclar sus filas. Reinsertar un run_id existente
+    reemplaza la corrida completa (también sus tareas y reportes) en la misma transacción.
+    """
+
+    # Columnas del DataFrame de tareas -> columnas de la tabla tasks
+    TASK_COLUMNS = [
+        ("ID", "task_id"),
+        ("Fase", "fase"),
+        ("Tarea", "tarea"),
+        ("Duración Planificada (días)", "duracion_planificada"),
+        ("Inicio Planificado", "inicio_planificado"),
+        ("Fin Planificado", "fin_planificado"),
+        ("Predecesor", "predecesor"),
+        ("Predecesores Detallados", "predecesores_detallados"),
+        ("Costo Planificado (USD)", "costo_planificado"),
+        ("Riesgo de Retraso (%)", "riesgo_retraso"),
+        ("Estado", "estado"),
+        ("Inicio Real", "inicio_real"),
+        ("Fin Real", "fin_real"),
+        ("Duración Real (días)", "duracion_real"),
+        ("% Avance Físico", "avance_fisico"),
+        ("Costo Real (USD)", "costo_real"),
+        ("Retraso (días)", "retraso"),
+        ("Sobrecosto (USD)", "sobrecosto"),
+        ("Causa de Retraso", "causa_retraso"),
+        ("Observaciones", "observaciones"),
+        ("Días de Retraso", "dias_retraso"),
+        ("Buffer sugerido (días)", "buffer_sugerido"),
+    ]
+
+    RECORD_COLUMNS = [
+        ("run_id", "TEXT PRIMARY KEY"),
+        ("simulation_id", "TEXT NOT NULL"),
+        ("profile_name", "TEXT"),
+        ("network_style", "TEXT"),
+        ("buffer_strategy", "TEXT"),
+        ("project_start_date", "TEXT"),
+        ("evaluation_date", "TEXT"),
+        ("total_tasks", "INTEGER"),
+        ("completed", "INTEGER"),
+        ("in_progress", "INTEGER"),
+        ("not_started", "INTEGER"),
+        ("avg_progress", "REAL"),
+        ("delayed_tasks", "INTEGER"),
+        ("total_delay_days", "INTEGER"),
+        ("max_delay_days", "INTEGER"),
+        ("total_buffer_days", "INTEGER"),
+        ("planned_cost", "REAL"),
+        ("actual_cost", "REAL"),
+    ]
+
+    def __init__(self, path="simulaciones.db"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL + synchronous NORMAL: inserciones masivas rápidas y lecturas concurrentes
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        record_columns = ", ".join(f"{name} {sql_type}" for name, sql_type in self.RECORD_COLUMNS)
+        task_columns = ", ".join(f"{name}" for _, name in self.TASK_COLUMNS)
+
+        existing = [row[1] for row in self.connection.execute("PRAGMA table_info(simulations)")]
+        if existing and "run_id" not in existing:
+            raise ValueError(f"{self.path} usa el esquema anterior (sin run_id); cree un almacén nuevo")
+
+        with self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS simulations ({record_columns})")
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS tasks (run_id TEXT NOT NULL, simulation_id TEXT NOT NULL, "
+                f"{task_columns}, UNIQUE (run_id, task_id))"
+            )
+            for table in ("summary_metrics", "dependency_reports"):
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (run_id TEXT NOT NULL, simulation_id TEXT NOT NULL, "
+                    f"metric TEXT NOT NULL, value TEXT, UNIQUE (run_id, metric))"
+                )
+
+            for column in ("simulation_id", "profile_name", "network_style", "buffer_strategy", "total_delay_days"):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_simulations_{column} ON simulations ({column})"
+                )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_simulations_profile_network "
+                "ON simulations (profile_name, network_style)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_simulation ON tasks (simulation_id)")
+
+    @staticmethod
+    def _to_sql_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, (np.integer,)):
+            return int(value)
+        if isinstance(value, (np.floating,)):
+            return float(value)
+        if isinstance(value, (list, tuple, dict)):
+            return str(value)
+        return value
+
+    def _simulation_rows(self, scheduler, run_id, df=None, metrics=None, dependency_report=None):
+        if df is None:
+            df = scheduler.create_dataframe()
+        if metrics is None:
+            metrics = scheduler.generate_summary_metrics(df)
+        if dependency_report is None:
+            dependency_report = scheduler.generate_dependency_report()
+
+        record = build_simulation_record(scheduler, df)
+        record['run_id'] = run_id
+        record['project_start_date'] = scheduler.project_start_date.isoformat()
+        record['evaluation_date'] = scheduler.current_date.isoformat()
+        simulation_row = tuple(self._to_sql_value(record[name]) for name, _ in self.RECORD_COLUMNS)
+
+        # Predecesores Detallados se guarda en el formato compacto "3FS+2"
+        columns = []
+        for label, _ in self.TASK_COLUMNS:
+            if label == "Predecesores Detallados":
+                columns.append([format_predecessor_details(p) for p in df[label]])
+            else:
+                columns.append([self._to_sql_value(v) for v in df[label]])
+        key = (run_id, scheduler.simulation_id)
+        task_rows = [key + row for row in zip(*columns)]
+
+        metric_rows = [key + (k, str(v)) for k, v in metrics.items()]
+        dependency_rows = [key + (k, str(v)) for k, v in dependency_report.items()]
+
+        return simulation_row, task_rows, metric_rows, dependency_rows
+
+    def add_simulations(self, simulations):
+        """
+        Inserta un lote de simulaciones en una sola transacción y devuelve sus run_id
+        Acepta schedulers o diccionarios {'scheduler', 'df', 'metrics'} de iterate_simulations;
+        un 'run_id' en el diccionario fija la clave de la corrida (y reemplaza la existente)
+        """
+        run_ids, simulation_rows, task_rows, metric_rows, dependency_rows = [], [], [], [], []
+
+        for simulation in simulations:
+            if isinstance(simulation, dict):
+                run_id = simulation.get('run_id') or uuid.uuid4().hex
+                rows = self._simulation_rows(simulation['scheduler'], run_id, simulation.get('df'),
+                                             simulation.get('metrics'))
+            else:
+                run_id = uuid.uuid4().hex
+                rows = self._simulation_rows(simulation, run_id)
+            run_ids.append(run_id)
+            simulation_rows.append(rows[0])
+            task_rows.extend(rows[1])
+            metric_rows.extend(rows[2])
+            dependency_rows.extend(rows[3])
+
+        record_placeholders = ", ".join("?" for _ in self.RECORD_COLUMNS)
+        task_placeholders = ", ".join("?" for _ in range(len(self.TASK_COLUMNS) + 2))
+        task_columns = ", ".join(name for _, name in self.TASK_COLUMNS)
+
+        with self.connection:
+            # Una corrida reinsertada reemplaza también sus filas hijas
+            replaced = [(run_id,) for run_id in run_ids]
+            for table in ("tasks", "summary_metrics", "dependency_reports"):
+                self.connection.executemany(f"DELETE FROM {table} WHERE run_id = ?", replaced)
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO simulations VALUES ({record_placeholders})", simulation_rows
+            )
+            self.connection.executemany(
+                f"INSERT INTO tasks (run_id, simulation_id, {task_columns}) VALUES ({task_placeholders})", task_rows
+            )
+            self.connection.executemany("INSERT INTO summary_metrics VALUES (?, ?, ?, ?)", metric_rows)
+            self.connection.executemany("INSERT INTO dependency_reports VALUES (?, ?, ?, ?)", dependency_rows)
+
+        return run_ids
+
+    def add_simulation(self, scheduler, df=None, run_id=None):
+        """Inserta una simulación individual y devuelve su run_id"""
+        return self.add_simulations([{'scheduler': scheduler, 'df': df, 'run_id': run_id}])[0]
+
+    def query_simulations(self, profile_name=None, network_style=None, buffer_strategy=None,
+                          min_total_delay_days=None, simulation_id=None, run_id=None):
+        """
+        Consulta simulaciones por perfil, estilo de red, estrategia de buffer y retraso total
+        Ejemplo: query_simulations("Proyecto Crítico", "Compleja", min_total_delay_days=200)
+        """
+        conditions, params = [], []
+        for column, value in (("run_id", run_id), ("simulation_id", simulation_id), ("profile_name", profile_name),
+                              ("network_style", network_style), ("buffer_strategy", buffer_strategy)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if min_total_delay_days is not None:
+            conditions.append("total_delay_days > ?")
+            params.append(min_total_delay_days)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return pd.read_sql_query(f"SELECT * FROM simulations{where}", self.connection, params=params)
+
+    def _run_id(self, key):
+        """run_id de una corrida a partir de su run_id o de su simulation_id (si no es ambiguo)"""
+        rows = self.connection.execute(
+            "SELECT run_id FROM simulations WHERE run_id = ? OR simulation_id = ?", (key, key)
+        ).fetchall()
+        if len(rows) > 1:
+            raise ValueError(f"'{key}' corresponde a {len(rows)} corridas; consulte por run_id")
+        return rows[0][0] if rows else None
+
+    def query_tasks(self, key):
+        """Devuelve las tareas almacenadas de una corrida (por run_id o simulation_id)"""
+        return pd.read_sql_query("SELECT * FROM tasks WHERE run_id = ? ORDER BY task_id",
+                                 self.connection, params=[self._run_id(key)])
+
+    def query_summary_metrics(self, key):
+        """Devuelve las métricas de resumen de una corrida (por run_id o simulation_id) como diccionario"""
+        rows = self.connection.execute(
+            "SELECT metric, value FROM summary_metrics WHERE run_id = ?", (self._run_id(key),)
+        ).fetchall()
+        return dict(rows)
+
+    def query_dependency_report(self, key):
+        """Devuelve el reporte de dependencias de una corrida (por run_id o simulation_id) como diccionario"""
+        rows = self.connection.execute(
+            "SELECT metric, value FROM dependency_reports WHERE run_id = ?", (self._run_id(key),)
+        ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultsStoreSink(SimulationSink):
+    """
+    Sink que inserta las simulaciones en un SimulationResultsStore en lotes transaccionales
+    Cada simulación recibe el run_id "<campaña>-<n>": al reanudar desde un checkpoint, las corridas
+    ya insertadas después del checkpoint se reemplazan en lugar de duplicarse
+    """
+
+    def __init__(self, store, batch_size=100):
+        self.store = store
+        self.batch_size = batch_size
+        self.campaign_id = uuid.uuid4().hex
+        self.consumed = 0
+        self._pending = []
+
+    def consume(self, simulation):
+        # Solo se retienen los datos necesarios para la inserción
+        self._pending.append({'scheduler': simulation['scheduler'], 'df': simulation['df'],
+                              'metrics': simulation['metrics'],
+                              'run_id': f"{self.campaign_id}-{self.consumed:08d}"})
+        self.consumed += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.store.add_simulations(self._pending)
+            self._pending = []
+
+    def checkpoint_state(self):
+        # Lo consumido hasta el checkpoint queda insertado; la conexión no se serializa
+        self.flush()
+        return {'batch_size': self.batch_size, 'campaign_id': self.campaign_id, 'consumed': self.consumed}
+
+    def close(self):
+        self.flush()
+
+
+class SharedTaskBuffer:
+    """
+    Buffer de memoria compartida (escenarios x tareas x campos) para transferir resultados
+    entre procesos sin serializar schedulers ni DataFrames
+    """
+
+    def __init__(self, num_scenarios, max_tasks, name=None):
+        self.shape = (num_scenarios, max_tasks, len(TASK_ARRAY_FIELDS))
+        size = int(np.prod(self.shape)) * np.dtype(np.float64).itemsize
+        self._owner = name is None
+
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        if self._owner:
+            self.array.fill(np.nan)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name, num_scenarios, max_tasks):
+        """Se conecta a un buffer existente (lado del worker)"""
+        return cls(num_scenarios, max_tasks, name=name)
+
+    def scenario_frame(self, scenario_index):
+        """DataFrame de un escenario que comparte memoria con el buffer (sin copia)"""
+        return pd.DataFrame(self.array[scenario_index], columns=list(TASK_ARRAY_FIELDS), copy=False)
+
+    def to_frame(self):
+        """
+        DataFrame apilado de todos los escenarios indexado por (escenario, tarea), sin copia
+        Las filas de tareas no usadas quedan con NaN
+        """
+        num_scenarios, max_tasks, num_fields = self.shape
+        flat = self.array.reshape(num_scenarios * max_tasks, num_fields)
+        index = pd.MultiIndex.from_product([range(num_scenarios), range(max_tasks)],
+                                           names=["escenario", "tarea"])
+        return pd.DataFrame(flat, index=index, columns=list(TASK_ARRAY_FIELDS), copy=False)
+
+    def close(self):
+        # Las vistas deben liberarse antes de cerrar el segmento
+        self.array = None
+        self.shm.close()
+
+    def release(self):
+        """Cierra y elimina el segmento (solo el proceso creador)"""
+        self.close()
+        if self._owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _shared_memory_worker(args):
+    """
+    Worker: ejecuta un bloque de escenarios y escribe sus tareas directamente en memoria compartida
+    Cada escenario usa su propia semilla (y punto de muestreo), así el resultado no depende del
+    proceso que lo ejecute. Solo devuelve metadatos livianos por escenario
+    """
+    buffer_name, num_scenarios, max_tasks, scenarios, current_date, config = args
+    buffer = SharedTaskBuffer.attach(buffer_name, num_scenarios, max_tasks)
+    metadata = []
+
+    try:
+        for scenario_index, scheduler_kwargs in scenarios:
+            scheduler = ImprovedMiningScheduler(current_date=current_date, config=config, **scheduler_kwargs)
+            scheduler.generate_coherent_tasks()
+            if len(scheduler.tasks) > max_tasks:
+                raise ValueError(f"El escenario {scenario_index} tiene {len(scheduler.tasks)} tareas y el buffer "
+                                 f"admite {max_tasks}; aumente max_tasks")
+            scheduler.task_array(out=buffer.array[scenario_index])
+
+            metadata.append({
+                'escenario': scenario_index,
+                'seed': scheduler_kwargs['seed'],
+                'simulation_id': scheduler.simulation_id,
+                'profile_name': scheduler.simulation_config['profile_name'],
+                'network_style': scheduler.simulation_config['network_style'],
+                'buffer_strategy': scheduler.simulation_config['buffer_strategy'],
+                'project_start_date': scheduler.project_start_date,
+                'current_date': scheduler.current_date,
+                'total_tasks': len(scheduler.tasks)
+            })
+    finally:
+        buffer.close()
+
+    return metadata
+
+
+def run_shared_memory_simulations(num_simulations, processes=None, max_tasks=None, chunk_size=None, seed=None,
+                                  current_date=None, config=None, sampler=None):
+    """
+    Ejecuta simulaciones en varios procesos escribiendo los resultados en memoria compartida
+
+    Cada escenario recibe una semilla derivada de `seed` (numpy SeedSequence) y todos se evalúan en
+    `current_date` (por defecto, el momento de la llamada): con la misma semilla y fecha la campaña
+    se reproduce exactamente, sin importar el número de procesos ni el reparto de los bloques.
+    Con un ScenarioSampler, la semilla y el punto de cada escenario salen de sampler.scheduler_kwargs(k).
+    `config` (CompiledSimulationConfig o ruta a un JSON de sitio) se aplica a todos los escenarios;
+    sin `max_tasks` la capacidad del buffer es el tamaño de su plantilla de tareas. Si un escenario
+    tiene más de `max_tasks` tareas la campaña falla con ValueError.
+
+    Devuelve (buffer, metadata): `buffer` es un SharedTaskBuffer cuyo arreglo/DataFrame son vistas
+    sin copia; `metadata` es un DataFrame con un registro por escenario (incluida su semilla). El llamador
+    debe invocar buffer.release() (o usarlo como context manager) cuando termine.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, num_simulations // (processes * 4))
+    current_date = current_date or datetime.now()
+    config = config if isinstance(config, CompiledSimulationConfig) else load_simulation_config(config)
+    max_tasks = max_tasks or len(config.task_template)
+    if sampler is not None:
+        sampler.plan(num_simulations)
+        scenarios = [sampler.scheduler_kwargs(index) for index in range(num_simulations)]
+    else:
+        scenarios = [{'seed': seed} for seed in np.random.SeedSequence(seed).generate_state(num_simulations).tolist()]
+
+    buffer = SharedTaskBuffer(num_simulations, max_tasks)
+    chunks = [[(index, scenarios[index]) for index in range(start, min(start + chunk_size, num_simulations))]
+              for start in range(0, num_simulations, chunk_size)]
+    jobs = [(buffer.name, num_simulations, max_tasks, chunk, current_date, config) for chunk in chunks]
+
+    metadata = []
+    try:
+        with multiprocessing.Pool(processes=processes) as pool:
+            for chunk_metadata in pool.imap_unordered(_shared_memory_worker, jobs):
+                metadata.extend(chunk_metadata)
+    except Exception:
+        buffer.release()
+        raise
+
+    metadata_df = pd.DataFrame(metadata).sort_values('escenario').reset_index(drop=True)
+    return buffer, metadata_df
+
+
+class ShardedCampaign:
+    """
+    Campaña repartida en shards (tramos de índices de muestreo) mediante una cola de trabajo en archivos
+
+    Estructura del directorio compartido (disco local o de red):
+        campaign.json          parámetros de la campaña (estrategia, semilla, tamaño de shard, ...)
+        shards/NNNNN.json      un archivo por shard con su tramo [start, stop) de simulaciones
+        claims/NNNNN.lock      reclamo del shard (creado con O_CREAT | O_EXCL: solo un worker lo obtiene)
+        results/NNNNN.csv      registros de simulación del shard (escritos a un temporal y renombrados)
+
+    Cada simulación k usa ScenarioSampler(strategy, seed).scheduler_kwargs(k), de modo que el resultado
+    no depende de qué worker ni en qué máquina se ejecute cada shard. Un reclamo cuyo worker dejó de
+    actualizarlo durante `stale_after` segundos puede ser tomado por otro worker.
+    """
+
+    MANIFEST = "campaign.json"
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, self.MANIFEST), encoding="utf-8") as file:
+            self.manifest = json.load(file)
+        self.num_shards = self.manifest["num_shards"]
+
+    @classmethod
+    def create(cls, directory, num_simulations, shard_size=1000, strategy="lhs", seed=None,
+               num_tasks=50, block_size=None):
+        """
+        Crea el directorio de la campaña y escribe un archivo por shard
+        Sin semilla se genera una y queda registrada para que todos los workers usen la misma
+        """
+        if strategy not in ScenarioSampler.STRATEGIES:
+            raise ValueError(f"Estrategia de muestreo desconocida: {strategy}")
+        if os.path.exists(os.path.join(directory, cls.MANIFEST)):
+            raise FileExistsError(f"Ya existe una campaña en {directory}")
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+
+        for folder in ("shards", "claims", "results"):
+            os.makedirs(os.path.join(directory, folder), exist_ok=True)
+
+        shards = [(start, min(start + shard_size, num_simulations)) for start in range(0, num_simulations, shard_size)]
+        for shard, (start, stop) in enumerate(shards):
+            _write_json_atomic(os.path.join(directory, "shards", f"{shard:05d}.json"),
+                               {"shard": shard, "start": start, "stop": stop})
+
+        _write_json_atomic(os.path.join(directory, cls.MANIFEST), {
+            "num_simulations": num_simulations,
+            "shard_size": shard_size,
+            "num_shards": len(shards),
+            "strategy": strategy,
+            "seed": seed,
+            "num_tasks": num_tasks,
+            "block_size": block_size or ScenarioSampler.lhs_block_size(num_simulations),
+            "created": datetime.now().isoformat(timespec="seconds")
+        })
+        return cls(directory)
+
+    def _path(self, folder, shard, extension):
+        return os.path.join(self.directory, folder, f"{shard:05d}.{extension}")
+
+    def sampler(self):
+        return ScenarioSampler(self.manifest["strategy"], num_tasks=self.manifest["num_tasks"],
+                               seed=self.manifest["seed"], block_size=self.manifest["block_size"])
+
+    def is_done(self, shard):
+        return os.path.exists(self._path("results", shard, "csv"))
+
+    def claim(self, worker_id, stale_after=3600):
+        """
+        Reclama el primer shard pendiente y devuelve su descripción (o None si no queda ninguno)
+        """
+        for shard in range(self.num_shards):
+            if self.is_done(shard):
+                continue
+            lock = self._path("claims", shard, "lock")
+            if stale_after is not None and self._is_stale(lock, stale_after):
+                self._break_stale_claim(lock, worker_id, stale_after)
+            try:
+                descriptor = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({"worker": worker_id, "host": socket.gethostname(), "pid": os.getpid(),
+                           "claimed": datetime.now().isoformat(timespec="seconds")}, file)
+            if self.is_done(shard):
+                # Otro worker lo terminó entre la verificación y el reclamo
+                self.release(shard)
+                continue
+            with open(self._path("shards", shard, "json"), encoding="utf-8") as file:
+                return json.load(file)
+        return None
+
+    def _break_stale_claim(self, lock, worker_id, stale_after):
+        """
+        Aparta un reclamo abandonado. Solo un worker logra renombrarlo; si lo renombrado resulta ser un
+        reclamo recién creado por otro worker, se restituye con os.link (que no sobrescribe)
+        """
+        moved = f"{lock}.{worker_id}.stale"
+        try:
+            os.rename(lock, moved)
+        except OSError:
+            return
+        if not self._is_stale(moved, stale_after):
+            try:
+                os.link(moved, lock)
+            except OSError:
+                pass
+        os.remove(moved)
+
+    @staticmethod
+    def _is_stale(lock, stale_after):
+        try:
+            return time.time() - os.path.getmtime(lock) > stale_after
+        except OSError:
+            return False
+
+    def heartbeat(self, shard):
+        """Actualiza la marca de tiempo del reclamo para que no se considere abandonado"""
+        try:
+            os.utime(self._path("claims", shard, "lock"))
+        except OSError:
+            pass
+
+    def release(self, shard):
+        try:
+            os.remove(self._path("claims", shard, "lock"))
+        except FileNotFoundError:
+            pass
+
+    def run_shard(self, shard_info, worker_id=None, sinks=None, heartbeat_every=50):
+        """
+        Ejecuta las simulaciones del shard y publica sus registros de forma atómica
+        """
+        shard = shard_info["shard"]
+        start, stop = shard_info["start"], shard_info["stop"]
+        results = self._path("results", shard, "csv")
+        temporary = f"{results}.{worker_id or os.getpid()}.tmp"
+
+        records = []
+        for i, simulation in enumerate(iterate_simulations(stop - start, sinks=sinks, sampler=self.sampler(),
+                                                           start=start)):
+            records.append({'simulation_index': start + i, 'shard': shard, **simulation['record']})
+            if (i + 1) % heartbeat_every == 0:
+                self.heartbeat(shard)
+
+        pd.DataFrame(records).to_csv(temporary, index=False)
+        os.replace(temporary, results)
+        return len(records)
+
+    def run_worker(self, worker_id=None, max_shards=None, stale_after=3600, sinks_factory=None):
+        """
+        Bucle de un worker: reclama shards pendientes, los ejecuta y publica sus resultados
+        Devuelve el número de shards completados por este worker
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        completed = 0
+        while max_shards is None or completed < max_shards:
+            shard_info = self.claim(worker_id, stale_after)
+            if shard_info is None:
+                break
+            try:
+                count = self.run_shard(shard_info, worker_id, sinks_factory() if sinks_factory else None)
+            finally:
+                self.release(shard_info["shard"])
+            completed += 1
+            EVENTS.emit("shard_completed", f"✅ {worker_id}: shard {shard_info['shard']} ({count} simulaciones)",
+                        worker=worker_id, simulations=count, **shard_info)
+        return completed
+
+    def status(self):
+        """Conteo de shards terminados, reclamados y pendientes"""
+        done = sum(self.is_done(shard) for shard in range(self.num_shards))
+        claimed = sum(os.path.exists(self._path("claims", shard, "lock")) and not self.is_done(shard)
+                      for shard in range(self.num_shards))
+        return {"shards": self.num_shards, "terminados": done, "reclamados": claimed,
+                "pendientes": self.num_shards - done - claimed}
+
+    def merge(self, output=None, allow_partial=False):
+        """
+        Combina los resultados de todos los shards en un DataFrame ordenado por simulation_index
+        Con `output` se escribe además como CSV. Sin allow_partial, falta de shards es un error.
+        """
+        missing = [shard for shard in range(self.num_shards) if not self.is_done(shard)]
+        if missing and not allow_partial:
+            raise ValueError(f"Faltan {len(missing)} shards por terminar: {missing[:10]}")
+
+        frames = [pd.read_csv(self._path("results", shard, "csv"))
+                  for shard in range(self.num_shards) if shard not in missing]
+        merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not merged.empty:
+            merged = merged.sort_values('simulation_index').reset_index(drop=True)
+        if output:
+            merged.to_csv(output, index=False)
+        return merged
+
+
+def _write_json_atomic(path, data):
+    """
+    Escribe un JSON en un temporal y lo renombra, para que los lectores nunca vean un archivo a medias
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def _campaign_worker(args):
+    directory, worker_id, stale_after = args
+    return ShardedCampaign(directory).run_worker(worker_id, stale_after=stale_after)
+
+
+def run_local_campaign(directory, num_simulations, workers=None, shard_size=1000, strategy="lhs", seed=None,
+                       stale_after=3600, output=None):
+    """
+    Crea (o reanuda) una campaña en `directory`, la ejecuta con varios workers locales y combina los resultados
+    Los mismos shards se pueden ejecutar desde otras máquinas con: python simul.py worker <directorio>
+    """
+    if os.path.exists(os.path.join(directory, ShardedCampaign.MANIFEST)):
+        campaign = ShardedCampaign(directory)
+    else:
+        campaign = ShardedCampaign.create(directory, num_simulations, shard_size, strategy, seed)
+
+    workers = workers or os.cpu_count() or 1
+    jobs = [(directory, f"{socket.gethostname()}-local{i}", stale_after) for i in range(workers)]
+    with multiprocessing.Pool(processes=workers) as pool:
+        completed = sum(pool.map(_campaign_worker, jobs))
+
+    EVENTS.emit("campaign_merged", f"📦 Campaña {directory}: {completed} shards ejecutados por {workers} workers",
+                directory=directory, workers=workers, shards_completed=completed, **campaign.status())
+    return campaign.merge(output)
+
+
+def forecast_campaign(schedulers, respect_planned_start=True):
+    """
+    Pronostica el fin del proyecto y el desvío por fase de muchas simulaciones
+    Las simulaciones que comparten red y tareas se procesan juntas en un solo barrido vectorizado
+    Devuelve un DataFrame con una fila por simulación
+    """
+    groups = {}
+    for scheduler in schedulers:
+        phases = tuple(task.phase for task in scheduler.tasks)
+        key = (scheduler.get_dependency_graph().signature(), phases)
+        groups.setdefault(key, []).append(scheduler)
+
+    fin_idx = TASK_ARRAY_FIELDS.index("Fin Planificado (día)")
+    rows = []
+    for (_, phases), group in groups.items():
+        arrays = np.stack([scheduler.task_array() for scheduler in group])
+        current_days = [(s.current_date - s.project_start_date).days for s in group]
+        _, finish = forecast_dates(group[0].get_dependency_graph(), arrays, current_days, respect_planned_start)
+
+        planned = arrays[:, :, fin_idx]
+        phase_array = np.array(phases)
+        planned_finish = planned.max(axis=1)
+        forecast_finish = finish.max(axis=1)
+        phase_slip = {phase: finish[:, phase_array == phase].max(axis=1) - planned[:, phase_array == phase].max(axis=1)
+                      for phase in dict.fromkeys(phases)}
+
+        for i, scheduler in enumerate(group):
+            row = {
+                'simulation_id': scheduler.simulation_id,
+                'profile_name': scheduler.simulation_config['profile_name'],
+                'Fin Planificado (día)': int(planned_finish[i]),
+                'Fin Pronosticado (día)': int(forecast_finish[i]),
+                'Desvío del Proyecto (días)': int(forecast_finish[i] - planned_finish[i])
+            }
+            for phase, slips in phase_slip.items():
+                row[f"Desvío {phase} (días)"] = int(slips[i])
+            rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def cost_s_curve_campaign(schedulers, percentiles=(10, 50, 90), by_phase=False, reservoir_size=1000, seed=None):
+    """
+    Bandas de percentiles de las curvas S de costo (planificado y real acumulado) de muchas simulaciones
+    Los días se cuentan desde el inicio de cada proyecto. Devuelve un DataFrame (ver CostSCurveSink.summary);
+    con más de `reservoir_size` simulaciones las bandas se estiman sobre una muestra de reservorio
+    """
+    sink = CostSCurveSink(percentiles, by_phase, reservoir_size=reservoir_size, seed=seed)
+    for scheduler in schedulers:
+        sink.add(scheduler)
+    return sink.summary()
+
+
+def critical_chain_campaign(schedulers):
+    """
+    Calcula la cadena crítica y el buffer de proyecto de muchas simulaciones
+    Las simulaciones que comparten red se procesan juntas con duraciones por escenario (tareas x escenarios)
+    Devuelve un DataFrame con una fila por simulación
+    """
+    groups = {}
+    for scheduler in schedulers:
+        groups.setdefault(scheduler.get_dependency_graph().signature(), []).append(scheduler)
+
+    rows = []
+    for group in groups.values():
+        graph = group[0].get_dependency_graph()
+        durations = np.column_stack([[task.planned_duration for task in s.tasks] for s in group])
+        uncertainty = np.column_stack([
+            s.config.risk_vector(task.phase for task in s.tasks)
+            * s.config.buffer_strategies[s.simulation_config['buffer_strategy']]['chain_factor']
+            for s in group
+        ]) * durations
+        result = critical_chain_buffers(graph, durations, uncertainty)
+        chain_finish = np.where(result['critical'], result['early_finish'], 0).max(axis=0)
+
+        for i, scheduler in enumerate(group):
+            rows.append({
+                'simulation_id': scheduler.simulation_id,
+                'profile_name': scheduler.simulation_config['profile_name'],
+                'buffer_strategy': scheduler.simulation_config['buffer_strategy'],
+                'Tareas en Cadena Crítica': int(result['critical'][:, i].sum()),
+                'Fin Cadena Crítica (día)': int(chain_finish[i]),
+                'Buffer de Proyecto (días)': int(result['project_buffer'][i]),
+                'Buffers de Alimentación': int(np.count_nonzero(result['feeding_buffers'][:, i])),
+                'Fin con Buffer (día)': int(chain_finish[i] + result['project_buffer'][i])
+            })
+
+    return pd.DataFrame(rows)
+
+
+# Columnas que compara diff_schedules (nombre normalizado -> columna del cronograma)
+SCHEDULE_DIFF_COLUMNS = {
+    "Duración (días)": "Duración Planificada (días)",
+    "Inicio Planificado": "Inicio Planificado",
+    "Fin Planificado": "Fin Planificado",
+    "Inicio Real": "Inicio Real",
+    "Fin Real": "Fin Real",
+    "Días de Retraso": "Días de Retraso",
+    "% Avance Físico": "% Avance Físico",
+    "Costo Planificado (USD)": "Costo Planificado (USD)",
+    "Costo Real (USD)": "Costo Real (USD)"
+}
+SCHEDULE_DIFF_DATES = ("Inicio Planificado", "Fin Planificado", "Inicio Real", "Fin Real")
+
+
+def _predecessor_edges(task_ids, details):
+    """
+    Aristas (Predecesor, Sucesor, Tipo, Lag) desde una columna de predecesores
+    Las listas de tuplas se aplanan de una vez (itertools.chain y np.repeat para los sucesores), sin armar
+    una fila por arista; solo el texto compacto de un Excel exportado pasa por parse_predecessor_details
+    """
+    lists = [value if isinstance(value, (list, tuple))
+             else parse_predecessor_details(None if pd.isna(value) else value)
+             for value in details]
+    counts = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+    # Una fila (id, tipo, lag) por arista en un solo arreglo de objetos
+    flat = np.empty((int(counts.sum()), 3), dtype=object)
+    if len(flat):
+        flat[:] = list(itertools.chain.from_iterable(lists))
+    return pd.DataFrame({'Predecesor': flat[:, 0].astype(np.int64),
+                         'Sucesor': np.repeat(np.asarray(task_ids, dtype=np.int64), counts),
+                         'Tipo': flat[:, 1],
+                         'Lag': flat[:, 2].astype(np.int64)})
+
+
+def _schedule_table(source):
+    """
+    Normaliza un cronograma (scheduler, DataFrame de create_dataframe, lista de tareas o ruta de un Excel
+    exportado) a (tareas, aristas, grafo). Las fechas quedan truncadas al día y los textos como
+    "Pendiente" o "En ejecución" pasan a NaT/NaN.
+    """
+    if isinstance(source, ImprovedMiningScheduler):
+        # Desde task_array (días desde el inicio) sin construir el DataFrame completo
+        arrays = source.task_array()
+        field = {name: i for i, name in enumerate(TASK_ARRAY_FIELDS)}
+        start = pd.Timestamp(source.project_start_date).floor('D')
+        table = pd.DataFrame({'ID': arrays[:, field["ID"]].astype(np.int64),
+                              'Fase': [task.phase for task in source.tasks],
+                              'Tarea': [task.name for task in source.tasks],
+                              'Estado': [task.state for task in source.tasks]})
+        for name in SCHEDULE_DIFF_COLUMNS:
+            column = f"{name} (día)" if name in SCHEDULE_DIFF_DATES else SCHEDULE_DIFF_COLUMNS[name]
+            values = arrays[:, field[column]]
+            table[name] = start + pd.to_timedelta(values, unit='D') if name in SCHEDULE_DIFF_DATES else values
+        graph = source.get_dependency_graph()
+    else:
+        if isinstance(source, str):
+            df = pd.read_excel(source, sheet_name=0)
+        elif isinstance(source, pd.DataFrame):
+            df = source
+        else:
+            df = pd.DataFrame([dict(task) for task in source])
+        table = pd.DataFrame({'ID': df['ID'].astype(np.int64),
+                              'Fase': df.get('Fase'), 'Tarea': df.get('Tarea'), 'Estado': df.get('Estado')})
+        for name, column in SCHEDULE_DIFF_COLUMNS.items():
+            values = df[column] if column in df else pd.Series(np.nan, index=df.index)
+            if name in SCHEDULE_DIFF_DATES:
+                table[name] = pd.to_datetime(values, errors='coerce').dt.floor('D')
+            else:
+                table[name] = pd.to_numeric(values, errors='coerce')
+        graph = None
+
+    if graph is not None:
+        edges = pd.DataFrame({
+            'Predecesor': graph.task_ids[graph.pred_indices].astype(np.int64),
+            'Sucesor': graph.task_ids[graph.edge_targets].astype(np.int64),
+            'Tipo': np.array(DEPENDENCY_TYPES)[graph.pred_types],
+            'Lag': graph.pred_lags.astype(np.int64)
+        })
+    else:
+        # Tablas: "Predecesores Detallados" (tuplas o texto compacto) o, en un Excel exportado, "Predecesor"
+        column = next((name for name in ("Predecesores Detallados", "Predecesor") if name in df), None)
+        details = df[column].tolist() if column is not None else [None] * len(table)
+        edges = _predecessor_edges(table['ID'].to_numpy(), details)
+        edges = edges[edges['Predecesor'].isin(table['ID'])].reset_index(drop=True)
+        graph = DependencyGraph.from_edges(table['ID'].to_numpy(), edges['Predecesor'].to_numpy(),
+                                           edges['Sucesor'].to_numpy(), edges['Tipo'].to_numpy(),
+                                           edges['Lag'].to_numpy())
+        if column == "Predecesor":
+            # Solo IDs: el tipo y el lag se desconocen (el grafo los supone FS sin lag)
+            edges['Tipo'] = None
+            edges['Lag'] = pd.array([pd.NA] * len(edges), dtype='Int64')
+
+    return table, edges, graph
+
+
+def _critical_task_ids(table, graph):
+    """IDs con holgura total nula según CPM sobre las duraciones planificadas"""
+    durations = pd.Series(table['Duración (días)'].to_numpy(), index=table['ID'].to_numpy())
+    durations = np.nan_to_num(durations.reindex(graph.task_ids).to_numpy(), nan=1).astype(np.int64)
+    early_start, early_finish = graph.forward_pass(durations)
+    late_start, _ = graph.backward_pass(durations, early_finish.max(initial=0))
+    return set(graph.task_ids[late_start - early_start <= 0].tolist())
+
+
+def diff_schedules(baseline, current):
+    """
+    Compara dos cronogramas (schedulers, DataFrames de create_dataframe, listas de tareas o Excel exportados)
+    con uniones vectorizadas por ID de tarea y por (predecesor, sucesor)
+
+    Un Excel exportado solo conserva los IDs de los predecesores: sus dependencias se comparan por
+    (predecesor, sucesor) y el camino crítico las supone FS sin lag.
+
+    Devuelve un diccionario con:
+        resumen                  métricas de la comparación
+        tareas_agregadas         tareas que solo están en `current`
+        tareas_eliminadas        tareas que solo están en `baseline`
+        cambios_tareas           tareas comunes con cambios: desplazamientos de fechas (días), estados,
+                                 Δ retraso, Δ avance y Δ costos
+        transiciones_estado      conteo de tareas por (Estado Base, Estado Actual) cuando el estado cambió
+        dependencias_agregadas / dependencias_eliminadas / dependencias_modificadas (tipo o lag)
+        camino_critico           IDs críticos (CPM) de cada versión y los que entran y salen
+    """
+    base_table, base_edges, base_graph = _schedule_table(baseline)
+    current_table, current_edges, current_graph = _schedule_table(current)
+
+    merged = base_table.merge(current_table, on='ID', how='outer', suffixes=(' Base', ' Actual'), indicator=True)
+    added = merged['_merge'] == 'right_only'
+    removed = merged['_merge'] == 'left_only'
+    common = merged[merged['_merge'] == 'both']
+
+    def task_columns(rows, suffix):
+        columns = ['ID', f'Fase{suffix}', f'Tarea{suffix}', f'Estado{suffix}',
+                   f'Inicio Planificado{suffix}', f'Fin Planificado{suffix}', f'Costo Planificado (USD){suffix}']
+        return rows[columns].rename(columns=lambda name: name.replace(suffix, '')).reset_index(drop=True)
+
+    changes = pd.DataFrame({'ID': common['ID'], 'Fase': common['Fase Actual'], 'Tarea': common['Tarea Actual'],
+                            'Estado Base': common['Estado Base'], 'Estado Actual': common['Estado Actual']})
+    changed = (common['Estado Base'] != common['Estado Actual']).to_numpy(copy=True)
+    for name in SCHEDULE_DIFF_COLUMNS:
+        before, after = common[f'{name} Base'], common[f'{name} Actual']
+        if name in SCHEDULE_DIFF_DATES:
+            delta = (after - before).dt.days
+            label = f"Δ {name} (días)"
+        else:
+            delta = after - before
+            label = f"Δ {name}"
+        changes[label] = delta
+        # Cambio: diferencia distinta de cero o valor que aparece / desaparece (p. ej. una fecha real nueva)
+        changed |= (delta.fillna(0) != 0).to_numpy() | (before.isna() != after.isna()).to_numpy()
+    changes = changes[changed].reset_index(drop=True)
+
+    state_changes = changes[changes['Estado Base'] != changes['Estado Actual']]
+    transitions = (state_changes.groupby(['Estado Base', 'Estado Actual'], sort=False).size()
+                   .rename('Tareas').reset_index().sort_values('Tareas', ascending=False, ignore_index=True))
+
+    dependency_merge = base_edges.merge(current_edges, on=['Predecesor', 'Sucesor'], how='outer',
+                                        suffixes=(' Base', ' Actual'), indicator=True)
+    both_edges = dependency_merge[dependency_merge['_merge'] == 'both']
+    # Un tipo o lag desconocido (Excel exportado, solo IDs) no cuenta como modificación
+    known = both_edges[['Tipo Base', 'Tipo Actual', 'Lag Base', 'Lag Actual']].notna().all(axis=1)
+    modified_edges = both_edges[known & ((both_edges['Tipo Base'] != both_edges['Tipo Actual']) |
+                                         (both_edges['Lag Base'] != both_edges['Lag Actual']))]
+
+    def edge_columns(rows, suffix):
+        return (rows[['Predecesor', 'Sucesor', f'Tipo{suffix}', f'Lag{suffix}']]
+                .rename(columns={f'Tipo{suffix}': 'Tipo', f'Lag{suffix}': 'Lag'})
+                .astype({'Lag': 'Int64'}).reset_index(drop=True))
+
+    base_critical = _critical_task_ids(base_table, base_graph)
+    current_critical = _critical_task_ids(current_table, current_graph)
+    critical_path = {
+        'base': sorted(base_critical),
+        'actual': sorted(current_critical),
+        'entran': sorted(current_critical - base_critical),
+        'salen': sorted(base_critical - current_critical)
+    }
+
+    project_shift = (current_table['Fin Planificado'].max() - base_table['Fin Planificado'].max()).days
+    summary = {
+        "➕ Tareas Agregadas": int(added.sum()),
+        "➖ Tareas Eliminadas": int(removed.sum()),
+        "✏️ Tareas Modificadas": len(changes),
+        "📆 Desplazamiento del Fin Planificado (días)": int(project_shift) if pd.notna(project_shift) else None,
+        "📅 Tareas con Fechas Planificadas Desplazadas": int(((changes['Δ Inicio Planificado (días)'].fillna(0) != 0) |
+                                                            (changes['Δ Fin Planificado (días)'].fillna(0) != 0)).sum()),
+        "🔄 Transiciones de Estado": len(state_changes),
+        "⏱️ Δ Días de Retraso": int(np.nansum(current_table['Días de Retraso']) - np.nansum(base_table['Días de Retraso'])),
+        "💰 Δ Costo Planificado (USD)": int(np.nansum(current_table['Costo Planificado (USD)'])
+                                          - np.nansum(base_table['Costo Planificado (USD)'])),
+        "💸 Δ Costo Real (USD)": int(np.nansum(current_table['Costo Real (USD)'])
+                                    - np.nansum(base_table['Costo Real (USD)'])),
+        "🔗 Dependencias Agregadas": int((dependency_merge['_merge'] == 'right_only').sum()),
+        "✂️ Dependencias Eliminadas": int((dependency_merge['_merge'] == 'left_only').sum()),
+        "🔀 Dependencias Modificadas": len(modified_edges),
+        "🎯 Entran al Camino Crítico": len(critical_path['entran']),
+        "🏁 Salen del Camino Crítico": len(critical_path['salen'])
+    }
+
+    return {
+        'resumen': summary,
+        'tareas_agregadas': task_columns(merged[added], ' Actual'),
+        'tareas_eliminadas': task_columns(merged[removed], ' Base'),
+        'cambios_tareas': changes,
+        'transiciones_estado': transitions,
+        'dependencias_agregadas': edge_columns(dependency_merge[dependency_merge['_merge'] == 'right_only'], ' Actual'),
+        'dependencias_eliminadas': edge_columns(dependency_merge[dependency_merge['_merge'] == 'left_only'], ' Base'),
+        'dependencias_modificadas': modified_edges[['Predecesor', 'Sucesor', 'Tipo Base', 'Lag Base',
+                                                    'Tipo Actual', 'Lag Actual']].reset_index(drop=True),
+        'camino_critico': critical_path
+    }
+
+
+def _schedule_violations(arrays, src, dst, types, lags):
+    """
+    Evalúa todas las reglas de SCHEDULE_RULES sobre una tabla plana de tareas (filas x TASK_ARRAY_FIELDS)
+    src / dst son posiciones de fila de cada arista, de modo que varias simulaciones apiladas
+    se validan en una sola pasada. Devuelve una matriz booleana (filas x reglas).
+    """
+    def field(name):
+        return arrays[:, TASK_ARRAY_FIELDS.index(name)]
+
+    duration = field("Duración Planificada (días)")
+    planned_start = field("Inicio Planificado (día)")
+    planned_end = field("Fin Planificado (día)")
+    real_start = field("Inicio Real (día)")
+    real_end = field("Fin Real (día)")
+    state = field("Estado (código)")
+    progress = field("% Avance Físico")
+    real_cost = field("Costo Real (USD)")
+
+    started = state >= TASK_STATE_CODES["En progreso"]
+    completed = state >= TASK_STATE_CODES["Completada"]
+    in_progress = started & ~completed
+
+    violations = np.zeros((len(arrays), len(SCHEDULE_RULES)), dtype=bool)
+
+    def flag(rule, mask):
+        violations[:, list(SCHEDULE_RULES).index(rule)] |= mask
+
+    def flag_edges(rule, mask):
+        # Las violaciones de aristas se asignan a la tarea sucesora
+        flagged = np.zeros(len(arrays), dtype=bool)
+        flagged[dst[mask]] = True
+        flag(rule, flagged)
+
+    flag("estado_invalido", ~np.isin(state, list(TASK_STATE_CODES.values())))
+    flag("fechas_planificadas", ~(planned_start >= 0) | (planned_end != planned_start + duration - 1))
+
+    # Restricción de cada arista sobre el inicio planificado del sucesor (mismas reglas que forward_pass)
+    earliest_start = np.select(
+        [types == FS, types == SS, types == FF, types == SF],
+        [
+            planned_end[src] + lags + 1,
+            planned_start[src] + lags,
+            planned_end[src] + lags + 1 - duration[dst],
+            planned_start[src] + lags + 1 - duration[dst]
+        ]
+    )
+    flag_edges("lag_planificado", planned_start[dst] < earliest_start)
+
+    # Estados coherentes con los predecesores (mismas reglas que _assign_coherent_states)
+    requires_completion = (types == FS) | (types == SF)
+    flag_edges("predecesor_no_completado", completed[dst] & requires_completion & ~completed[src])
+    flag_edges("predecesor_no_iniciado",
+               ((in_progress[dst] & (types != SF)) | (completed[dst] & ~requires_completion)) & ~started[src])
+
+    has_start = ~np.isnan(real_start)
+    has_end = ~np.isnan(real_end)
+    flag("fechas_reales", (has_start != started) | (has_end != completed) | (real_end < real_start))
+    flag("avance", np.where(completed, progress != 100,
+                            np.where(started, (progress <= 0) | (progress >= 100), progress != 0)))
+    flag("costo_real", started & ~(real_cost >= 0))
+
+    return violations
+
+
+def validate_task_arrays(graph, task_arrays):
+    """
+    Valida la coherencia de una o muchas simulaciones que comparten la red `graph`
+    task_arrays: (tareas x campos), (escenarios x tareas x campos) o el DataFrame apilado de
+    SharedTaskBuffer.to_frame() (las filas de relleno se descartan).
+    Devuelve un DataFrame con el número de tareas que incumplen cada regla por escenario.
+    """
+    if isinstance(task_arrays, pd.DataFrame):
+        num_scenarios = task_arrays.index.get_level_values(0).nunique()
+        task_arrays = task_arrays.to_numpy().reshape(num_scenarios, -1, len(TASK_ARRAY_FIELDS))
+    task_arrays = np.asarray(task_arrays, dtype=np.float64)
+    if task_arrays.ndim == 2:
+        task_arrays = task_arrays[np.newaxis]
+    task_arrays = task_arrays[:, :graph.num_tasks]
+    num_scenarios, num_tasks, _ = task_arrays.shape
+
+    # La misma red se replica con un desplazamiento de filas por escenario
+    offsets = (np.arange(num_scenarios, dtype=np.int64) * num_tasks)[:, np.newaxis]
+    src = (graph.pred_indices + offsets).ravel()
+    dst = (graph.edge_targets + offsets).ravel()
+    types = np.tile(graph.pred_types, num_scenarios)
+    lags = np.tile(graph.pred_lags.astype(np.int64), num_scenarios)
+
+    violations = _schedule_violations(task_arrays.reshape(-1, task_arrays.shape[2]), src, dst, types, lags)
+    counts = violations.reshape(num_scenarios, num_tasks, -1).sum(axis=1)
+    return pd.DataFrame(counts, columns=list(SCHEDULE_RULES)).rename_axis("escenario")
+
+
+def validate_schedules(schedulers):
+    """
+    Valida muchas simulaciones (cada una con su propia red) en una sola pasada vectorizada
+    Las tablas de tareas y las aristas se concatenan con desplazamientos de fila.
+    Devuelve un DataFrame con una fila por simulación, el conteo por regla y la columna 'Coherente'.
+    """
+    arrays, src, dst, types, lags, sizes = [], [], [], [], [], []
+    offset = 0
+    for scheduler in schedulers:
+        graph = scheduler.get_dependency_graph()
+        arrays.append(scheduler.task_array())
+        src.append(graph.pred_indices + offset)
+        dst.append(graph.edge_targets + offset)
+        types.append(graph.pred_types)
+        lags.append(graph.pred_lags.astype(np.int64))
+        sizes.append(graph.num_tasks)
+        offset += graph.num_tasks
+
+    if not arrays:
+        return pd.DataFrame(columns=['simulation_id', *SCHEDULE_RULES, 'Coherente'])
+
+    violations = _schedule_violations(np.concatenate(arrays), np.concatenate(src), np.concatenate(dst),
+                                      np.concatenate(types), np.concatenate(lags))
+    counts = np.add.reduceat(violations.astype(np.int64), np.cumsum([0] + sizes[:-1]), axis=0)
+    counts[np.array(sizes) == 0] = 0
+
+    report = pd.DataFrame(counts, columns=list(SCHEDULE_RULES))
+    report.insert(0, 'simulation_id', [scheduler.simulation_id for scheduler in schedulers])
+    report['Coherente'] = counts.sum(axis=1) == 0
+    return report
+
+
+# Etapas medidas por el arnés de regresión (en orden de ejecución)
+REGRESSION_STAGES = ("generacion", "cronograma", "reportes", "exportacion")
+
+
+class RegressionHarness:
+    """
+    Arnés de regresión de rendimiento con semillas y fechas fijas
+
+    Para cada semilla ejecuta las etapas de REGRESSION_STAGES (generación de tareas, pronóstico y
+    validación, reportes y exportación a Excel), mide el tiempo total por etapa (el mejor de `repeat`
+    repeticiones), el pico de memoria con tracemalloc y una huella SHA-256 de la salida de cada etapa.
+    record() guarda huellas, presupuestos y la configuración de sitio en un JSON; check() vuelve a medir
+    con la misma configuración y falla si una etapa excede su presupuesto de memoria o si su salida cambió.
+
+    El presupuesto de tiempo depende de la máquina y de su carga (en CI compartido da falsos positivos),
+    por eso solo se verifica con check_time=True.
+    """
+
+    def __init__(self, path="regresion.json", seeds=(1, 2, 3), project_start_date=datetime(2023, 9, 1),
+                 current_date=datetime(2024, 6, 1), buffer_mode="task", config=None, repeat=3,
+                 time_margin=1.5, memory_margin=1.25, min_time_slack=0.05, quiet=True, check_time=False):
+        self.path = path
+        self.seeds = tuple(seeds)
+        self.project_start_date = project_start_date
+        self.current_date = current_date
+        self.buffer_mode = buffer_mode
+        # Sin configuración explícita, check() usa la guardada en la línea base
+        self.config_given = config is not None
+        self.config = load_simulation_config(config) if not isinstance(config, CompiledSimulationConfig) else config
+        self.check_time = check_time
+        self.repeat = repeat
+        self.time_margin = time_margin
+        self.memory_margin = memory_margin
+        self.min_time_slack = min_time_slack
+        self.quiet = quiet
+
+    def _stages(self, seed, directory):
+        """Funciones de cada etapa para una semilla; cada una devuelve la salida que se compara"""
+        state = {}
+
+        def generation():
+            scheduler = ImprovedMiningScheduler(
+                project_start_date=self.project_start_date, current_date=self.current_date,
+                simulation_id=f"REG-{seed}", buffer_mode=self.buffer_mode, config=self.config, seed=seed
+            )
+            scheduler.generate_coherent_tasks()
+            state['scheduler'] = scheduler
+            return scheduler.tasks
+
+        def scheduling():
+            scheduler = state['scheduler']
+            return {'pronostico': scheduler.calculate_forecast(), 'coherencia': scheduler.validate_coherence()}
+
+        def reporting():
+            scheduler = state['scheduler']
+            df = scheduler.create_dataframe()
+            return {'tabla': df,
+                    'resumen': scheduler.generate_summary_metrics(df),
+                    'dependencias': scheduler.generate_dependency_report(),
+                    'pronostico': scheduler.generate_forecast_report()}
+
+        def export():
+            return state['scheduler'].export_to_excel(os.path.join(directory, f"regresion_{seed}.xlsx"))
+
+        return zip(REGRESSION_STAGES, (generation, scheduling, reporting, export))
+
+    def measure(self):
+        """
+        Ejecuta todas las etapas y devuelve {'stages': {etapa: {'seconds', 'peak_bytes'}},
+        'fingerprints': {semilla: {etapa: sha256}}}
+        """
+        console = EVENTS.console
+        EVENTS.console = console and not self.quiet
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                # Tiempo: mejor total por etapa entre las repeticiones (sin tracemalloc, que agrega costo)
+                seconds = {stage: float('inf') for stage in REGRESSION_STAGES}
+                for _ in range(max(1, self.repeat)):
+                    totals = dict.fromkeys(REGRESSION_STAGES, 0.0)
+                    for seed in self.seeds:
+                        for stage, function in self._stages(seed, directory):
+                            started = time.perf_counter()
+                            function()
+                            totals[stage] += time.perf_counter() - started
+                    for stage in REGRESSION_STAGES:
+                        seconds[stage] = min(seconds[stage], totals[stage])
+
+                # Memoria y salidas: una pasada adicional con tracemalloc
+                peaks = dict.fromkeys(REGRESSION_STAGES, 0)
+                fingerprints = {}
+                tracing = tracemalloc.is_tracing()
+                if not tracing:
+                    tracemalloc.start()
+                try:
+                    for seed in self.seeds:
+                        outputs = {}
+                        for stage, function in self._stages(seed, directory):
+                            tracemalloc.reset_peak()
+                            base = tracemalloc.get_traced_memory()[0]
+                            outputs[stage] = function()
+                            peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - base)
+                        # El Excel se compara por el contenido de sus hojas (el archivo incluye marcas de tiempo)
+                        outputs["exportacion"] = pd.read_excel(outputs["exportacion"], sheet_name=None)
+                        fingerprints[str(seed)] = {stage: _regression_fingerprint(output)
+                                                   for stage, output in outputs.items()}
+                finally:
+                    if not tracing:
+                        tracemalloc.stop()
+        finally:
+            EVENTS.console = console
+
+        return {
+            'stages': {stage: {'seconds': seconds[stage], 'peak_bytes': peaks[stage]}
+                       for stage in REGRESSION_STAGES},
+            'fingerprints': fingerprints
+        }
+
+    def record(self):
+        """Mide y guarda la línea base (huellas y presupuestos de tiempo y memoria) en self.path"""
+        measurement = self.measure()
+        stages = {}
+        for stage, values in measurement['stages'].items():
+            stages[stage] = {
+                **values,
+                'budget_seconds': values['seconds'] * self.time_margin + self.min_time_slack,
+                'budget_peak_bytes': int(values['peak_bytes'] * self.memory_margin)
+            }
+        baseline = {
+            'version': 1,
+            'created': datetime.now().isoformat(timespec="seconds"),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'seeds': list(self.seeds),
+            'project_start_date': self.project_start_date.isoformat(),
+            'current_date': self.current_date.isoformat(),
+            'buffer_mode': self.buffer_mode,
+            'config': self.config.raw,
+            'config_sha256': _regression_fingerprint(self.config.raw),
+            'stages': stages,
+            'fingerprints': measurement['fingerprints']
+        }
+        _write_json_atomic(self.path, baseline)
+        EVENTS.emit("regression_recorded", f"📌 Línea base de regresión guardada en {self.path}",
+                    path=self.path, stages=stages)
+        return baseline
+
+    def check(self, strict=True):
+        """
+        Vuelve a medir con las semillas, fechas, modo de buffer y configuración de la línea base y la compara
+        Si se entregó una configuración distinta de la grabada, falla sin medir (las huellas no serían comparables)
+        Devuelve {'passed', 'failures', 'stages'}; con strict=True lanza AssertionError si algo falla
+        """
+        with open(self.path, encoding="utf-8") as file:
+            baseline = json.load(file)
+        self.seeds = tuple(baseline['seeds'])
+        self.project_start_date = datetime.fromisoformat(baseline['project_start_date'])
+        self.current_date = datetime.fromisoformat(baseline['current_date'])
+        self.buffer_mode = baseline['buffer_mode']
+
+        failures = []
+        if 'config' in baseline and not self.config_given:
+            self.config = CompiledSimulationConfig(baseline['config'])
+        if baseline.get('config_sha256', _regression_fingerprint(self.config.raw)) != \
+                _regression_fingerprint(self.config.raw):
+            failures.append("configuración: la configuración de sitio difiere de la grabada en la línea base")
+            return self._report(failures, {}, strict)
+
+        measurement = self.measure()
+
+        stages = {}
+        for stage, budget in baseline['stages'].items():
+            values = measurement['stages'][stage]
+            stages[stage] = {**values, 'budget_seconds': budget['budget_seconds'],
+                             'budget_peak_bytes': budget['budget_peak_bytes']}
+            if self.check_time and values['seconds'] > budget['budget_seconds']:
+                failures.append(f"{stage}: {values['seconds']:.3f} s excede el presupuesto de "
+                                f"{budget['budget_seconds']:.3f} s")
+            if values['peak_bytes'] > budget['budget_peak_bytes']:
+                failures.append(f"{stage}: pico de {values['peak_bytes']:,} bytes excede el presupuesto de "
+                                f"{budget['budget_peak_bytes']:,} bytes")
+
+        for seed, expected in baseline['fingerprints'].items():
+            actual = measurement['fingerprints'].get(seed, {})
+            for stage, digest in expected.items():
+                if actual.get(stage) != digest:
+                    failures.append(f"{stage}: la salida de la semilla {seed} cambió")
+
+        return self._report(failures, stages, strict)
+
+    def _report(self, failures, stages, strict):
+        report = {'passed': not failures, 'failures': failures, 'stages': stages}
+        if failures:
+            EVENTS.emit("regression_failed", "❌ Regresión detectada:\n  " + "\n  ".join(failures),
+                        level=logging.WARNING, failures=failures, stages=stages)
+            if strict:
+                raise AssertionError("Regresión detectada:\n- " + "\n- ".join(failures))
+        else:
+            EVENTS.emit("regression_passed", "✅ Sin regresiones: todas las etapas dentro de presupuesto",
+                        stages=stages)
+        return report
+
+
+def _regression_fingerprint(output):
+    """Huella SHA-256 de la salida de una etapa (JSON canónico: tablas, diccionarios, fechas y arreglos)"""
+    def canonical(value):
+        if isinstance(value, pd.DataFrame):
+            return value.to_dict(orient="split")
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, TaskRecord):
+            return dict(value.items())
+        return _json_default(value)
+
+    text = json.dumps(output, default=canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def run_regression(path="regresion.json", record=False, **kwargs):
+    """
+    Graba (record=True) o verifica la línea base de regresión de rendimiento
+    Devuelve el código de salida del proceso: 0 sin regresiones, 1 si alguna etapa falla
+    """
+    harness = RegressionHarness(path, **kwargs)
+    if record or not os.path.exists(path):
+        harness.record()
+        return 0
+    return 0 if harness.check(strict=False)['passed'] else 1
 
 
 def create_comparison_dashboard(simulations):
@@ -1390,7 +5934,8 @@ def create_comparison_dashboard(simulations):
     Crea un dashboard comparativo de las simulaciones
     """
     if not PLOTLY_AVAILABLE:
-        print("⚠️ Plotly no está disponible para crear el dashboard")
+        EVENTS.emit("dependency_missing", "⚠️ Plotly no está disponible para crear el dashboard",
+                    level=logging.WARNING, package="plotly", feature="comparison_dashboard")
         return None
 
     fig = make_subplots(
@@ -1453,67 +5998,378 @@ def create_comparison_dashboard(simulations):
     return fig
 
 
+# ============================================
+# SERVICIO LOCAL DE SIMULACIÓN (asyncio)
+# ============================================
+
+def _json_default(value):
+    """Serializa fechas y tipos de NumPy en las respuestas JSON"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return str(value)
+
+
+# Configuraciones compiladas por (ruta, perfil) que el servicio mantiene en memoria
+_SERVICE_CONFIG_CACHE = {}
+
+
+def _service_config(params):
+    """
+    Configuración de una petición: 'config' (ruta a un JSON de sitio o diccionario) y, opcionalmente,
+    'profile' para fijar el perfil de la simulación
+    """
+    config, profile = params.get("config"), params.get("profile")
+    key = (config, profile) if not isinstance(config, dict) else None
+    if key in _SERVICE_CONFIG_CACHE:
+        return _SERVICE_CONFIG_CACHE[key]
+
+    compiled = compile_simulation_config(config) if isinstance(config, dict) else load_simulation_config(config)
+    if profile is not None:
+        selected = [dict(entry) for entry in compiled.profiles if entry["name"] == profile]
+        if not selected:
+            raise ValueError(f"Perfil desconocido: {profile}")
+        compiled = CompiledSimulationConfig({**compiled.raw, "profiles": selected})
+
+    if key is not None:
+        _SERVICE_CONFIG_CACHE[key] = compiled
+    return compiled
+
+
+def _scheduler_from_params(params):
+    """
+    Crea y genera un scheduler a partir de los parámetros de una petición
+    (fechas, simulation_id, seed, config, profile, buffer_mode y reduce_dependencies)
+    """
+    project_start_date = params.get("project_start_date")
+    current_date = params.get("current_date")
+    seed = params.get("seed")
+    scheduler = ImprovedMiningScheduler(
+        project_start_date=datetime.fromisoformat(project_start_date) if project_start_date else None,
+        current_date=datetime.fromisoformat(current_date) if current_date else None,
+        simulation_id=params.get("simulation_id"),
+        buffer_mode=params.get("buffer_mode", "task"),
+        config=_service_config(params),
+        reduce_dependencies=bool(params.get("reduce_dependencies", False)),
+        seed=int(seed) if seed is not None else None
+    )
+    scheduler.generate_coherent_tasks()
+    return scheduler
+
+
+def _tasks_payload(scheduler):
+    """Tareas como lista de diccionarios serializables (predecesores en formato compacto)"""
+    tasks = []
+    for task in scheduler.tasks:
+        task = dict(task)
+        task["Predecesores Detallados"] = format_predecessor_details(task["Predecesores Detallados"])
+        tasks.append(task)
+    return tasks
+
+
+def _run_service_request(kind, params):
+    scheduler = _scheduler_from_params(params)
+    response = {"simulation_id": scheduler.simulation_id, "config": scheduler.simulation_config}
+
+    if kind == "generate":
+        response["tasks"] = _tasks_payload(scheduler)
+    elif kind == "metrics":
+        response["metrics"] = scheduler.generate_summary_metrics()
+    elif kind == "dependency-report":
+        response["dependency_report"] = scheduler.generate_dependency_report()
+    elif kind == "export":
+        directory = params.get("directory", ".")
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(directory, f"cronograma_{scheduler.simulation_id}.xlsx")
+        response["filename"] = scheduler.export_to_excel(filename)
+    return response
+
+
+def _run_service_batch(requests):
+    """
+    Ejecuta un micro-lote de peticiones en un worker; los errores se devuelven por petición
+    """
+    results = []
+    for kind, params in requests:
+        try:
+            results.append((True, _run_service_request(kind, params)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class SimulationService:
+    """
+    Servicio HTTP local y persistente que mantiene el simulador cargado en memoria
+
+    Endpoints (POST con cuerpo JSON opcional: project_start_date, current_date, simulation_id):
+        /generate            tareas generadas
+        /metrics             generate_summary_metrics
+        /dependency-report   generate_dependency_report
+        /export              exporta a Excel en `directory` y devuelve el nombre del archivo
+        GET /health          estado del servicio
+
+    Las peticiones concurrentes se agrupan en micro-lotes (hasta max_batch_size o batch_window
+    segundos) que se ejecutan en un pool de workers.
+    """
+
+    ENDPOINTS = ("generate", "metrics", "dependency-report", "export")
+    STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+    def __init__(self, host="127.0.0.1", port=8765, max_batch_size=16, batch_window=0.002,
+                 workers=None, use_processes=True):
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.stats = {"requests": 0, "batches": 0, "errors": 0}
+        self._server = None
+        self._executor = None
+        self._queue = None
+        self._batcher_task = None
+        self._batches = set()
+        self._slots = None
+
+    async def start(self):
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Calentar los workers para que el primer lote no pague la importación
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(self._executor, _run_service_batch, [])
+                                   for _ in range(self.workers)])
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher_task = asyncio.create_task(self._batcher())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        EVENTS.emit("service_started", f"🚀 Servicio de simulación escuchando en http://{self.host}:{self.port}",
+                    host=self.host, port=self.port, workers=self.workers)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            await asyncio.gather(self._batcher_task, return_exceptions=True)
+        # Los lotes en curso terminan (y responden) antes de cerrar el pool
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, kind, params=None):
+        """Encola una petición y espera su resultado (usado por los endpoints HTTP)"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((kind, params or {}, future))
+        return await future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            # Reunir peticiones hasta llenar el lote o cerrar la ventana
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            requests = [(kind, params) for kind, params, _ in batch]
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, _run_service_batch, requests)
+            self.stats["batches"] += 1
+            for (_, _, future), (ok, payload) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(payload)
+                else:
+                    self.stats["errors"] += 1
+                    future.set_exception(RuntimeError(payload))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Petición HTTP inválida"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Sin un largo válido no se puede ubicar la siguiente petición: se responde y se cierra
+                    await self._respond(writer, 400, {"error": "Content-Length inválido"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, payload = await self._route(method, path.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        endpoint = path.strip("/")
+        if method == "GET" and endpoint == "health":
+            return 200, {"status": "ok", **self.stats}
+        if endpoint not in self.ENDPOINTS:
+            return 404, {"error": f"Endpoint desconocido: {path}"}
+        if method != "POST":
+            return 400, {"error": "Use POST"}
+
+        try:
+            params = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"error": "Cuerpo JSON inválido"}
+
+        self.stats["requests"] += 1
+        try:
+            return 200, await self.submit(endpoint, params)
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=_json_default, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {self.STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+
+def run_simulation_service(host="127.0.0.1", port=8765, **kwargs):
+    """Inicia el servicio de simulación y lo mantiene activo hasta interrumpirlo"""
+    service = SimulationService(host=host, port=port, **kwargs)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        EVENTS.emit("service_stopped", "\n🛑 Servicio detenido", host=host, port=service.port)
+
+
 # FUNCIÓN PRINCIPAL DE EJECUCIÓN
 def run_simulation():
     """Ejecuta la simulación completa"""
-    print("🚀 SIMULADOR AVANZADO DE CRONOGRAMAS CON DEPENDENCIAS REALISTAS")
-    print("="*70)
+    EVENTS.emit("run_started", "🚀 SIMULADOR AVANZADO DE CRONOGRAMAS CON DEPENDENCIAS REALISTAS\n" + "="*70)
 
     # Generar simulaciones
     simulations = generate_multiple_simulations(num_simulations=3)
 
     # Mostrar resumen
-    print("\n📊 RESUMEN FINAL")
-    print("="*70)
+    EVENTS.emit("run_summary", "\n📊 RESUMEN FINAL\n" + "="*70)
 
     for sim in simulations:
-        print(f"\nSimulación: {sim['scheduler'].simulation_id}")
+        if not EVENTS.enabled():
+            break
         dep_report = sim['scheduler'].generate_dependency_report()
-        print(f"  Tipo de red: {dep_report['📊 Tipo de Red']}")
-        print(f"  Total dependencias: {dep_report['🔗 Total Dependencias']}")
-        print(f"  Complejidad: {dep_report['🎲 Complejidad de Red']}")
+        EVENTS.emit("dependency_summary",
+                    f"\nSimulación: {sim['scheduler'].simulation_id}\n"
+                    f"  Tipo de red: {dep_report['📊 Tipo de Red']}\n"
+                    f"  Total dependencias: {dep_report['🔗 Total Dependencias']}\n"
+                    f"  Complejidad: {dep_report['🎲 Complejidad de Red']}",
+                    simulation_id=sim['scheduler'].simulation_id,
+                    network_style=dep_report['📊 Tipo de Red'],
+                    total_dependencies=dep_report['🔗 Total Dependencias'],
+                    complexity=dep_report['🎲 Complejidad de Red'])
 
     # Exportar a Excel
-    print("\n📁 EXPORTANDO A EXCEL...")
-    print("-"*50)
+    EVENTS.emit("export_started", "\n📁 EXPORTANDO A EXCEL...\n" + "-"*50)
     for i, sim in enumerate(simulations):
         filename = f"cronograma_{i+1}_{sim['scheduler'].simulation_id}.xlsx"
         sim['scheduler'].export_to_excel(filename)
 
     # Crear visualizaciones si Plotly está disponible
     if PLOTLY_AVAILABLE:
-        print("\n📈 GENERANDO VISUALIZACIONES...")
-        print("-"*50)
+        EVENTS.emit("visualization_started", "\n📈 GENERANDO VISUALIZACIONES...\n" + "-"*50)
 
         for sim in simulations:
+            simulation_id = sim['scheduler'].simulation_id
             try:
                 # Gantt
                 gantt = sim['scheduler'].create_enhanced_gantt()
                 gantt.show()
-                print(f"✅ Gantt mostrado para {sim['scheduler'].simulation_id}")
+                EVENTS.emit("figure_shown", f"✅ Gantt mostrado para {simulation_id}",
+                            figure="gantt", simulation_id=simulation_id)
             except Exception as e:
-                print(f"⚠️ Error en Gantt: {str(e)}")
+                EVENTS.emit("figure_error", f"⚠️ Error en Gantt: {str(e)}", level=logging.WARNING,
+                            figure="gantt", simulation_id=simulation_id, error=str(e))
 
             try:
                 # Diagrama de red
                 network = sim['scheduler'].create_network_diagram()
                 if network:
                     network.show()
-                    print(f"✅ Diagrama de red mostrado para {sim['scheduler'].simulation_id}")
+                    EVENTS.emit("figure_shown", f"✅ Diagrama de red mostrado para {simulation_id}",
+                                figure="network", simulation_id=simulation_id)
             except Exception as e:
-                print(f"⚠️ Error en diagrama de red: {str(e)}")
+                EVENTS.emit("figure_error", f"⚠️ Error en diagrama de red: {str(e)}", level=logging.WARNING,
+                            figure="network", simulation_id=simulation_id, error=str(e))
 
         # Dashboard comparativo
         try:
             dashboard = create_comparison_dashboard(simulations)
             if dashboard:
                 dashboard.show()
-                print("✅ Dashboard comparativo mostrado")
+                EVENTS.emit("figure_shown", "✅ Dashboard comparativo mostrado", figure="dashboard")
         except Exception as e:
-            print(f"⚠️ Error en dashboard: {str(e)}")
+            EVENTS.emit("figure_error", f"⚠️ Error en dashboard: {str(e)}", level=logging.WARNING,
+                        figure="dashboard", error=str(e))
 
-    print("\n🎉 SIMULACIÓN COMPLETADA")
-    print("="*70)
+    EVENTS.emit("run_finished", "\n🎉 SIMULACIÓN COMPLETADA\n" + "="*70,
+                num_simulations=len(simulations))
 
     return simulations
 
@@ -1565,5 +6421,19 @@ def quick_test():
 # ============================================
 
 if __name__ == "__main__":
-    # Ejecutar automáticamente si se ejecuta como script
-    simulations = run_simulation()
+    if len(sys.argv) > 1 and sys.argv[1] == "servicio":
+        # python simul.py servicio [puerto]: servicio HTTP local persistente
+        run_simulation_service(port=int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+    elif len(sys.argv) > 2 and sys.argv[1] == "worker":
+        # python simul.py worker <directorio>: ejecuta shards pendientes de una campaña compartida
+        ShardedCampaign(sys.argv[2]).run_worker()
+    elif len(sys.argv) > 1 and sys.argv[1] == "regresion":
+        # python simul.py regresion [grabar] [archivo] [--tiempo]: verifica (o graba) la línea base de rendimiento
+        args = [arg for arg in sys.argv[2:] if arg != "--tiempo"]
+        record = args[:1] == ["grabar"]
+        paths = args[1:] if record else args
+        sys.exit(run_regression(paths[0] if paths else "regresion.json", record=record,
+                                check_time="--tiempo" in sys.argv[2:]))
+    else:
+        # Ejecutar automáticamente si se ejecuta como script
+        simulations = run_simulation()
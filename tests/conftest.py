@@ -0,0 +1,30 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simul  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet_events():
+    """Silencia la consola del flujo de eventos durante las pruebas"""
+    console = simul.EVENTS.console
+    simul.EVENTS.console = False
+    yield
+    simul.EVENTS.console = console
+
+
+@pytest.fixture
+def make_scheduler():
+    """Crea schedulers reproducibles con fechas fijas"""
+    def factory(seed=1, **kwargs):
+        kwargs.setdefault("project_start_date", datetime(2024, 1, 1))
+        kwargs.setdefault("current_date", datetime(2024, 8, 1))
+        scheduler = simul.ImprovedMiningScheduler(seed=seed, **kwargs)
+        scheduler.generate_coherent_tasks()
+        return scheduler
+    return factory
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import simul
+
+
+@pytest.mark.parametrize("p", [0.5, 0.8, 0.95])
+def test_p2_quantile_tracks_exact_quantile(p):
+    values = np.random.default_rng(4).gamma(2.0, 10.0, 20_000)
+    estimator = simul.P2Quantile(p)
+    for value in values:
+        estimator.add(float(value))
+    assert estimator.value() == pytest.approx(np.quantile(values, p), rel=0.03)
+
+
+def test_p2_quantile_small_samples():
+    estimator = simul.P2Quantile(0.5)
+    assert estimator.value() is None
+    for value in (3.0, 1.0, 2.0):
+        estimator.add(value)
+    assert estimator.value() == 2.0
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(5).normal(50, 8, 2_000)
+    stats = simul.RunningStats()
+    for value in values:
+        stats.add(float(value))
+    summary = stats.to_dict()
+    assert summary["count"] == len(values)
+    assert summary["mean"] == pytest.approx(values.mean())
+    assert summary["std"] == pytest.approx(values.std(ddof=1))
+    assert (summary["min"], summary["max"]) == (values.min(), values.max())
+    assert summary["p50"] == pytest.approx(np.median(values), rel=0.02)
+
+
+def test_running_aggregate_sink_over_iterator():
+    sink = simul.RunningAggregateSink()
+    records = [simulation["record"] for simulation in simul.iterate_simulations(6, sinks=[sink])]
+    summary = sink.summary()
+
+    assert summary["simulations"] == 6
+    assert sum(summary["profile_counts"].values()) == 6
+    delays = [record["total_delay_days"] for record in records]
+    assert summary["metrics"]["total_delay_days"]["mean"] == pytest.approx(np.mean(delays))
+    assert summary["metrics"]["total_delay_days"]["max"] == max(delays)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import simul
+
+REFERENCE_DATE = datetime(2026, 5, 1, 12, 0)
+
+
+def _campaign(directory, csv_path, stop_at=None, resume=False):
+    checkpoint = simul.CampaignCheckpoint(str(directory), every=10, reference_date=REFERENCE_DATE)
+    sinks = [simul.RunningAggregateSink(), simul.CSVRecordSink(str(csv_path))]
+    sampler = simul.ScenarioSampler("lhs", seed=9)
+    simulations = simul.iterate_simulations(25, sinks=sinks, checkpoint=checkpoint, resume=resume,
+                                            sampler=sampler)
+    ids = []
+    for simulation in simulations:
+        ids.append(simulation["record"]["simulation_id"])
+        if len(ids) == stop_at:
+            # Interrupción a mitad de tramo: el último estado guardado es el de la simulación 10
+            simulations.close()
+            break
+    return ids, sinks[0].summary(), checkpoint
+
+
+def test_resumed_campaign_matches_uninterrupted_run(tmp_path):
+    _, expected, full = _campaign(tmp_path / "completa", tmp_path / "completa.csv")
+
+    partial, _, _ = _campaign(tmp_path / "reanudada", tmp_path / "reanudada.csv", stop_at=17)
+    resumed, summary, checkpoint = _campaign(tmp_path / "reanudada", tmp_path / "reanudada.csv", resume=True)
+
+    assert len(partial) == 17 and len(resumed) == 15
+    assert summary == expected
+    pd.testing.assert_frame_equal(checkpoint.records(), full.records())
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "reanudada.csv"), pd.read_csv(tmp_path / "completa.csv"))
+
+
+def test_resume_rejects_a_different_sampler(tmp_path):
+    _campaign(tmp_path / "campana", tmp_path / "campana.csv", stop_at=12)
+    checkpoint = simul.CampaignCheckpoint(str(tmp_path / "campana"))
+    with pytest.raises(ValueError, match="muestreador"):
+        next(simul.iterate_simulations(25, sinks=[simul.RunningAggregateSink(), simul.CSVRecordSink(
+            str(tmp_path / "campana.csv"))], checkpoint=checkpoint, resume=True,
+            sampler=simul.ScenarioSampler("lhs", seed=10)))
@@ -0,0 +1,76 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+import simul
+
+
+def test_invalid_config_reports_every_error():
+    raw = {
+        "phases": [{"name": "Única", "risk": 1.5}],
+        "profiles": [{"name": "P", "completed": [0.8, 0.2], "in_progress": [0.1, 0.2], "delay_factor": 0.1}],
+        "buffer_strategies": [{"name": "moderate", "multiplier": 0.2}],
+        "delay_causes": [],
+        "tasks": [{"fase": "Otra", "tarea": "T", "duracion": 0, "costo_base": 10}],
+    }
+    with pytest.raises(ValueError) as error:
+        simul.compile_simulation_config(raw)
+
+    message = str(error.value)
+    for expected in ("Riesgo fuera de [0, 1]", "'completed'", "'chain_factor'", "'delay_causes' no puede estar vacío",
+                     "fase desconocida 'Otra'", "'duracion' inválida"):
+        assert expected in message
+
+
+def test_compiled_config_is_read_only():
+    config = simul.compile_simulation_config()
+
+    assert isinstance(config.phases, tuple)
+    with pytest.raises(TypeError):
+        config.phase_risk_factors["Cimentaciones"] = 0.9
+    with pytest.raises(TypeError):
+        config.buffer_strategies["moderate"]["multiplier"] = 1.0
+    with pytest.raises(TypeError):
+        config.task_template[0]["duracion"] = 1
+    with pytest.raises(ValueError):
+        config.template_durations[0] = 1
+    with pytest.raises(ValueError):
+        config.phase_risk_vector[0] = 1.0
+    assert config.risk_vector(["Cimentaciones", "Desconocida"]).tolist() == [0.25, config.default_phase_risk]
+
+
+def test_pickle_recompiles_and_weights_drive_sampling():
+    raw = dict(simul.DEFAULT_SIMULATION_CONFIG, profiles=[
+        dict(simul.DEFAULT_SIMULATION_CONFIG["profiles"][0], weight=1e-9),
+        dict(simul.DEFAULT_SIMULATION_CONFIG["profiles"][1], weight=1.0),
+    ])
+    config = pickle.loads(pickle.dumps(simul.compile_simulation_config(raw)))
+
+    assert not config.template_durations.flags.writeable
+    assert config.cumulative_weights["network_styles"] is None
+    assert {config.choose("profiles") for _ in range(200)} == {1}
+
+
+def test_load_simulation_config_caches_until_file_changes(tmp_path):
+    path = tmp_path / "sitio.json"
+    path.write_text(json.dumps({"default_phase_risk": 0.1}), encoding="utf-8")
+    first = simul.load_simulation_config(str(path))
+    assert simul.load_simulation_config(str(path)) is first
+    assert first.default_phase_risk == 0.1
+
+    path.write_text(json.dumps({"default_phase_risk": 0.35}), encoding="utf-8")
+    second = simul.load_simulation_config(str(path))
+    assert second is not first and second.default_phase_risk == 0.35
+
+
+def test_schedulers_share_the_compiled_config(make_scheduler):
+    config = simul.compile_simulation_config(
+        {"tasks": simul.DEFAULT_SIMULATION_CONFIG["tasks"][:12]})
+    first, second = make_scheduler(seed=1, config=config), make_scheduler(seed=2, config=config)
+
+    assert first.config is second.config is config
+    assert len(first.tasks) == 12
+    column = simul.TASK_ARRAY_FIELDS.index("Duración Planificada (días)")
+    assert np.array_equal(first.task_array()[:, column], config.template_durations)
@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+
+import simul
+
+
+class _CountingSink(simul.SimulationSink):
+    def __init__(self):
+        self.count = 0
+
+    def consume(self, simulation):
+        self.count += 1
+
+
+def _records(values):
+    return [{"record": {"forecast_finish_day": value, "total_delay_days": value}} for value in values]
+
+
+def test_monitor_converges_only_at_checkpoints_after_minimum():
+    monitor = simul.ConvergenceMonitor(
+        targets={"P80": ("forecast_finish_day", 0.8), "media": ("total_delay_days", None)},
+        tolerance=0.05, min_simulations=25, check_every=10)
+    checks = []
+    for simulation in _records(np.random.default_rng(1).normal(200, 2, 60)):
+        monitor.consume(simulation)
+        checks.append(monitor.converged())
+
+    # Antes de min_simulations y fuera de los múltiplos de check_every no se evalúa
+    assert checks.index(True) == 29
+    assert not any(checks[:29])
+    diagnostics = monitor.diagnostics()
+    assert diagnostics["converged"] and diagnostics["simulations"] == 60
+    assert diagnostics["targets"]["media"]["ci_low"] < 200 < diagnostics["targets"]["media"]["ci_high"]
+
+
+def test_monitor_projects_needed_simulations_when_noisy():
+    monitor = simul.ConvergenceMonitor(targets={"media": ("total_delay_days", None)}, tolerance=0.01,
+                                       min_simulations=10)
+    for simulation in _records(np.random.default_rng(2).exponential(20, 40)):
+        monitor.consume(simulation)
+
+    diagnostics = monitor.diagnostics()
+    assert not monitor.converged()
+    assert diagnostics["estimated_simulations_needed"] > 40
+
+
+def _result_event(run):
+    received = []
+    simul.EVENTS.add_listener(received.append)
+    try:
+        diagnostics = run()
+    finally:
+        simul.EVENTS.remove_listener(received.append)
+    return diagnostics, [event for event in received if event['event'] == "convergence_result"][-1]
+
+
+def test_run_until_converged_stops_early():
+    random.seed(3)
+    np.random.seed(3)
+    sink = _CountingSink()
+    diagnostics, event = _result_event(lambda: simul.run_until_converged(
+        max_simulations=200, tolerance=1.0, min_simulations=30, sinks=[sink]))
+
+    assert diagnostics["converged"]
+    assert diagnostics["simulations"] == sink.count == 30
+    assert event['converged'] and event['simulations'] == 30
+
+
+def test_run_until_converged_respects_max_simulations():
+    random.seed(4)
+    np.random.seed(4)
+    diagnostics, event = _result_event(lambda: simul.run_until_converged(
+        max_simulations=12, tolerance=0.0, min_simulations=10))
+
+    assert not diagnostics["converged"]
+    assert diagnostics["simulations"] == 12
+    assert event['level'] == "WARNING" and event['simulations'] == 12
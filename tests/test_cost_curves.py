@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import simul
+
+
+def test_curve_totals_match_task_costs(make_scheduler):
+    scheduler = make_scheduler(seed=2)
+    phase_index = {phase: i for i, phase in enumerate(scheduler.phases)}
+    codes = np.array([phase_index[task["Fase"]] for task in scheduler.tasks])
+    current_day = (scheduler.current_date - scheduler.project_start_date).days
+    curves = simul.cost_s_curves(scheduler.task_array(), codes, len(scheduler.phases), current_day)
+
+    array = scheduler.task_array()
+    planned_cost = array[:, simul.TASK_ARRAY_FIELDS.index("Costo Planificado (USD)")]
+    actual_cost = np.nan_to_num(array[:, simul.TASK_ARRAY_FIELDS.index("Costo Real (USD)")])
+    assert curves["planned"][:, -1] == pytest.approx(np.bincount(codes, planned_cost, len(scheduler.phases)))
+    assert actual_cost.sum() > 0
+    assert curves["actual"][:, -1] == pytest.approx(np.bincount(codes, actual_cost, len(scheduler.phases)))
+    assert np.allclose(curves["planned_daily"].cumsum(axis=-1), curves["planned"])
+    assert (curves["actual_daily"] > -1e-6).all()
+
+    df = scheduler.cost_s_curve()
+    assert df["Costo Planificado Acumulado (USD)"].iloc[-1] == pytest.approx(planned_cost.sum())
+    assert df.loc[df["Día"] > current_day, "Costo Real Acumulado (USD)"].isna().all()
+
+
+def test_cost_is_spread_uniformly_between_start_and_finish():
+    field = {name: i for i, name in enumerate(simul.TASK_ARRAY_FIELDS)}
+    array = np.full((1, len(simul.TASK_ARRAY_FIELDS)), np.nan)
+    array[0, field["Inicio Planificado (día)"]] = 2
+    array[0, field["Fin Planificado (día)"]] = 5
+    array[0, field["Costo Planificado (USD)"]] = 400
+    array[0, field["Estado (código)"]] = simul.TASK_STATE_CODES["No iniciada"]
+
+    curves = simul.cost_s_curves(array, current_days=0)
+    assert curves["planned_daily"][0].tolist() == [0, 0, 100, 100, 100, 100]
+    assert curves["actual"][0].tolist() == [0] * 6
+
+
+def test_campaign_bands_are_exact_within_reservoir(make_scheduler):
+    schedulers = [make_scheduler(seed=seed) for seed in range(1, 7)]
+    summary = simul.cost_s_curve_campaign(schedulers, percentiles=(50,))
+
+    totals = [scheduler.cost_s_curve()["Costo Planificado Acumulado (USD)"].iloc[-1] for scheduler in schedulers]
+    assert summary["Planificado P50 (USD)"].iloc[-1] == pytest.approx(np.percentile(totals, 50))
+
+
+def test_sink_keeps_a_bounded_reservoir(make_scheduler):
+    schedulers = [make_scheduler(seed=seed) for seed in range(1, 13)]
+    sink = simul.CostSCurveSink(percentiles=(0, 100), batch_size=4, reservoir_size=5, seed=1)
+    for scheduler in schedulers:
+        sink.add(scheduler)
+    summary = sink.summary()
+
+    assert sink.count == 12 and len(sink.planned) == len(sink.actual) == 5
+    assert all(curve.base is None for curve in sink.planned)
+    totals = [scheduler.cost_s_curve()["Costo Planificado Acumulado (USD)"].iloc[-1] for scheduler in schedulers]
+    assert min(totals) <= summary["Planificado P0 (USD)"].iloc[-1] <= summary["Planificado P100 (USD)"].iloc[-1] <= max(totals)
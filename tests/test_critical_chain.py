@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+import simul
+
+# A → B → D es la cadena crítica; E → C alimenta a D (C también depende de A)
+TASKS = [
+    {"id": 1, "predecessors": []},
+    {"id": 2, "predecessors": [(1, "FS", 0)]},
+    {"id": 3, "predecessors": [(1, "FS", 0), (5, "FS", 0)]},
+    {"id": 4, "predecessors": [(2, "FS", 0), (3, "FS", 0)]},
+    {"id": 5, "predecessors": []},
+]
+DURATIONS = np.array([5, 4, 2, 3, 1])
+UNCERTAINTY = np.array([2.5, 2.0, 4.0, 1.5, 3.0])
+
+
+def test_rss_project_and_feeding_buffers():
+    graph = simul.DependencyGraph.from_tasks(TASKS)
+    result = simul.critical_chain_buffers(graph, DURATIONS, UNCERTAINTY)
+
+    assert result["critical"].tolist() == [True, True, False, True, False]
+    assert result["total_float"].tolist() == [0, 0, 2, 0, 6]
+    # Raíz de la suma de cuadrados de la cadena crítica A, B, D
+    assert result["project_buffer"] == math.ceil(math.sqrt(2.5 ** 2 + 2.0 ** 2 + 1.5 ** 2))
+    # La cadena de alimentación E → C acumula solo su propia incertidumbre (no la de A)
+    assert result["feeding_buffers"].tolist() == [0, 0, math.ceil(math.sqrt(3.0 ** 2 + 4.0 ** 2)), 0, 0]
+
+
+def test_scenario_axis_matches_single_runs():
+    graph = simul.DependencyGraph.from_tasks(TASKS)
+    durations = np.stack([DURATIONS, [1, 1, 6, 1, 1]], axis=1)
+    uncertainty = np.stack([UNCERTAINTY, UNCERTAINTY * 2], axis=1)
+    stacked = simul.critical_chain_buffers(graph, durations, uncertainty)
+
+    for scenario in range(2):
+        single = simul.critical_chain_buffers(graph, durations[:, scenario], uncertainty[:, scenario])
+        assert stacked["project_buffer"][scenario] == single["project_buffer"]
+        assert stacked["feeding_buffers"][:, scenario].tolist() == single["feeding_buffers"].tolist()
+        assert stacked["critical"][:, scenario].tolist() == single["critical"].tolist()
+
+
+def test_scheduler_buffers_follow_strategy_factor(make_scheduler):
+    scheduler = make_scheduler(seed=5, buffer_mode="critical_chain")
+    buffers = scheduler.calculate_critical_chain_buffers()
+
+    graph = scheduler.get_dependency_graph()
+    durations = np.array([task["Duración Planificada (días)"] for task in scheduler.tasks])
+    risks = scheduler.config.risk_vector(task["Fase"] for task in scheduler.tasks)
+    factor = scheduler.config.buffer_strategies[scheduler.simulation_config["buffer_strategy"]]["chain_factor"]
+    expected = simul.critical_chain_buffers(graph, durations, durations * risks * factor)
+
+    assert buffers["project_buffer"] == int(expected["project_buffer"]) > 0
+    assert set(buffers["critical_chain"]) == set(graph.task_ids[expected["critical"]].tolist())
+    assert all(buffers["total_float"][task_id] == 0 for task_id in buffers["critical_chain"])
@@ -0,0 +1,188 @@
+import random
+import time
+
+import numpy as np
+
+import simul
+
+
+def _tasks(predecessors):
+    return [{"id": task_id, "predecessors": list(preds)} for task_id, preds in predecessors.items()]
+
+
+def _reaches(graph, source, target):
+    seen, pending = {source}, [source]
+    while pending:
+        node = pending.pop()
+        if node == target:
+            return True
+        for succ in graph.successors(node)[0].tolist():
+            if succ not in seen:
+                seen.add(succ)
+                pending.append(succ)
+    return False
+
+
+def test_from_tasks_builds_both_csr_directions():
+    graph = simul.DependencyGraph.from_tasks(_tasks({1: [], 2: [(1, "FS", 2)], 3: [(1, "SS", 0), (2, "FF", -1)]}))
+
+    assert graph.num_tasks == 3 and graph.num_edges == 3
+    assert graph.in_degree().tolist() == [0, 1, 2]
+    assert graph.successors(0)[0].tolist() == [1, 2]
+    assert [level.tolist() for level in graph.levels()] == [[0], [1], [2]]
+    assert graph.type_counts() == {"FS": 1, "SS": 1, "FF": 1, "SF": 0}
+
+
+def test_remove_cycles_keeps_edges_that_only_depend_on_a_cycle():
+    # A(1) <-> B(2) forman un ciclo; C(3) depende de D(4) y de B sin ser parte del ciclo
+    predecessors = {1: [(2, "FS", 0)], 2: [(1, "FS", 0)], 3: [(4, "FS", 0), (2, "FS", 0)], 4: []}
+    tasks = [simul.NetworkTask(task_id, "Fase", "Tarea", 1, 0, preds) for task_id, preds in predecessors.items()]
+    graph = simul.DependencyGraph.from_tasks(tasks)
+    assert sorted(graph.task_ids[graph.cyclic_tasks()].tolist()) == [1, 2, 3]
+    assert len(graph.back_edges()) == 1
+
+    graph = simul.ImprovedMiningScheduler()._remove_cycles(tasks)
+
+    assert len(graph.cyclic_tasks()) == 0
+    assert tasks[2].predecessors == [(4, "FS", 0), (2, "FS", 0)]
+    assert sum(len(task.predecessors) for task in tasks[:2]) == 1
+
+
+def test_back_edges_lie_on_cycles_and_break_all_of_them():
+    rng = random.Random(3)
+    for _ in range(20):
+        n = 40
+        tasks = _tasks({i: [(rng.randrange(n), "FS", 0) for _ in range(rng.randint(0, 3))] for i in range(n)})
+        for task in tasks:
+            task["predecessors"] = [p for p in dict.fromkeys(task["predecessors"]) if p[0] != task["id"]]
+        graph = simul.DependencyGraph.from_tasks(tasks)
+
+        back = graph.back_edges()
+        for edge in back.tolist():
+            pred, target = int(graph.pred_indices[edge]), int(graph.edge_targets[edge])
+            # Ambos extremos en la misma componente fuertemente conexa
+            assert _reaches(graph, pred, target) and _reaches(graph, target, pred)
+
+        keep = np.ones(graph.num_edges, dtype=bool)
+        keep[back] = False
+        reduced = simul.DependencyGraph(
+            graph.task_ids, np.concatenate([[0], np.cumsum(np.bincount(graph.edge_targets[keep], minlength=n))]),
+            graph.pred_indices[keep], graph.pred_types[keep], graph.pred_lags[keep])
+        assert len(reduced.cyclic_tasks()) == 0
+
+
+def _naive_redundant(graph, durations):
+    src, dst = graph.pred_indices.tolist(), graph.edge_targets.tolist()
+    lags, fs = graph.pred_lags.tolist(), (graph.pred_types == simul.FS).tolist()
+
+    def fs_reaches(source, target):
+        seen, pending = {source}, [source]
+        while pending:
+            node = pending.pop()
+            for edge in range(graph.num_edges):
+                if src[edge] == node and fs[edge] and lags[edge] >= 0 and dst[edge] not in seen:
+                    if dst[edge] == target:
+                        return True
+                    seen.add(dst[edge])
+                    pending.append(dst[edge])
+        return False
+
+    redundant = []
+    for e in range(graph.num_edges):
+        same = [f for f in range(graph.num_edges) if fs[f] and (src[f], dst[f]) == (src[e], dst[e])]
+        duplicate = fs[e] and any(lags[f] > lags[e] or (lags[f] == lags[e] and f < e) for f in same if f != e)
+        implied = fs[e] and any(
+            fs[f] and dst[f] == dst[e] and src[f] != src[e] and durations[src[f]] + lags[f] >= lags[e]
+            and fs_reaches(src[e], src[f]) for f in range(graph.num_edges))
+        redundant.append(duplicate or implied)
+    return redundant
+
+
+def test_redundant_fs_edges_on_handcrafted_network():
+    graph = simul.DependencyGraph.from_tasks(_tasks({
+        1: [],
+        2: [(1, "FS", 0), (1, "FS", 2)],
+        3: [(2, "FS", 0), (1, "FS", 0)],
+        4: [(2, "FS", 0), (1, "FS", 10), (1, "SS", 0)],
+        5: [(1, "FS", -3)],
+        6: [(5, "FS", 0), (1, "FS", 0)],
+    }))
+    durations = np.array([3, 2, 4, 1, 2, 1])
+    redundant = graph.redundant_fs_edges(durations)
+
+    # Por destino: FS repetida con menor lag; 1→3 implicada por 1→2→3; 1→4 con lag 10 > duración de 2;
+    # la SS no se toca, y 1→6 no se implica por 5 porque la arista 1→5 tiene lag negativo
+    assert redundant.tolist() == [True, False, False, True, False, False, False, False, False, False]
+    reduced, removed = graph.transitive_reduction(durations)
+    assert np.array_equal(removed, redundant)
+    assert reduced.num_edges == graph.num_edges - 2
+    assert np.array_equal(reduced.forward_pass(durations)[0], graph.forward_pass(durations)[0])
+
+
+def test_redundant_fs_edges_matches_naive_definition():
+    rng = random.Random(3)
+    for _ in range(6):
+        predecessors = {1: []}
+        for task_id in range(2, 140):
+            predecessors[task_id] = [(rng.randrange(1, task_id), rng.choice(["FS", "FS", "FS", "SS", "FF"]),
+                                      rng.randint(-2, 4)) for _ in range(rng.randint(0, 4))]
+        graph = simul.DependencyGraph.from_tasks(_tasks(predecessors))
+        durations = np.array([rng.randint(1, 6) for _ in range(graph.num_tasks)])
+
+        redundant = graph.redundant_fs_edges(durations, block_bits=64)
+        assert redundant.tolist() == _naive_redundant(graph, durations)
+        reduced, _ = graph.transitive_reduction(durations)
+        assert np.array_equal(reduced.forward_pass(durations)[0], graph.forward_pass(durations)[0])
+
+
+def test_scheduler_reduction_keeps_dates(make_scheduler):
+    full = make_scheduler(seed=8)
+    reduced = make_scheduler(seed=8, reduce_dependencies=True)
+
+    dates = ["Inicio Planificado", "Fin Planificado", "Estado"]
+    assert [[task[key] for key in dates] for task in reduced.tasks] == [[task[key] for key in dates] for task in full.tasks]
+    assert reduced.removed_dependencies
+    assert reduced.get_dependency_graph().num_edges == full.get_dependency_graph().num_edges - len(reduced.removed_dependencies)
+
+
+def test_levels_mix_wide_and_narrow_frontiers():
+    # Un frente ancho inicial (vectorizado) que se angosta en una cola larga (recorrida con listas)
+    rng = np.random.default_rng(3)
+    wide = np.arange(1, 501)
+    tail = np.arange(501, 701)
+    pred_ids = np.concatenate([rng.choice(wide[:100], 400), wide[-1:], tail[:-1]])
+    succ_ids = np.concatenate([rng.choice(wide[100:], 400), tail[:1], tail[1:]])
+    graph = simul.DependencyGraph.from_edges(np.concatenate([wide, tail]), pred_ids, succ_ids,
+                                             np.zeros(len(pred_ids), dtype=np.int8), np.zeros(len(pred_ids)))
+
+    node_level = np.full(graph.num_tasks, -1)
+    for level, nodes in enumerate(graph.levels()):
+        node_level[nodes] = level
+    expected = np.zeros(graph.num_tasks, dtype=np.int64)
+    for node in graph.topological_order().tolist():
+        preds = graph.predecessors(node)[0]
+        expected[node] = node_level[preds].max() + 1 if len(preds) else 0
+
+    assert graph.depth() == len(graph.levels()) == node_level.max() + 1
+    assert sorted(graph.topological_order().tolist()) == list(range(graph.num_tasks))
+    assert node_level.tolist() == expected.tolist()
+
+
+def test_deep_chain_passes_are_linear_and_skip_levels():
+    # Cadena FS de 50k tareas: 50k niveles de una tarea cada uno
+    num_tasks = 50_000
+    ids = np.arange(1, num_tasks + 1)
+    started = time.perf_counter()
+    graph = simul.DependencyGraph.from_edges(ids, ids[:-1], ids[1:], np.zeros(num_tasks - 1, dtype=np.int8),
+                                             np.zeros(num_tasks - 1))
+    durations = np.full(num_tasks, 2)
+    early_start, early_finish = graph.forward_pass(durations)
+    late_start, _ = graph.backward_pass(durations, early_finish.max())
+    elapsed = time.perf_counter() - started
+
+    assert early_start[-1] == 2 * (num_tasks - 1)
+    assert np.array_equal(late_start, early_start)
+    assert graph.depth() == num_tasks
+    # El barrido escalar usa solo el orden topológico: los niveles no llegan a armarse
+    assert graph._levels is None
+    assert elapsed < 1.5
@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+
+import simul
+
+
+def test_disabled_stream_prints_nothing(capsys):
+    simul.configure_events(quiet=True)
+    tasks = [{"id": 1, "fase": "A", "tarea": "t", "duracion": 1, "costo_base": 0, "predecessors": [(9, "FS", 0)]}]
+    simul._drop_missing_predecessors(tasks, "prueba.csv")
+    assert capsys.readouterr().out == ""
+    assert tasks[0]["predecessors"] == []
+
+
+def test_listeners_receive_structured_events():
+    received = []
+    events = simul.SimulationEvents(console=False)
+    events.add_listener(received.append)
+    events.emit("simulation_generated", "texto", level=logging.INFO, index=3)
+    events.emit("debug_only", level=logging.DEBUG)
+
+    assert [record['event'] for record in received] == ["simulation_generated"]
+    assert received[0]['index'] == 3 and received[0]['level'] == "INFO"
+    assert not simul.SimulationEvents(console=False).enabled()
+
+
+def test_dropped_dependencies_are_reported_as_warning():
+    received = []
+    simul.EVENTS.add_listener(received.append)
+    try:
+        tasks = [{"id": 1, "fase": "A", "tarea": "t", "duracion": 1, "costo_base": 0,
+                  "predecessors": [(9, "FS", 0), (1, "FS", 0)]}]
+        simul._drop_missing_predecessors(tasks, "prueba.csv")
+    finally:
+        simul.EVENTS.remove_listener(received.append)
+
+    assert received[-1]['event'] == "import_dependencies_dropped"
+    assert received[-1]['level'] == "WARNING" and received[-1]['dropped'] == 2
+
+
+def test_progress_reporter_is_rate_limited():
+    received = []
+    events = simul.SimulationEvents(console=False)
+    events.add_listener(received.append)
+    progress = simul.ProgressReporter(1000, min_interval=3600, events=events)
+    for _ in range(1000):
+        progress.update()
+    assert len(received) <= 2
+
+
+def test_configure_events_accepts_level_names():
+    level = simul.EVENTS.level
+    try:
+        assert simul.configure_events(level="warning").level == logging.WARNING
+        assert simul.configure_events(level=logging.DEBUG).level == logging.DEBUG
+        with pytest.raises(ValueError, match="desconocido"):
+            simul.configure_events(level="ruidoso")
+    finally:
+        simul.EVENTS.level = level
+
+
+def test_sobol_without_scipy_falls_back_with_event(monkeypatch):
+    received = []
+    monkeypatch.setattr(simul, "SCIPY_AVAILABLE", False)
+    simul.EVENTS.add_listener(received.append)
+    try:
+        sampler = simul.ScenarioSampler("sobol", seed=1)
+    finally:
+        simul.EVENTS.remove_listener(received.append)
+
+    assert sampler.strategy == "lattice"
+    assert received[-1]['event'] == "sampler_fallback" and received[-1]['level'] == "WARNING"
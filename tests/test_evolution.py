@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+
+import simul
+
+
+def _scheduler(tasks):
+    scheduler = simul.ImprovedMiningScheduler(project_start_date=datetime(2024, 1, 1),
+                                              current_date=datetime(2024, 3, 1))
+    scheduler.load_tasks(tasks)
+    return scheduler
+
+
+NETWORK = [
+    {"id": 1, "fase": "Cimentaciones", "tarea": "A", "duracion": 3, "costo_base": 3000, "predecessors": []},
+    {"id": 2, "fase": "Cimentaciones", "tarea": "B", "duracion": 2, "costo_base": 1000,
+     "predecessors": [(1, "FS", 1)]},
+    {"id": 3, "fase": "Cimentaciones", "tarea": "C", "duracion": 4, "costo_base": 4000,
+     "predecessors": [(1, "SS", 1)]},
+    {"id": 4, "fase": "Cimentaciones", "tarea": "D", "duracion": 1, "costo_base": 500,
+     "predecessors": [(2, "FS", 0), (3, "FS", 0)]},
+]
+
+
+def test_without_delays_evolution_follows_the_plan():
+    engine = simul.ProjectEvolutionEngine(_scheduler(NETWORK), seed=1)
+    engine.delay_probability[:] = 0
+    series = engine.run()
+
+    assert engine.actual_start.tolist() == engine.planned_start.tolist() == [0, 4, 1, 6]
+    assert engine.actual_finish.tolist() == engine.planned_end.tolist() == [2, 5, 4, 6]
+    assert np.allclose(engine.actual_cost, engine.planned_cost)
+    assert len(series) == 7
+    assert series["Completadas"].tolist() == [0, 0, 1, 1, 2, 3, 4]
+    assert series["% Avance Físico"].iloc[-1] == 100
+
+
+def test_step_updates_states_incrementally():
+    engine = simul.ProjectEvolutionEngine(_scheduler(NETWORK), seed=1)
+    engine.delay_probability[:] = 0
+
+    engine.step(0)
+    assert engine.state.tolist() == [engine.ACTIVE, engine.NOT_STARTED, engine.NOT_STARTED, engine.NOT_STARTED]
+    engine.step(1)
+    assert engine.state[2] == engine.ACTIVE and engine.progress.tolist() == [2, 0, 1, 0]
+    engine.step(2)
+    assert engine.state[0] == engine.DONE and engine.actual_finish[0] == 2
+    # B (FS + 1) todavía no puede iniciar el día siguiente al término de A
+    engine.step(3)
+    assert engine.state[1] == engine.NOT_STARTED
+
+
+def test_delays_extend_tasks_and_runs_are_reproducible(make_scheduler):
+    scheduler = make_scheduler(seed=4)
+    first = simul.ProjectEvolutionEngine(scheduler, seed=9)
+    series = first.run()
+    second = scheduler.simulate_evolution(seed=9)
+
+    assert series.equals(second)
+    n = len(scheduler.tasks)
+    assert (series[["Completadas", "En progreso", "No iniciadas"]].sum(axis=1) == n).all()
+    assert series["Completadas"].iloc[-1] == n
+    assert series["Costo Real Acumulado (USD)"].is_monotonic_increasing
+    assert series["Días de Retraso Acumulados"].iloc[-1] == first.delay_days.sum() > 0
+    # Cada día de retraso alarga la tarea al menos un día
+    worked = first.actual_finish - first.actual_start + 1
+    assert (worked >= first.durations + first.delay_days).all()
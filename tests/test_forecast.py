@@ -0,0 +1,74 @@
+import numpy as np
+
+import simul
+
+FIELD = {name: i for i, name in enumerate(simul.TASK_ARRAY_FIELDS)}
+NOT_STARTED = simul.TASK_STATE_CODES["No iniciada"]
+IN_PROGRESS = simul.TASK_STATE_CODES["En progreso"]
+COMPLETED = simul.TASK_STATE_CODES["Completada con retraso"]
+
+# id: (duración, inicio planificado, estado, avance, inicio real, fin real, predecesores)
+NETWORK = {
+    1: (5, 0, COMPLETED, 100, 0, 9, []),
+    2: (3, 6, NOT_STARTED, 0, None, None, [(1, "FS", 1)]),
+    3: (2, 3, NOT_STARTED, 0, None, None, [(1, "SS", 2)]),
+    4: (4, 0, NOT_STARTED, 0, None, None, [(1, "FF", 0)]),
+    5: (2, 0, NOT_STARTED, 0, None, None, [(1, "SF", 10)]),
+    6: (4, 2, IN_PROGRESS, 50, 2, None, [(1, "FF", 3)]),
+    7: (1, 9, NOT_STARTED, 0, None, None, [(2, "FS", 0)]),
+}
+
+
+def _network(finish_of_first=9):
+    graph = simul.DependencyGraph.from_tasks(
+        [{"id": task_id, "predecessors": values[-1]} for task_id, values in NETWORK.items()])
+    array = np.full((len(NETWORK), len(simul.TASK_ARRAY_FIELDS)), np.nan)
+    for row, (task_id, (duration, start, state, progress, actual_start, actual_finish, _)) in enumerate(NETWORK.items()):
+        array[row, FIELD["ID"]] = task_id
+        array[row, FIELD["Duración Planificada (días)"]] = duration
+        array[row, FIELD["Inicio Planificado (día)"]] = start
+        array[row, FIELD["Fin Planificado (día)"]] = start + duration - 1
+        array[row, FIELD["Estado (código)"]] = state
+        array[row, FIELD["% Avance Físico"]] = progress
+        if actual_start is not None:
+            array[row, FIELD["Inicio Real (día)"]] = actual_start
+        if actual_finish is not None:
+            array[row, FIELD["Fin Real (día)"]] = actual_finish
+    array[0, FIELD["Fin Real (día)"]] = finish_of_first
+    return graph, array
+
+
+def test_late_finish_propagates_by_dependency_type():
+    graph, array = _network()
+    start, finish = simul.forecast_dates(graph, array, current_days=5)
+
+    assert (start[0], finish[0]) == (0, 9)      # completada: fechas reales
+    assert (start[1], finish[1]) == (11, 13)    # FS + 1 tras el término real
+    assert (start[2], finish[2]) == (5, 6)      # SS + 2 ya cumplido: no antes de hoy
+    assert (start[3], finish[3]) == (6, 9)      # FF: termina con la predecesora
+    assert (start[4], finish[4]) == (9, 10)     # SF + 10 sobre el inicio de la predecesora
+    assert (start[5], finish[5]) == (2, 12)     # en curso: solo se mueve su fin (FF + 3)
+    assert (start[6], finish[6]) == (14, 14)    # el retraso sigue por la cadena FS
+
+
+def test_scenarios_sharing_a_network_are_forecast_together():
+    graph, late = _network(finish_of_first=9)
+    _, on_time = _network(finish_of_first=4)
+    start, finish = simul.forecast_dates(graph, np.stack([late, on_time]), current_days=[5, 5])
+
+    single_start, single_finish = simul.forecast_dates(graph, on_time, current_days=5)
+    assert start.shape == (2, len(NETWORK))
+    assert np.array_equal(start[1], single_start) and np.array_equal(finish[1], single_finish)
+    assert start[1, 1] == 6 and finish[1, 6] == 9
+
+    # Sin respetar el inicio planificado, las no iniciadas pueden adelantarse a su restricción
+    assert simul.forecast_dates(graph, on_time, current_days=0)[0][2] == 3
+    assert simul.forecast_dates(graph, on_time, current_days=0, respect_planned_start=False)[0][2] == 2
+
+
+def test_forecast_report_matches_planned_end(make_scheduler):
+    scheduler = make_scheduler(seed=6)
+    forecast = scheduler.calculate_forecast()
+    assert len(forecast) == len(scheduler.tasks)
+    expected = [(f - p).days for f, p in zip(forecast["Fin Pronosticado"], forecast["Fin Planificado"])]
+    assert forecast["Desvío Pronosticado (días)"].tolist() == expected
@@ -0,0 +1,97 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import simul
+
+MSPDI = """<?xml version="1.0" encoding="UTF-8"?>
+<Project xmlns="http://schemas.microsoft.com/project">
+  <Name>Prueba</Name>
+  <Calendars><Calendar><UID>1</UID><Name>Estándar</Name></Calendar></Calendars>
+  <Tasks>
+    <Task><UID>0</UID><Name>Proyecto</Name><Summary>1</Summary><OutlineLevel>0</OutlineLevel></Task>
+    <Task><UID>1</UID><Name>Movimiento de Tierras</Name><Summary>1</Summary><OutlineLevel>1</OutlineLevel></Task>
+    <Task><UID>2</UID><Name>Excavación</Name><OutlineLevel>2</OutlineLevel>
+      <Duration>PT80H0M0S</Duration><Cost>150000</Cost></Task>
+    <Task><UID>3</UID><Name>Relleno</Name><OutlineLevel>2</OutlineLevel><Duration>PT40H0M0S</Duration>
+      <PredecessorLink><PredecessorUID>2</PredecessorUID><Type>1</Type>
+        <LinkLag>9600</LinkLag><LagFormat>7</LagFormat></PredecessorLink>
+      <PredecessorLink><PredecessorUID>1</PredecessorUID><Type>1</Type></PredecessorLink></Task>
+    <Task><UID>4</UID><Name>Compactación</Name><OutlineLevel>2</OutlineLevel><Duration>PT16H0M0S</Duration>
+      <PredecessorLink><PredecessorUID>3</PredecessorUID><Type>3</Type>
+        <LinkLag>28800</LinkLag><LagFormat>8</LagFormat></PredecessorLink>
+      <PredecessorLink><PredecessorUID>2</PredecessorUID><Type>0</Type>
+        <LinkLag>500</LinkLag><LagFormat>19</LagFormat></PredecessorLink></Task>
+  </Tasks>
+  <Assignments><Assignment><UID>1</UID><TaskUID>2</TaskUID></Assignment></Assignments>
+</Project>
+"""
+
+
+def test_msproject_xml_import(tmp_path):
+    path = tmp_path / "cronograma.xml"
+    path.write_text(MSPDI, encoding="utf-8")
+    tasks = {task["id"]: task for task in simul.import_tasks_from_msproject_xml(path)}
+
+    assert sorted(tasks) == [2, 3, 4]
+    assert tasks[2]["fase"] == "Movimiento de Tierras"
+    assert (tasks[2]["duracion"], tasks[2]["costo_base"]) == (10, 1500)
+    # 9600 décimas de minuto = 2 días laborales; el vínculo hacia la tarea resumen se omite
+    assert tasks[3]["predecessors"] == [(2, "FS", 2)]
+    # 28800 décimas de minuto transcurridas = 2 días corridos; 50% de la duración del predecesor = 5 días
+    assert tasks[4]["predecessors"] == [(3, "SS", 2), (2, "FF", 5)]
+
+
+def test_msproject_xml_releases_processed_elements(tmp_path, monkeypatch):
+    path = tmp_path / "cronograma.xml"
+    path.write_text(MSPDI, encoding="utf-8")
+    roots = []
+    iterparse = ET.iterparse
+
+    def tracking_iterparse(*args, **kwargs):
+        for event, element in iterparse(*args, **kwargs):
+            if not roots:
+                roots.append(element)
+            yield event, element
+
+    monkeypatch.setattr(simul.ET, "iterparse", tracking_iterparse)
+    simul.import_tasks_from_msproject_xml(path)
+    assert len(roots[0]) == 0
+
+
+def test_csv_import(tmp_path):
+    path = tmp_path / "cronograma.csv"
+    path.write_text("ID,Fase,Tarea,Duracion,Costo,Predecesores\n"
+                    "1,Fundaciones,Excavación,4.6,1000,\n"
+                    "2,Fundaciones,Hormigonado,3,2500,\"1SS+2, 9\"\n", encoding="utf-8")
+    tasks = simul.import_tasks_from_csv(path)
+
+    assert [task["duracion"] for task in tasks] == [5, 3]
+    assert tasks[1]["predecessors"] == [(1, "SS", 2)]
+
+
+def test_csv_import_reports_missing_columns_and_bad_rows(tmp_path):
+    path = tmp_path / "incompleto.csv"
+    path.write_text("ID,Tarea\n1,Excavación\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        simul.import_tasks_from_csv(path)
+
+    path.write_text("ID,Fase,Tarea,Duracion\n1,Fase,Tarea,abc\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="línea 2"):
+        simul.import_tasks_from_csv(path)
+
+
+def test_loaded_cyclic_network_keeps_downstream_dependencies(tmp_path):
+    path = tmp_path / "ciclo.csv"
+    path.write_text("ID,Fase,Tarea,Duracion,Predecesores\n"
+                    "1,Fundaciones,A,2,2\n"
+                    "2,Fundaciones,B,3,1\n"
+                    "3,Fundaciones,C,4,\"4, 2\"\n"
+                    "4,Fundaciones,D,1,\n", encoding="utf-8")
+    scheduler = simul.ImprovedMiningScheduler()
+    scheduler.load_tasks(simul.import_tasks_from_csv(path))
+
+    predecessors = {task["ID"]: [pred_id for pred_id, _, _ in task["Predecesores Detallados"]]
+                    for task in scheduler.tasks}
+    assert predecessors[3] == [4, 2]
+    assert len(predecessors[1]) + len(predecessors[2]) == 1
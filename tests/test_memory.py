@@ -0,0 +1,51 @@
+import json
+import sys
+
+import numpy as np
+
+import simul
+
+
+def test_owned_array_is_counted_once():
+    array = np.zeros(10_000)
+    assert simul.deep_getsizeof(array) == sys.getsizeof(array)
+    assert simul.deep_getsizeof(array) >= array.nbytes
+
+
+def test_views_share_their_base():
+    base = np.zeros(10_000)
+    views = [base[:5000], base[5000:]]
+    expected = sys.getsizeof(views) + sum(map(sys.getsizeof, views)) + sys.getsizeof(base)
+    assert simul.deep_getsizeof(views) == expected
+    assert simul.deep_getsizeof([base, base[:10]]) < 2 * base.nbytes
+
+
+def test_task_records_are_traversed(make_scheduler):
+    tasks = make_scheduler(seed=3).tasks
+    assert simul.deep_getsizeof(tasks) > sum(map(sys.getsizeof, tasks))
+
+
+def test_memory_report_is_json_ready(make_scheduler):
+    scheduler = make_scheduler(seed=3)
+    df = scheduler.create_dataframe()
+    report = scheduler.memory_report(df)
+
+    assert report["tasks"] == len(scheduler.tasks)
+    assert report["dataframe_bytes"] == sum(report["column_bytes"].values())
+    assert set(report["object_columns"]) <= set(df.columns)
+    assert 0 < report["predecessor_details_bytes"] < report["task_records_bytes"]
+    assert report["dependency_graph_bytes"] == scheduler.get_dependency_graph().nbytes()
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_memory_report_sink_samples_and_traces(tmp_path):
+    path = tmp_path / "memoria.jsonl"
+    sink = simul.MemoryReportSink(str(path), sample_every=2, trace=True)
+    for _ in simul.iterate_simulations(3, sinks=[sink], sampler=simul.ScenarioSampler("random", seed=1)):
+        pass
+    sink.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["simulation_index"] for line in lines] == [1, 3]
+    assert all(line["stages"] for line in lines)
+    assert sink.summary()["max_dataframe_bytes"] == max(line["dataframe_bytes"] for line in lines)
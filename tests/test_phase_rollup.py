@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+import simul
+
+
+def test_rollup_matches_groupby_of_the_dataframe(make_scheduler):
+    scheduler = make_scheduler(seed=6)
+    rollup = scheduler.phase_rollup().set_index("Fase")
+    df = scheduler.create_dataframe()
+    grouped = df.groupby("Fase", sort=False)
+
+    assert list(rollup.index) == list(grouped.groups)
+    assert rollup["Tareas"].tolist() == grouped.size().tolist()
+    assert rollup["ID Mínimo"].tolist() == grouped["ID"].min().tolist()
+    assert rollup["ID Máximo"].tolist() == grouped["ID"].max().tolist()
+    assert rollup["Inicio Planificado"].tolist() == grouped["Inicio Planificado"].min().tolist()
+    assert rollup["Fin Planificado"].tolist() == grouped["Fin Planificado"].max().tolist()
+    assert rollup["Días de Retraso"].tolist() == grouped["Días de Retraso"].sum().tolist()
+    assert rollup["Costo Planificado (USD)"].tolist() == grouped["Costo Planificado (USD)"].sum().tolist()
+    assert rollup["Completadas"].tolist() == grouped["Estado"].apply(lambda s: s.str.startswith("Completada").sum()).tolist()
+    assert rollup["No iniciadas"].tolist() == grouped["Estado"].apply(lambda s: (s == "No iniciada").sum()).tolist()
+
+    weighted = grouped.apply(lambda g: (g["% Avance Físico"] * g["Duración Planificada (días)"]).sum()
+                             / g["Duración Planificada (días)"].sum())
+    assert rollup["% Avance"].to_numpy() == pytest.approx(weighted.to_numpy())
+    buffer_end = (df["Fin Planificado"] + pd.to_timedelta(df["Buffer sugerido (días)"], unit="D")).groupby(df["Fase"], sort=False).max()
+    assert (buffer_end - grouped["Fin Planificado"].max()).dt.days.tolist() == rollup["Buffer (días)"].tolist()
+
+
+def test_in_progress_phases_end_at_current_date(make_scheduler):
+    scheduler = make_scheduler(seed=6)
+    rollup = scheduler.phase_rollup()
+    current_day = (scheduler.current_date - scheduler.project_start_date).days
+
+    active = rollup[rollup["En progreso"] > 0]
+    assert len(active) and (active["Fin Real (día)"] >= current_day).all()
+    untouched = rollup[rollup["No iniciadas"] == rollup["Tareas"]]
+    assert untouched["Inicio Real (día)"].isna().all()
+
+
+def test_rollup_gantt_and_drill_down(make_scheduler):
+    scheduler = make_scheduler(seed=6)
+    rollup = scheduler.phase_rollup()
+    figure = scheduler.create_enhanced_gantt(rollup=True)
+    assert [trace.name for trace in figure.data][:3] == ["Planificado", "Real", "Buffer"]
+    assert list(figure.data[0].y) == rollup["Fase"].tolist()
+
+    phase = rollup.iloc[1]
+    ids = {task["ID"] for task in scheduler.tasks if task["Fase"] == phase["Fase"]}
+    assert ids == set(range(phase["ID Mínimo"], phase["ID Máximo"] + 1))
+
+    def shown(figure):
+        return {int(y) for trace in figure.data for y in trace.y}
+
+    assert shown(scheduler.create_enhanced_gantt(phase=phase["Fase"])) == ids
+    assert shown(scheduler.create_enhanced_gantt(id_range=(phase["ID Mínimo"], phase["ID Máximo"]))) == ids
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import simul
+
+
+def _bfs(edges, source):
+    seen, pending = set(), [source]
+    while pending:
+        node = pending.pop()
+        for succ in edges.get(node, ()):
+            if succ not in seen:
+                seen.add(succ)
+                pending.append(succ)
+    return seen
+
+
+def _assert_matches_bfs(index, edges, task_ids):
+    reverse = {}
+    for src, targets in edges.items():
+        for dst in targets:
+            reverse.setdefault(dst, set()).add(src)
+    for task_id in task_ids:
+        descendants = _bfs(edges, task_id) - {task_id}
+        assert index.descendants(task_id).tolist() == sorted(descendants)
+        assert index.ancestors(task_id).tolist() == sorted(_bfs(reverse, task_id) - {task_id})
+        for other in task_ids:
+            assert index.reaches(task_id, other) == (other in descendants)
+
+
+def _random_network(rng, n):
+    predecessors = {task_id: sorted({rng.randrange(1, task_id) for _ in range(rng.randint(0, 3))})
+                    if task_id > 1 else [] for task_id in range(1, n + 1)}
+    tasks = [{"id": task_id, "predecessors": [(pred, "FS", 0) for pred in preds]}
+             for task_id, preds in predecessors.items()]
+    edges = {task_id: set() for task_id in predecessors}
+    for task_id, preds in predecessors.items():
+        for pred in preds:
+            edges[pred].add(task_id)
+    return simul.DependencyGraph.from_tasks(tasks), edges
+
+
+def test_index_matches_bfs_after_adds_and_removes():
+    rng = random.Random(5)
+    graph, edges = _random_network(rng, 30)
+    index = simul.ReachabilityIndex(graph)
+    task_ids = graph.task_ids.tolist()
+    _assert_matches_bfs(index, edges, task_ids)
+
+    for _ in range(60):
+        existing = [(src, dst) for src, targets in edges.items() for dst in targets]
+        if existing and rng.random() < 0.5:
+            src, dst = rng.choice(existing)
+            index.remove_dependency(src, dst)
+            edges[src].discard(dst)
+        else:
+            src, dst = rng.sample(task_ids, 2)
+            if src in _bfs(edges, dst):
+                with pytest.raises(ValueError, match="ciclo"):
+                    index.add_dependency(src, dst)
+                continue
+            index.add_dependency(src, dst)
+            edges[src].add(dst)
+        _assert_matches_bfs(index, edges, task_ids)
+
+
+def test_cyclic_network_is_rejected():
+    graph = simul.DependencyGraph.from_tasks([{"id": 1, "predecessors": [(2, "FS", 0)]},
+                                              {"id": 2, "predecessors": [(1, "FS", 0)]}])
+    with pytest.raises(ValueError, match="ciclos"):
+        simul.ReachabilityIndex(graph)
+
+
+def test_scheduler_index_matches_graph(make_scheduler):
+    scheduler = make_scheduler(seed=6)
+    index = scheduler.get_reachability_index()
+    graph = scheduler.get_dependency_graph()
+    edges = {task_id: set() for task_id in graph.task_ids.tolist()}
+    for src, dst in zip(graph.pred_indices.tolist(), graph.edge_targets.tolist()):
+        edges[int(graph.task_ids[src])].add(int(graph.task_ids[dst]))
+
+    _assert_matches_bfs(index, edges, graph.task_ids.tolist())
+    assert scheduler.get_reachability_index() is index
+    assert index.num_intervals() >= 2 * graph.num_tasks
@@ -0,0 +1,44 @@
+import json
+
+import simul
+
+
+def _harness(path, **kwargs):
+    return simul.RegressionHarness(str(path), seeds=(1,), repeat=1, **kwargs)
+
+
+def test_record_then_check_passes_and_restores_config(tmp_path):
+    path = tmp_path / "regresion.json"
+    custom = simul.compile_simulation_config({"default_phase_risk": 0.35})
+    baseline = _harness(path, config=custom).record()
+    assert baseline["config"]["default_phase_risk"] == 0.35
+
+    # Sin configuración explícita se usa la grabada en la línea base
+    harness = _harness(path)
+    assert harness.check()["passed"]
+    assert harness.config.raw == custom.raw
+
+
+def test_check_reports_config_mismatch(tmp_path):
+    path = tmp_path / "regresion.json"
+    _harness(path).record()
+    custom = simul.compile_simulation_config({"default_phase_risk": 0.35})
+    report = _harness(path, config=custom).check(strict=False)
+    assert not report["passed"]
+    assert report["failures"][0].startswith("configuración")
+
+
+def test_check_detects_changed_output_and_time_is_opt_in(tmp_path):
+    path = tmp_path / "regresion.json"
+    _harness(path).record()
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    baseline["fingerprints"]["1"]["generacion"] = "0" * 64
+    for stage in baseline["stages"].values():
+        stage["budget_seconds"] = 0.0
+    path.write_text(json.dumps(baseline), encoding="utf-8")
+
+    failures = _harness(path).check(strict=False)["failures"]
+    assert any("cambió" in failure for failure in failures)
+    assert not any(" s excede" in failure for failure in failures)
+    timed = _harness(path, check_time=True).check(strict=False)["failures"]
+    assert len(timed) == len(failures) + len(baseline["stages"])
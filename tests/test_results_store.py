@@ -0,0 +1,70 @@
+import simul
+
+
+def test_same_simulation_id_is_stored_as_separate_runs(tmp_path, make_scheduler):
+    first = make_scheduler(seed=1, simulation_id="SIM-1234")
+    second = make_scheduler(seed=2, simulation_id="SIM-1234")
+
+    with simul.SimulationResultsStore(str(tmp_path / "runs.db")) as store:
+        run_ids = store.add_simulations([first, second])
+
+        assert len(set(run_ids)) == 2
+        assert len(store.query_simulations(simulation_id="SIM-1234")) == 2
+        for run_id in run_ids:
+            assert len(store.query_tasks(run_id)) == len(first.tasks)
+        assert store.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 2 * len(first.tasks)
+
+
+def test_reinserting_a_run_id_replaces_its_rows(tmp_path, make_scheduler):
+    scheduler = make_scheduler()
+
+    with simul.SimulationResultsStore(str(tmp_path / "runs.db")) as store:
+        run_id = store.add_simulation(scheduler, run_id="corrida-1")
+        store.add_simulation(scheduler, run_id="corrida-1")
+
+        assert len(store.query_simulations()) == 1
+        assert len(store.query_tasks(run_id)) == len(scheduler.tasks)
+        assert store.query_summary_metrics(scheduler.simulation_id) == {
+            k: str(v) for k, v in scheduler.generate_summary_metrics().items()}
+
+
+def test_ambiguous_simulation_id_requires_run_id(tmp_path, make_scheduler):
+    scheduler = make_scheduler()
+
+    with simul.SimulationResultsStore(str(tmp_path / "runs.db")) as store:
+        store.add_simulations([scheduler, scheduler])
+        try:
+            store.query_tasks(scheduler.simulation_id)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("simulation_id ambiguo aceptado")
+
+
+def test_query_by_profile_and_delay(tmp_path, make_scheduler):
+    schedulers = [make_scheduler(seed=seed) for seed in range(5)]
+
+    with simul.SimulationResultsStore(str(tmp_path / "runs.db")) as store:
+        store.add_simulations(schedulers)
+        profile = schedulers[0].simulation_config['profile_name']
+        expected = sum(s.simulation_config['profile_name'] == profile for s in schedulers)
+        assert len(store.query_simulations(profile_name=profile)) == expected
+        assert store.query_simulations(min_total_delay_days=10 ** 9).empty
+
+
+
+def test_sink_resume_replaces_runs_inserted_after_checkpoint(tmp_path):
+    store = simul.SimulationResultsStore(str(tmp_path / "runs.db"))
+    sink = simul.ResultsStoreSink(store, batch_size=1)
+    for simulation in simul.iterate_simulations(3, scheduler_factory=lambda: simul.ImprovedMiningScheduler(seed=7)):
+        sink.consume(simulation)
+    state = sink.checkpoint_state()
+
+    resumed = simul.ResultsStoreSink(store, batch_size=1)
+    resumed.restore_state({**state, 'consumed': 1})
+    for simulation in simul.iterate_simulations(2, scheduler_factory=lambda: simul.ImprovedMiningScheduler(seed=7)):
+        resumed.consume(simulation)
+    resumed.close()
+
+    assert len(store.query_simulations()) == 3
+    store.close()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import simul
+
+
+def max_per_stratum(points, strata):
+    return max(np.bincount((points[:, d] * strata).astype(int), minlength=strata).max()
+               for d in range(points.shape[1]))
+
+
+def test_lhs_block_follows_planned_campaign():
+    sampler = simul.ScenarioSampler("lhs", seed=3, num_simulations=10)
+    points = np.array([sampler.point(k) for k in range(10)])
+    assert sampler.block_size == 10
+    assert max_per_stratum(points, 10) == 1
+
+
+def test_iterate_simulations_plans_lhs_block():
+    sampler = simul.ScenarioSampler("lhs", seed=3)
+    list(simul.iterate_simulations(4, sampler=sampler))
+    assert sampler.block_size == 4
+
+
+def test_lhs_block_size_is_capped():
+    size = simul.ScenarioSampler.lhs_block_size(10_000)
+    assert size <= simul.ScenarioSampler.LHS_MAX_BLOCK
+    assert size * -(-10_000 // size) - 10_000 < size
+
+
+@pytest.mark.parametrize("n", [8, 10, 16, 25, 64])
+def test_lattice_is_stratified_at_every_prefix(n):
+    sampler = simul.ScenarioSampler("lattice", seed=5)
+    points = np.array([sampler.point(k) for k in range(n)])
+    # Cada tramo diádico alineado del prefijo aporta a lo sumo un punto por estrato
+    assert max_per_stratum(points, n) <= bin(n).count("1")
+    assert points.min() >= 0 and points.max() < 1
+
+
+@pytest.mark.parametrize("strategy", simul.ScenarioSampler.STRATEGIES)
+def test_points_are_reproducible(strategy):
+    a = simul.ScenarioSampler(strategy, seed=11, num_simulations=20)
+    b = simul.ScenarioSampler(strategy, seed=11, num_simulations=20)
+    for k in (0, 7, 19):
+        pa, pb = a.scheduler_kwargs(k), b.scheduler_kwargs(k)
+        assert pa['seed'] == pb['seed']
+        assert (pa['sample_point'] is None and pb['sample_point'] is None) or \
+            np.array_equal(pa['sample_point'], pb['sample_point'])
+
+
+def test_antithetic_pairs_mirror_each_other():
+    sampler = simul.ScenarioSampler("antithetic", seed=2)
+    assert np.allclose(sampler.point(0) + sampler.point(1), 1.0)
+    assert sampler.seed_for(0) == sampler.seed_for(1)
@@ -0,0 +1,73 @@
+import pandas as pd
+
+import simul
+
+
+def test_identical_schedules_have_no_differences(make_scheduler):
+    scheduler = make_scheduler(seed=1)
+    diff = simul.diff_schedules(scheduler, scheduler.create_dataframe())
+
+    assert diff["cambios_tareas"].empty
+    assert diff["dependencias_agregadas"].empty and diff["dependencias_eliminadas"].empty
+    assert diff["dependencias_modificadas"].empty
+    assert diff["camino_critico"]["base"] == diff["camino_critico"]["actual"]
+    assert diff["resumen"]["📆 Desplazamiento del Fin Planificado (días)"] == 0
+
+
+def test_diff_reports_tasks_dates_states_and_dependencies(make_scheduler):
+    baseline = make_scheduler(seed=1).create_dataframe()
+    current = baseline.copy()
+
+    removed_id = int(current["ID"].iloc[-1])
+    current = current[current["ID"] != removed_id].copy()
+    added = current.iloc[[0]].copy()
+    added["ID"] = 999
+    added["Predecesores Detallados"] = [[(1, "SS", 0)]]
+    current = pd.concat([current, added], ignore_index=True)
+
+    current.loc[current["ID"] == 2, "Inicio Planificado"] += pd.Timedelta(days=3)
+    current.loc[current["ID"] == 2, "Estado"] = "En progreso con retraso"
+    current.loc[current["ID"] == 3, "Predecesores Detallados"] = pd.Series([[(2, "FS", 5)]],
+                                                                         index=current.index[current["ID"] == 3])
+
+    diff = simul.diff_schedules(baseline, current)
+
+    assert diff["tareas_agregadas"]["ID"].tolist() == [999]
+    assert diff["tareas_eliminadas"]["ID"].tolist() == [removed_id]
+    change = diff["cambios_tareas"].set_index("ID").loc[2]
+    assert change["Δ Inicio Planificado (días)"] == 3
+    assert change["Estado Actual"] == "En progreso con retraso"
+    assert diff["transiciones_estado"]["Tareas"].sum() == 1
+
+    modified = diff["dependencias_modificadas"]
+    assert modified[["Predecesor", "Sucesor", "Lag Actual"]].values.tolist() == [[2, 3, 5]]
+    assert diff["dependencias_agregadas"][["Predecesor", "Sucesor", "Tipo"]].values.tolist() == [[1, 999, "SS"]]
+    expected_removed = sorted((pred_id, task_id)
+                              for task_id, details in zip(baseline["ID"], baseline["Predecesores Detallados"])
+                              for pred_id, _, _ in details if removed_id in (pred_id, task_id))
+    removed_edges = diff["dependencias_eliminadas"][["Predecesor", "Sucesor"]].values.tolist()
+    assert sorted(map(tuple, removed_edges)) == expected_removed
+    assert diff["resumen"]["➕ Tareas Agregadas"] == 1
+    assert diff["resumen"]["➖ Tareas Eliminadas"] == 1
+
+
+def test_exported_excel_compares_by_ids_only(make_scheduler, tmp_path):
+    scheduler = make_scheduler(seed=2)
+    path = scheduler.export_to_excel(str(tmp_path / "cronograma.xlsx"))
+    diff = simul.diff_schedules(scheduler, path)
+
+    assert diff["cambios_tareas"].empty
+    assert diff["dependencias_modificadas"].empty
+    assert diff["dependencias_agregadas"].empty and diff["dependencias_eliminadas"].empty
+
+
+def test_predecessor_lists_and_compact_text_give_the_same_edges(make_scheduler):
+    df = make_scheduler().create_dataframe()
+    as_text = df.assign(**{"Predecesores Detallados": df["Predecesores Detallados"].map(simul.format_predecessor_details)})
+
+    _, list_edges, list_graph = simul._schedule_table(df)
+    _, text_edges, text_graph = simul._schedule_table(as_text)
+
+    assert len(list_edges) == sum(len(details) for details in df["Predecesores Detallados"])
+    assert list_edges.astype(str).equals(text_edges.astype(str))
+    assert list_graph.signature() == text_graph.signature()
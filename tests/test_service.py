@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import simul
+
+
+async def _request(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _post(path, params):
+    body = json.dumps(params).encode("utf-8")
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body
+
+
+def _with_service(scenario):
+    async def main():
+        service = simul.SimulationService(port=0, workers=2, use_processes=False)
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+PARAMS = {"project_start_date": "2024-01-01", "current_date": "2024-08-01", "simulation_id": "SIM-0042"}
+
+
+def test_generate_and_health_endpoints():
+    async def scenario(service):
+        generated = await _request(service.port, _post("/generate", PARAMS))
+        raw = b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"
+        return generated, await _request(service.port, raw)
+
+    (status, payload), (health_status, health) = _with_service(scenario)
+    assert status == 200
+    assert payload["simulation_id"] == "SIM-0042"
+    assert payload["tasks"][0]["Inicio Planificado"].startswith("2024-01-01")
+    assert health_status == 200 and health["requests"] == 1
+
+
+def test_buffer_mode_param_reaches_scheduler():
+    params = dict(PARAMS, buffer_mode="critical_chain")
+    status, payload = _with_service(lambda service: _request(service.port, _post("/metrics", params)))
+    assert status == 200
+    assert payload["config"]["buffer_mode"] == "critical_chain"
+
+
+def test_profile_param_fixes_the_simulation_profile():
+    params = dict(PARAMS, profile="Proyecto Crítico")
+    status, payload = _with_service(lambda service: _request(service.port, _post("/metrics", params)))
+    assert status == 200
+    assert payload["config"]["profile_name"] == "Proyecto Crítico"
+
+
+def test_unknown_profile_is_reported():
+    status, payload = _with_service(
+        lambda service: _request(service.port, _post("/metrics", {"profile": "No existe"})))
+    assert status == 500
+    assert "Perfil desconocido" in payload["error"]
+
+
+def test_reduce_dependencies_param_reaches_scheduler():
+    params = dict(PARAMS, reduce_dependencies=True)
+    status, payload = _with_service(lambda service: _request(service.port, _post("/dependency-report", params)))
+    assert status == 200
+    assert payload["config"]["reduce_dependencies"] is True
+    assert "✂️ Dependencias Redundantes Eliminadas" in payload["dependency_report"]
+
+
+def test_seeded_requests_are_reproducible():
+    params = dict(PARAMS, seed=7)
+
+    async def scenario(service):
+        first = await _request(service.port, _post("/generate", params))
+        second = await _request(service.port, _post("/generate", params))
+        return first, second
+
+    (status, first), (_, second) = _with_service(scenario)
+    assert status == 200
+    assert first["tasks"] == second["tasks"]
+    assert first["config"] == second["config"]
+
+
+def test_unknown_endpoint_and_invalid_body():
+    status, _ = _with_service(lambda service: _request(service.port, _post("/desconocido", {})))
+    assert status == 404
+    raw = b"POST /metrics HTTP/1.1\r\nContent-Length: 3\r\nConnection: close\r\n\r\n{x}"
+    status, payload = _with_service(lambda service: _request(service.port, raw))
+    assert status == 400 and "JSON" in payload["error"]
+
+
+def test_invalid_content_length_returns_400():
+    raw = b"POST /generate HTTP/1.1\r\nContent-Length: abc\r\n\r\n"
+    status, payload = _with_service(lambda service: _request(service.port, raw))
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_stop_waits_for_in_flight_batches():
+    async def scenario(service):
+        pending = asyncio.ensure_future(service.submit("metrics", PARAMS))
+        await asyncio.sleep(0.05)
+        await service.stop()
+        return pending, service
+
+    pending, service = _with_service(scenario)
+    assert pending.done() and "metrics" in pending.result()
+    assert not service._batches
+    assert service._batcher_task.done()
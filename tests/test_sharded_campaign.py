@@ -0,0 +1,80 @@
+import json
+import os
+import time
+
+import pytest
+
+import simul
+
+
+def _campaign(tmp_path, num_simulations=6, shard_size=2, **kwargs):
+    return simul.ShardedCampaign.create(str(tmp_path / "campaña"), num_simulations, shard_size=shard_size,
+                                        seed=5, **kwargs)
+
+
+def test_create_writes_shards_and_manifest(tmp_path):
+    campaign = _campaign(tmp_path, num_simulations=5)
+
+    assert campaign.num_shards == 3
+    assert campaign.manifest["block_size"] == simul.ScenarioSampler.lhs_block_size(5)
+    with open(campaign._path("shards", 2, "json"), encoding="utf-8") as file:
+        assert json.load(file) == {"shard": 2, "start": 4, "stop": 5}
+    with pytest.raises(FileExistsError):
+        _campaign(tmp_path)
+    with pytest.raises(ValueError, match="Estrategia"):
+        simul.ShardedCampaign.create(str(tmp_path / "otra"), 4, strategy="desconocida")
+
+
+def test_each_shard_is_claimed_once(tmp_path):
+    campaign = _campaign(tmp_path)
+    other = simul.ShardedCampaign(campaign.directory)
+
+    claims = [campaign.claim("a"), other.claim("b"), campaign.claim("a")]
+    assert [claim["shard"] for claim in claims] == [0, 1, 2]
+    assert other.claim("b") is None
+    assert campaign.status() == {"shards": 3, "terminados": 0, "reclamados": 3, "pendientes": 0}
+
+    campaign.release(1)
+    assert other.claim("b")["shard"] == 1
+
+
+def test_stale_claims_are_broken_and_fresh_ones_kept(tmp_path):
+    campaign = _campaign(tmp_path, num_simulations=4)
+    campaign.claim("caído")
+    campaign.claim("vivo")
+    stale = campaign._path("claims", 0, "lock")
+    old = time.time() - 120
+    os.utime(stale, (old, old))
+
+    claim = campaign.claim("nuevo", stale_after=60)
+    assert claim["shard"] == 0
+    with open(stale, encoding="utf-8") as file:
+        assert json.load(file)["worker"] == "nuevo"
+    assert campaign.claim("otro", stale_after=60) is None
+
+    # Un reclamo que se renovó entre la verificación y el renombrado se restituye
+    fresh = campaign._path("claims", 1, "lock")
+    campaign._break_stale_claim(fresh, "otro", 60)
+    assert os.path.exists(fresh)
+    assert not [name for name in os.listdir(os.path.dirname(fresh)) if name.endswith(".stale")]
+
+
+def test_workers_complete_and_merge(tmp_path):
+    campaign = _campaign(tmp_path, num_simulations=4)
+    with pytest.raises(ValueError, match="Faltan 2 shards"):
+        campaign.merge()
+
+    assert campaign.run_worker("a", max_shards=1) == 1
+    assert simul.ShardedCampaign(campaign.directory).run_worker("b") == 1
+    assert campaign.claim("c") is None
+
+    merged = campaign.merge(str(tmp_path / "resultados.csv"))
+    assert merged["simulation_index"].tolist() == [0, 1, 2, 3]
+    assert merged["shard"].tolist() == [0, 0, 1, 1]
+    assert campaign.status()["terminados"] == 2
+    assert not os.listdir(os.path.join(campaign.directory, "claims"))
+
+    # Cada simulación depende solo de su índice de muestreo, no del worker que la ejecutó
+    expected = [simulation['record'] for simulation in simul.iterate_simulations(4, sampler=campaign.sampler())]
+    assert merged["profile_name"].tolist() == [record['profile_name'] for record in expected]
+    assert merged["actual_cost"].tolist() == pytest.approx([record['actual_cost'] for record in expected])
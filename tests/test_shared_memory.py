@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import simul
+
+CURRENT_DATE = datetime(2024, 8, 1)
+
+
+def test_buffer_layout_and_zero_copy_views():
+    with simul.SharedTaskBuffer(3, 4) as buffer:
+        assert buffer.array.shape == (3, 4, len(simul.TASK_ARRAY_FIELDS))
+        assert np.isnan(buffer.array).all()
+
+        frame = buffer.to_frame()
+        assert frame.index.names == ["escenario", "tarea"]
+        assert list(frame.columns) == list(simul.TASK_ARRAY_FIELDS)
+        buffer.array[2, 1, 0] = 42.0
+        assert frame.loc[(2, 1), simul.TASK_ARRAY_FIELDS[0]] == 42.0
+        assert np.shares_memory(buffer.scenario_frame(2).to_numpy(), buffer.array)
+        del frame
+
+
+def test_seeded_campaign_is_reproducible_across_process_counts():
+    first, first_meta = simul.run_shared_memory_simulations(4, processes=2, seed=11, current_date=CURRENT_DATE)
+    second, second_meta = simul.run_shared_memory_simulations(4, processes=1, chunk_size=3, seed=11,
+                                                              current_date=CURRENT_DATE)
+    other, _ = simul.run_shared_memory_simulations(4, processes=2, seed=12, current_date=CURRENT_DATE)
+    try:
+        assert np.array_equal(first.array, second.array, equal_nan=True)
+        assert first_meta.equals(second_meta)
+        assert not np.array_equal(first.array, other.array, equal_nan=True)
+
+        for row in first_meta.itertuples():
+            used = first.array[row.escenario, :row.total_tasks]
+            assert not np.isnan(used[:, 0]).any()
+            assert np.isnan(first.array[row.escenario, row.total_tasks:]).all()
+    finally:
+        for buffer in (first, second, other):
+            buffer.release()
+
+
+def test_schedule_larger_than_capacity_fails_clearly():
+    with pytest.raises(ValueError, match="max_tasks"):
+        simul.run_shared_memory_simulations(1, processes=1, max_tasks=5, seed=1, current_date=CURRENT_DATE)
+
+
+def test_capacity_defaults_to_the_config_template():
+    config = simul.compile_simulation_config({"tasks": simul.DEFAULT_SIMULATION_CONFIG["tasks"][:10]})
+    buffer, metadata = simul.run_shared_memory_simulations(2, processes=1, seed=3, current_date=CURRENT_DATE,
+                                                           config=config)
+    with buffer:
+        assert buffer.array.shape[1] == 10
+        assert (metadata["total_tasks"] == 10).all()
+
+
+def test_sampler_provides_seed_and_point_per_scenario():
+    sampler = simul.ScenarioSampler("lhs", seed=9)
+    buffer, metadata = simul.run_shared_memory_simulations(3, processes=2, current_date=CURRENT_DATE, sampler=sampler)
+    with buffer:
+        assert metadata["seed"].tolist() == [sampler.seed_for(k) for k in range(3)]
+        scheduler = simul.ImprovedMiningScheduler(current_date=CURRENT_DATE, **sampler.scheduler_kwargs(1))
+        scheduler.generate_coherent_tasks()
+        assert metadata["project_start_date"][1] == scheduler.project_start_date
+        assert np.array_equal(buffer.array[1], scheduler.task_array(), equal_nan=True)
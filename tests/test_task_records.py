@@ -0,0 +1,53 @@
+import random
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import simul
+
+
+def test_delay_and_buffer_accept_dicts(make_scheduler):
+    scheduler = make_scheduler(seed=5)
+    for task in scheduler.tasks:
+        legacy = dict(task)
+        legacy["Columna extra"] = "ignorada"
+        assert scheduler.calculate_delay_days(legacy) == scheduler.calculate_delay_days(task)
+
+        scheduler._rng = random.Random(11)
+        expected = scheduler.calculate_buffer_days(task)
+        scheduler._rng = random.Random(11)
+        assert scheduler.calculate_buffer_days(legacy) == expected
+
+
+def test_scheduled_task_keeps_mapping_interface(make_scheduler):
+    task = make_scheduler(seed=2).tasks[0]
+    assert isinstance(task, simul.ScheduledTask)
+    assert task["Inicio Planificado"] == task.planned_start
+    assert (task.planned_start - task.origin).days == task.planned_start_day
+    assert list(task.keys())[:3] == ["ID", "Fase", "Tarea"]
+
+
+def test_day_offset_fields_round_trip():
+    task = simul.ScheduledTask(origin=datetime(2024, 1, 1))
+    for value in (datetime(2024, 3, 1), date(2024, 3, 1), pd.Timestamp("2024-03-01"), "2024-03-01"):
+        task.planned_start = value
+        assert task.planned_start_day == 60
+        assert task.planned_start == datetime(2024, 3, 1)
+
+    task["Inicio Real"] = "2024-01-10T08:30:00"
+    assert task.actual_start_day == 9 and task["Inicio Real"] == datetime(2024, 1, 10)
+    task["Fin Real"] = "En ejecución"
+    assert task.actual_end_day is None and task["Fin Real"] == "En ejecución"
+
+    for pending in (None, pd.NaT, np.nan, "Pendiente"):
+        task.actual_start = pending
+        assert task.actual_start_day is None and task.actual_start == "Pendiente"
+
+
+def test_day_offset_fields_reject_other_types():
+    task = simul.ScheduledTask(origin=datetime(2024, 1, 1))
+    for value in (60, 60.0, np.datetime64("2024-03-01"), [2024, 3, 1]):
+        with pytest.raises(TypeError):
+            task.planned_start = value
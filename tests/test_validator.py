@@ -0,0 +1,42 @@
+import numpy as np
+
+import simul
+
+
+def test_generated_schedules_are_coherent(make_scheduler):
+    schedulers = [make_scheduler(seed=seed) for seed in range(1, 6)]
+    report = simul.validate_schedules(schedulers)
+
+    assert list(report["simulation_id"]) == [scheduler.simulation_id for scheduler in schedulers]
+    assert report["Coherente"].all()
+    assert schedulers[0].validate_coherence() == dict.fromkeys(simul.SCHEDULE_RULES, 0)
+
+
+def test_violations_are_attributed_to_their_simulation(make_scheduler):
+    schedulers = [make_scheduler(seed=seed) for seed in (1, 2, 3)]
+    completed = next(task for task in schedulers[1].tasks if task["Estado"] == "Completada")
+    completed["% Avance Físico"] = 50
+    pending = next(task for task in schedulers[2].tasks if task["Estado"] == "No iniciada")
+    pending["Costo Real (USD)"] = -1
+    pending["Estado"] = "Estado desconocido"
+
+    report = simul.validate_schedules(schedulers).set_index("simulation_id")
+    ids = [scheduler.simulation_id for scheduler in schedulers]
+    assert report.loc[ids[0], "Coherente"]
+    assert report.loc[ids[1], "avance"] == 1
+    assert not report.loc[ids[1], "Coherente"]
+    assert report.loc[ids[2], "estado_invalido"] == 1
+    assert report.loc[ids[1], "estado_invalido"] == 0
+
+
+def test_validate_task_arrays_on_shared_network(make_scheduler):
+    scheduler = make_scheduler(seed=4)
+    graph = scheduler.get_dependency_graph()
+    arrays = np.stack([scheduler.task_array()] * 3)
+    column = simul.TASK_ARRAY_FIELDS.index("Inicio Planificado (día)")
+    arrays[2, :, column] = -1
+
+    report = simul.validate_task_arrays(graph, arrays)
+    assert len(report) == 3
+    assert report.loc[0].sum() == 0
+    assert report.loc[2, "fechas_planificadas"] == graph.num_tasks